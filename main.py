@@ -3,7 +3,12 @@
 """
 import sys
 import time
+import argparse
 from pathlib import Path
+from typing import Optional
+from concurrent.futures import Future
+
+_import_start = time.perf_counter()
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent
@@ -12,19 +17,36 @@ sys.path.insert(0, str(project_root))
 from src.core.config import get_config
 from src.core.logger import setup_logger, get_logger
 from src.core.state_machine import StateMachine, State
-from src.core.combat_state import CombatStateDetector
+from src.core.combat_state import get_combat_detector
 from src.ui_interaction.screenshot import Screenshot
+from src.ui_interaction.ocr_executor import OCRExecutor
 from src.map_navigation.map_navigator import MapNavigator
 from src.map_navigation.exploration_navigator import ExplorationNavigator
 from src.monster_detection.monster_detector import MonsterDetector
+from src.monster_detection.engagement_planner import EngagementPlanner
 from src.exploration_tracking.exploration_tracker import ExplorationTracker
+from src.ui_interaction.mouse_control import load_pyautogui
+from src.core.startup import EngineWarmup
+from src.core.perception import PerceptionContext
+from src.core.screen_classifier import classify_screen
+from src.core.telemetry import get_telemetry
+from src.core.frame_stream import FrameStream, wait_until, camera_stopped
+
+_import_seconds = time.perf_counter() - _import_start
 
 
 class AutoFarming:
     """自动刷图主类 - 怪物优先策略"""
 
-    def __init__(self):
-        """初始化自动刷图系统"""
+    def __init__(self, prewarm: Optional[bool] = None):
+        """
+        初始化自动刷图系统
+
+        Args:
+            prewarm: 是否在后台线程预热OCR/GUI引擎，如果为None则使用配置中的值
+        """
+        init_start = time.perf_counter()
+
         # 加载配置
         self.config = get_config()
 
@@ -36,18 +58,39 @@ class AutoFarming:
             console=log_config.get('console', True)
         )
         self.logger = get_logger(__name__)
+        self.logger.info(f"模块导入耗时: {_import_seconds:.2f}秒")
 
         # 初始化各个模块
         self.screenshot = Screenshot()
         self.navigator = MapNavigator()
-        self.monster_detector = MonsterDetector()
+        self.ocr_executor = OCRExecutor()
+        self.monster_detector = MonsterDetector(executor=self.ocr_executor)
         self.exploration_tracker = ExplorationTracker()
-        self.combat_detector = CombatStateDetector()
+        self.combat_detector = get_combat_detector()
         self.exploration_navigator = ExplorationNavigator(
             screenshot=self.screenshot,
             navigator=self.navigator
         )
 
+        # 交战事件记录（tools/combat_report.py 统计）
+        self.telemetry = get_telemetry()
+
+        # 感知上下文：在状态之间传递帧和检测结果，避免重复检测
+        self.perception = PerceptionContext(self.screenshot)
+
+        # 共享帧流：固定等待改为等到画面条件成立（或超时）；截图经由感知上下文，只有一条截图路径
+        self.frames = FrameStream(self.screenshot, capture=self.perception.refresh_frame)
+        # 多目标交战队列（可选）：一次扫描规划多个目标，交战之间不再重新扫描
+        self.planner: Optional[EngagementPlanner] = None
+        if self.config.get('monster.planner.enabled', False):
+            self.planner = EngagementPlanner()
+
+        # 本次战斗确认开始的时间（从 WAITING_FOR_COMBAT 进入时才有），供战斗时长模型使用
+        self.combat_started_at: Optional[float] = None
+
+        # 自上次扫描以来累计的镜头移动量（逻辑像素），供怪物跟踪补偿
+        self.camera_shift = (0.0, 0.0)
+
         # 初始化状态机
         self.state_machine = StateMachine()
         self._setup_state_machine()
@@ -56,7 +99,18 @@ class AutoFarming:
         self.no_monster_count = 0  # 连续无怪物计数
         self.max_no_monster_before_systematic = 3  # 连续N次无怪物后启用系统扫描
 
-        self.logger.info("自动刷图系统初始化完成（怪物优先策略）")
+        # 重量级引擎在后台预热，不阻塞初始化
+        if prewarm is None:
+            prewarm = self.config.get('startup.prewarm', True)
+        self.warmup = EngineWarmup()
+        if prewarm:
+            self.warmup.add('pyautogui', load_pyautogui)
+            self.warmup.add('怪物检测OCR', self.monster_detector.warm_up)
+            self.warmup.add('战斗检测OCR', self.combat_detector.ocr.warm_up)
+            self.warmup.add('OCR进程池', self.ocr_executor.warm_up)
+            self.warmup.start()
+
+        self.logger.info(f"自动刷图系统初始化完成（怪物优先策略），耗时: {time.perf_counter() - init_start:.2f}秒")
 
     def _setup_state_machine(self):
         """设置状态机"""
@@ -80,12 +134,12 @@ class AutoFarming:
         self.state_machine.add_transition(State.EXPLORING, State.SCANNING_MONSTERS)
         self.state_machine.add_transition(State.COMPLETED, State.STOPPED)
 
-    def _handle_idle(self):
+    def _handle_idle(self, ctx: PerceptionContext):
         """处理空闲状态"""
         self.logger.info("系统空闲，开始扫描怪物")
         self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
-    def _handle_scanning_monsters(self):
+    def _handle_scanning_monsters(self, ctx: PerceptionContext):
         """扫描怪物状态"""
         try:
             # 跳过探索度检测（太慢）
@@ -99,14 +153,39 @@ class AutoFarming:
             #         self.state_machine.transition_to(State.COMPLETED)
             #         return
 
-            # 检测是否在战斗中（可能是之前的战斗还未结束）
-            if self.combat_detector.is_in_combat():
+            # 扫描总是基于新截图；先在工作进程中开始扫描怪物，同时在本线程检测战斗状态
+            screenshot = ctx.refresh_frame()
+            if self._handle_unexpected_screen(screenshot):
+                return
+            track_ids = None
+            if self.monster_detector.tracker is not None:
+                # 启用跟踪时同步执行：多数帧只跑颜色检测，OCR只在需要确认时运行
+                pending_monsters = Future()
+                tracked, track_ids = self.monster_detector.track_monsters_with_ids(
+                    screenshot, camera_shift=self.camera_shift, frame_id=ctx.frame_id
+                )
+                pending_monsters.set_result(tracked)
+                self.camera_shift = (0.0, 0.0)
+            else:
+                pending_monsters = self.monster_detector.detect_monsters_async(screenshot, frame_id=ctx.frame_id)
+
+            # 检测是否在战斗中（可能是之前的战斗还未结束）：去抖，单帧闪烁不会进入战斗
+            in_combat = self.combat_detector.observe(screenshot, frame_id=ctx.frame_id)
+            while not in_combat and self.combat_detector.pending_change:
+                # 这一帧检测为战斗：立即补看新帧确认
+                in_combat = self.combat_detector.observe()
+            ctx.set_combat(in_combat)
+            if in_combat:
+                pending_monsters.cancel()
                 self.logger.info("检测到战斗状态，进入战斗")
+                # 不知道战斗何时开始：不按战斗时长调度，也不记录时长
+                self.combat_started_at = None
                 self.state_machine.transition_to(State.COMBAT)
                 return
 
-            # 扫描怪物
-            monsters = self.monster_detector.detect_monsters()
+            # 收集扫描结果，留给 MOVING_TO_MONSTER 复用
+            monsters = pending_monsters.result()
+            ctx.set_monsters(monsters, track_ids=track_ids)
 
             if monsters:
                 self.logger.info(f"检测到 {len(monsters)} 个怪物")
@@ -117,27 +196,75 @@ class AutoFarming:
                 self.no_monster_count += 1
                 self.state_machine.transition_to(State.EXPLORING)
 
-            time.sleep(0.5)  # 短暂延迟
-
         except Exception as e:
             self.logger.error(f"扫描怪物时出错: {e}", exc_info=True)
             time.sleep(1)
 
-    def _handle_moving_to_monster(self):
+    def _handle_unexpected_screen(self, screenshot) -> bool:
+        """
+        用画面分类器检查加载、弹窗、断线等非地图画面（不需要OCR）
+
+        Returns:
+            是否遇到了需要暂停的画面（本次扫描应跳过）
+        """
+        screen = classify_screen(screenshot)
+        if screen is None:
+            return False
+        if screen in self.config.get('screen_classifier.stop_labels', ['disconnect']):
+            self.logger.error(f"检测到画面: {screen}，停止系统")
+            self.stop()
+            return True
+        if screen in self.config.get('screen_classifier.pause_labels', ['loading', 'dialog', 'reward']):
+            pause_sec = self.config.get('screen_classifier.pause_sec', 1.0)
+            self.logger.info(f"检测到画面: {screen}，等待 {pause_sec} 秒")
+            time.sleep(pause_sec)
+            return True
+        return False
+
+    def _handle_moving_to_monster(self, ctx: PerceptionContext):
         """移动到怪物状态"""
         try:
-            # 选择最近的怪物
-            current_pos = self.navigator.get_current_position()
+            # 角色始终在屏幕中央（move_to 会把 current_position 改成点击目标，这里直接取屏幕中心）
+            current_pos = self.navigator.detect_character_position()
 
-            if current_pos is None:
-                self.logger.warning("无法检测角色位置，将选择第一个检测到的怪物")
-
-            monster = self.monster_detector.select_nearest_monster(current_pos)
+            if self.planner is not None and self.planner.has_targets():
+                # 继续消费交战队列，不重新扫描
+                monster = self.planner.next_target(self.screenshot.get_window_size())
+            else:
+                # 复用扫描状态的检测结果，过期时才重新检测
+                monsters = ctx.get_monsters()
+                if monsters is None:
+                    self.logger.debug("怪物检测结果已过期，重新检测")
+                    monsters = self.monster_detector.detect_monsters(ctx.refresh_frame(), frame_id=ctx.frame_id)
+                    ctx.set_monsters(monsters)
+
+                if current_pos is None:
+                    self.logger.warning("无法检测角色位置，将选择第一个检测到的怪物")
+
+                if self.planner is not None and current_pos is not None and len(monsters) > 1:
+                    # 多个怪物：规划访问顺序，依次交战
+                    # 只有结果来自同一跟踪快照时才带轨迹ID（重新检测的结果没有ID）
+                    self.planner.plan(monsters, current_pos, ctx.get_monster_track_ids())
+                    monster = self.planner.next_target(self.screenshot.get_window_size())
+                else:
+                    # 选择最近的怪物
+                    monster = self.monster_detector.select_nearest_monster(current_pos, monsters)
 
             if monster:
-                # 移动到怪物位置
+                # 移动到怪物位置（画面随之移动，旧结果作废）
                 self.logger.info(f"移动到怪物位置: ({monster[0]}, {monster[1]})")
                 self.navigator.move_to_monster(monster)
+                self.telemetry.engage(monster[0], monster[1])
+                ctx.invalidate()
+                tracker = self.monster_detector.tracker
+                if tracker is not None:
+                    # 交战的怪物不再跟踪；角色在屏幕中央，镜头随角色移动到怪物处
+                    tracker.remove_near(monster[0], monster[1])
+                    if current_pos is not None:
+                        self.camera_shift = (
+                            self.camera_shift[0] + monster[0] - current_pos[0],
+                            self.camera_shift[1] + monster[1] - current_pos[1]
+                        )
                 self.state_machine.transition_to(State.WAITING_FOR_COMBAT)
             else:
                 self.logger.warning("未找到怪物，返回扫描")
@@ -147,66 +274,82 @@ class AutoFarming:
             self.logger.error(f"移动到怪物时出错: {e}", exc_info=True)
             self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
-    def _handle_waiting_for_combat(self):
+    def _handle_waiting_for_combat(self, ctx: PerceptionContext):
         """等待战斗状态"""
-        # 获取配置的等待时间
-        post_click_wait = self.config.get('game.post_click_wait', 1.5)
-        self.logger.info(f"等待 {post_click_wait} 秒让角色走向怪物...")
-        time.sleep(post_click_wait)
-
-        # 检测战斗状态（重试机制）
-        max_retries = 3
-        retry_delay = 1.0
-
-        for attempt in range(max_retries):
-            if self.combat_detector.is_in_combat():
-                self.logger.info(f"进入战斗状态（第{attempt + 1}次检测成功）")
-                self.state_machine.transition_to(State.COMBAT)
-                return
-
-            if attempt < max_retries - 1:
-                self.logger.debug(f"未检测到战斗状态，等待{retry_delay}秒后进行第{attempt + 2}次检测...")
-                time.sleep(retry_delay)
+        # 角色走向怪物和进入战斗合并为一次等待：由战斗检测本身（签名/模板/OCR）判断，
+        # 进入战斗即返回，最多等 post_click_wait + enter_timeout 秒。
+        # （检测区域位于小地图内，角色移动时小地图也在变化，不能用区域变化作为进入战斗的信号）
+        post_click_wait = float(self.config.get('game.post_click_wait', 1.5))
+        enter_timeout = float(self.config.get('combat.state.enter_timeout', 3.0))
+        self.logger.info(f"等待角色走向怪物并进入战斗（最多 {post_click_wait + enter_timeout:.1f} 秒）...")
+
+        # 检测战斗状态：连续多帧检测为战斗才算进入，单帧闪烁不会误判
+        in_combat = self.combat_detector.wait_for_combat_start(
+            timeout=post_click_wait + enter_timeout,
+            screenshot_source=lambda: (ctx.refresh_frame(), ctx.frame_id)
+        )
+        ctx.set_combat(in_combat)
+        if in_combat:
+            self.combat_started_at = self.combat_detector.combat_started_at
+            self.state_machine.transition_to(State.COMBAT)
+            return
 
-        self.logger.warning(f"经过{max_retries}次检测仍未进入战斗，返回扫描")
+        self.logger.warning("未进入战斗，返回扫描")
+        if self.planner is not None:
+            # 没有接上战斗，后续目标的位置推算也不可靠了
+            self.planner.clear()
         self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
-    def _handle_combat(self):
+    def _handle_combat(self, ctx: PerceptionContext):
         """战斗状态"""
-        success = self.combat_detector.wait_for_combat_end()
+        success = self.combat_detector.wait_for_combat_end(started_at=self.combat_started_at)
+        self.combat_started_at = None
+        ctx.invalidate()
         if not success:
             self.logger.error("战斗超时")
+            if self.planner is not None:
+                self.planner.clear()
             # 不停止，继续扫描
             self.state_machine.transition_to(State.SCANNING_MONSTERS)
             return
 
+        # 战斗结束后等画面稳定（结算画面消失），最多1秒
+        wait_until(camera_stopped(self.navigator.motion), self.frames, 1.0, description='战斗结束后画面稳定')
+        if self.planner is not None and self.planner.has_targets():
+            self.logger.info(f"战斗结束，前往队列中的下一个怪物（剩余 {len(self.planner.queue)} 个）")
+            self.state_machine.transition_to(State.MOVING_TO_MONSTER)
+            return
+
         self.logger.info("战斗结束，继续扫描怪物")
-        time.sleep(1.0)  # 战斗结束后短暂等待
         self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
-    def _handle_exploring(self):
+    def _handle_exploring(self, ctx: PerceptionContext):
         """探索新区域状态"""
         try:
             # 检查是否卡死
             if self.exploration_navigator.is_stuck():
                 self.logger.warning("检测到卡死，执行随机逃逸")
                 self.exploration_navigator.escape()
-                time.sleep(1.0)
+                self._after_exploration_move(ctx)
+                self._wait_camera_stopped(1.0)
                 self.state_machine.transition_to(State.SCANNING_MONSTERS)
                 return
 
             # 策略1：尝试使用小地图引导
             if self.no_monster_count < self.max_no_monster_before_systematic:
                 self.logger.debug("尝试使用小地图引导探索")
-                if self.exploration_navigator.explore_to_unexplored():
-                    time.sleep(1.5)  # 移动后等待
+                # 复用扫描时的截图和小地图（扫描之后角色没有移动）
+                if self.exploration_navigator.explore_to_unexplored(minimap=ctx.get_minimap()):
+                    self._after_exploration_move(ctx)
+                    self._wait_camera_stopped(1.5)  # 移动后等镜头停下
                     self.state_machine.transition_to(State.SCANNING_MONSTERS)
                     return
 
             # 策略2：小地图引导失败，使用系统扫描
             self.logger.debug("使用系统扫描探索")
             self.exploration_navigator.explore_systematic()
-            time.sleep(1.5)  # 移动后等待
+            self._after_exploration_move(ctx)
+            self._wait_camera_stopped(1.5)  # 移动后等镜头停下
             self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
         except Exception as e:
@@ -214,7 +357,22 @@ class AutoFarming:
             time.sleep(1)
             self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
-    def _handle_completed(self):
+    def _after_exploration_move(self, ctx: PerceptionContext):
+        """探索移动后：感知结果作废；镜头移动量未知，跟踪轨迹也一并清空"""
+        ctx.invalidate()
+        if self.planner is not None:
+            self.planner.clear()
+        if self.monster_detector.tracker is not None:
+            self.monster_detector.tracker.reset()
+        self.camera_shift = (0.0, 0.0)
+
+    def _wait_camera_stopped(self, timeout: float):
+        """等镜头停止移动（角色走到目的地），最多等 timeout 秒；探索移动已等到到达时跳过"""
+        if self.exploration_navigator.wait_arrival:
+            return
+        wait_until(camera_stopped(self.navigator.motion), self.frames, timeout, description='镜头停止')
+
+    def _handle_completed(self, ctx: PerceptionContext):
         """完成状态"""
         self.logger.info("=" * 50)
         self.logger.info("探索完成！")
@@ -225,6 +383,7 @@ class AutoFarming:
     def start(self):
         """启动自动刷图"""
         self.logger.info("启动自动刷图系统（怪物优先策略）")
+        self.telemetry.emit('session_start')
         self.state_machine.transition_to(State.SCANNING_MONSTERS)
 
         # 检查必要的模板文件
@@ -244,10 +403,12 @@ class AutoFarming:
                 if loop_count % 10 == 0:
                     self.logger.debug(f"当前状态: {current_state.value}, 循环次数: {loop_count}")
 
-                self.state_machine.update()
+                self.state_machine.update(self.perception)
                 loop_count += 1
 
-                time.sleep(0.1)  # 主循环延迟
+                loop_delay = self.config.get('game.loop_delay', 0.0)
+                if loop_delay > 0:
+                    time.sleep(loop_delay)  # 主循环延迟（各状态已按画面条件等待，默认不再额外等待）
 
         except KeyboardInterrupt:
             self.logger.info("收到中断信号，停止系统")
@@ -255,17 +416,34 @@ class AutoFarming:
         except Exception as e:
             self.logger.error(f"运行出错: {e}", exc_info=True)
             self.stop()
+        finally:
+            # 运行中学到的战斗签名按间隔保存，退出时补存最后一批
+            self.combat_detector.save_learned()
 
     def stop(self):
         """停止自动刷图"""
         self.logger.info("停止自动刷图系统")
+        self.telemetry.emit('session_end')
         self.state_machine.transition_to(State.STOPPED)
+        self.ocr_executor.shutdown(wait=False)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='游戏自动刷图工具（怪物优先策略）')
+    parser.add_argument('--config', type=str, default=None,
+                        help='配置文件路径，默认 config/config.yaml')
+    parser.add_argument('--no-prewarm', action='store_true',
+                        help='不在后台预热OCR/GUI引擎（首次使用时再加载）')
+    return parser.parse_args(argv)
 
 
 def main():
     """主函数"""
+    args = parse_args()
     try:
-        farming = AutoFarming()
+        get_config(args.config)
+        farming = AutoFarming(prewarm=False if args.no_prewarm else None)
         farming.start()
     except Exception as e:
         logger = get_logger(__name__)
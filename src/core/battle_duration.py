@@ -0,0 +1,130 @@
+"""
+战斗时长模型
+
+按地图（或调用方给出的其他键，如怪物名）记录最近的战斗时长，跨会话保存为 JSON。
+等待战斗结束时：
+- 在学到的低分位数之前不做任何检测（战斗不可能这么快结束）
+- 在低分位数到高分位数之间密集检测（大部分战斗在这里结束）
+样本不足时不做调度，行为与原来一致。
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BattleDurationModel:
+    """战斗时长分布（经验分位数）"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化模型并加载历史记录
+
+        Args:
+            path: 记录文件路径，如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        project_root = Path(__file__).parent.parent.parent
+        if path is None:
+            path = self.config.get('combat.duration.path', 'data/battle_durations.json')
+        self.path = Path(path) if Path(path).is_absolute() else project_root / path
+
+        # 每个键保留的最近样本数
+        self.max_samples = int(self.config.get('combat.duration.max_samples', 50))
+        # 样本数达到该值才开始调度
+        self.min_samples = int(self.config.get('combat.duration.min_samples', 5))
+        # 第一次检测的分位数，以及再乘的安全系数
+        self.first_check_quantile = float(self.config.get('combat.duration.first_check_quantile', 0.1))
+        self.safety_factor = float(self.config.get('combat.duration.safety_factor', 0.8))
+        # 密集检测窗口的上分位数
+        self.dense_until_quantile = float(self.config.get('combat.duration.dense_until_quantile', 0.9))
+
+        self.durations: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """从磁盘加载历史记录"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.durations = {
+                str(key): [float(v) for v in values][-self.max_samples:]
+                for key, values in data.items()
+                if isinstance(values, list)
+            }
+            logger.info(f"加载战斗时长记录: {', '.join(f'{k}={len(v)}' for k, v in self.durations.items())}")
+        except Exception as e:
+            logger.warning(f"加载战斗时长记录失败: {e}")
+
+    def save(self):
+        """保存历史记录到磁盘"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = {key: [round(v, 2) for v in values] for key, values in self.durations.items()}
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.warning(f"保存战斗时长记录失败: {e}")
+
+    def record(self, key: str, duration: float, save: bool = True):
+        """
+        记录一场战斗的时长（超时的战斗不要记录）
+
+        Args:
+            key: 地图名或怪物名
+            duration: 战斗时长（秒）
+            save: 是否立即保存
+        """
+        if duration <= 0:
+            return
+        with self._lock:
+            values = self.durations.setdefault(key, [])
+            values.append(float(duration))
+            del values[:-self.max_samples]
+        logger.debug(f"记录战斗时长: {key} {duration:.1f}秒（共 {len(values)} 场）")
+        if save:
+            self.save()
+
+    def quantile(self, key: str, q: float) -> Optional[float]:
+        """
+        某个键的战斗时长分位数
+
+        Args:
+            key: 地图名或怪物名
+            q: 分位数（0-1）
+
+        Returns:
+            时长（秒），样本不足时返回None
+        """
+        values = self.durations.get(key)
+        if not values or len(values) < self.min_samples:
+            return None
+        return float(np.quantile(values, q))
+
+    def first_check_delay(self, key: str) -> float:
+        """
+        第一次检测前可以安全等待的时间
+
+        Returns:
+            秒，样本不足时返回0
+        """
+        low = self.quantile(key, self.first_check_quantile)
+        return low * self.safety_factor if low is not None else 0.0
+
+    def dense_window_end(self, key: str) -> Optional[float]:
+        """
+        密集检测窗口的结束时间（超过后战斗大概率是长尾，按常规间隔检测）
+
+        Returns:
+            秒，样本不足时返回None
+        """
+        return self.quantile(key, self.dense_until_quantile)
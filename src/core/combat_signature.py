@@ -0,0 +1,214 @@
+"""
+战斗区域像素签名模块
+
+战斗检测区域（"认输"按钮）在战斗内外的外观几乎固定，
+因此用OCR的判断结果作为标签，记录该区域的颜色直方图和缩略图作为参考签名；
+之后按与参考签名的距离分类，只需几十微秒，距离不明确时才交给OCR。
+默认检测区域位于小地图内，非战斗时的外观随角色移动不断变化，所以默认只学习战斗中的外观：
+与战斗参考足够近为战斗中，足够远为非战斗，介于两者之间才交给OCR。
+参考签名保存为 npz 文件（有新签名时按间隔保存，退出时再保存一次），重启后继续使用。
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 缩略图尺寸 (宽, 高) 和 HSV 直方图分箱
+THUMB_SIZE = (16, 8)
+HIST_BINS = (8, 4, 4)
+
+
+def compute_signature(crop, thumb_size: Tuple[int, int] = THUMB_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    计算区域签名
+
+    Args:
+        crop: 检测区域图像（PIL Image 或 RGB 数组）
+        thumb_size: 缩略图尺寸 (宽, 高)
+
+    Returns:
+        (颜色直方图, 缩略图)：直方图归一化为和为1；缩略图为零均值、单位范数的灰度向量
+    """
+    rgb = np.asarray(crop.convert('RGB')) if isinstance(crop, Image.Image) else np.ascontiguousarray(crop[:, :, :3])
+    small = cv2.resize(rgb, thumb_size, interpolation=cv2.INTER_AREA)
+
+    hsv = cv2.cvtColor(small, cv2.COLOR_RGB2HSV)
+    hist = cv2.calcHist([hsv], [0, 1, 2], None, list(HIST_BINS), [0, 180, 0, 256, 0, 256]).reshape(-1)
+    hist = hist / max(float(hist.sum()), 1e-6)
+
+    gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.float32).reshape(-1)
+    gray -= gray.mean()
+    norm = float(np.linalg.norm(gray))
+    thumb = gray / norm if norm > 1e-6 else gray
+    return hist.astype(np.float32), thumb.astype(np.float32)
+
+
+class CombatSignatureModel:
+    """战斗区域签名分类器"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化签名模型并加载已保存的参考签名
+
+        Args:
+            path: 签名文件路径，如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        project_root = Path(__file__).parent.parent.parent
+        if path is None:
+            path = self.config.get('combat.signature.path', 'data/combat_signatures.npz')
+        self.path = Path(path) if Path(path).is_absolute() else project_root / path
+
+        # 距离 = hist_weight * 直方图L1距离/2 + (1 - 缩略图相关系数)/2，范围 0-1
+        self.hist_weight = float(self.config.get('combat.signature.hist_weight', 0.5))
+        # 最近参考的距离超过该值视为没见过的外观，交给OCR
+        self.max_distance = float(self.config.get('combat.signature.max_distance', 0.25))
+        # 最近的同类参考要比另一类近这么多倍才算明确
+        self.margin_ratio = float(self.config.get('combat.signature.margin_ratio', 0.5))
+        # 每类最多保留的参考签名数
+        self.max_refs = int(self.config.get('combat.signature.max_refs', 16))
+        # 与已有参考距离小于该值的新样本不再加入
+        self.dedup_distance = float(self.config.get('combat.signature.dedup_distance', 0.02))
+        # 是否学习非战斗外观（检测区域内容在非战斗时固定才适合开启）
+        self.learn_out_of_combat = bool(self.config.get('combat.signature.learn_out_of_combat', False))
+        # 只有战斗参考时：最近距离超过该值视为非战斗
+        self.out_distance = float(self.config.get('combat.signature.out_distance', 0.45))
+        # 有新签名时最多每隔多少秒写一次磁盘
+        self.save_interval = float(self.config.get('combat.signature.save_interval_sec', 60.0))
+        self.dirty = False
+        self._last_save = time.monotonic()
+
+        n_hist = int(np.prod(HIST_BINS))
+        n_thumb = THUMB_SIZE[0] * THUMB_SIZE[1]
+        self.hists = {True: np.empty((0, n_hist), np.float32), False: np.empty((0, n_hist), np.float32)}
+        self.thumbs = {True: np.empty((0, n_thumb), np.float32), False: np.empty((0, n_thumb), np.float32)}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """从磁盘加载参考签名"""
+        if not self.path.exists():
+            logger.debug(f"战斗签名文件不存在，将从OCR结果中学习: {self.path}")
+            return
+        try:
+            data = np.load(self.path)
+            labels = ((True, 'in'), (False, 'out')) if self.learn_out_of_combat else ((True, 'in'),)
+            for label, key in labels:
+                hists = data[f'{key}_hist']
+                thumbs = data[f'{key}_thumb']
+                if hists.shape[1:] != self.hists[label].shape[1:] or thumbs.shape[1:] != self.thumbs[label].shape[1:]:
+                    logger.warning("战斗签名文件格式不匹配，忽略")
+                    return
+                self.hists[label] = hists.astype(np.float32)
+                self.thumbs[label] = thumbs.astype(np.float32)
+            logger.info(f"加载战斗签名: 战斗中 {len(self.hists[True])} 个，非战斗 {len(self.hists[False])} 个")
+        except Exception as e:
+            logger.warning(f"加载战斗签名失败: {e}")
+
+    def save(self):
+        """保存参考签名到磁盘"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                np.savez_compressed(
+                    self.path,
+                    in_hist=self.hists[True], in_thumb=self.thumbs[True],
+                    out_hist=self.hists[False], out_thumb=self.thumbs[False],
+                )
+                self.dirty = False
+                self._last_save = time.monotonic()
+            logger.debug(f"战斗签名已保存: {self.path}")
+        except Exception as e:
+            logger.warning(f"保存战斗签名失败: {e}")
+
+    def flush(self):
+        """有未保存的新签名时立即保存（退出时调用）"""
+        if self.dirty:
+            self.save()
+
+    def _distances(self, hist: np.ndarray, thumb: np.ndarray, label: bool) -> np.ndarray:
+        """到某一类所有参考签名的距离"""
+        refs_hist = self.hists[label]
+        if len(refs_hist) == 0:
+            return np.empty(0, np.float32)
+        hist_d = np.abs(refs_hist - hist).sum(axis=1) / 2
+        thumb_d = (1 - self.thumbs[label] @ thumb) / 2
+        return (self.hist_weight * hist_d + (1 - self.hist_weight) * thumb_d).astype(np.float32)
+
+    def classify(self, crop: Image.Image) -> Optional[bool]:
+        """
+        按签名距离判断是否在战斗中
+
+        Args:
+            crop: 检测区域图像
+
+        Returns:
+            True/False；没有战斗参考、外观没见过或距离不明确时返回None（需要OCR）
+        """
+        hist, thumb = compute_signature(crop)
+        d_in = self._distances(hist, thumb, True)
+        if d_in.size == 0:
+            return None
+        best_in = float(d_in.min())
+        d_out = self._distances(hist, thumb, False)
+        if d_out.size == 0:
+            # 只有战斗参考：按到战斗外观的距离判断
+            if best_in <= self.max_distance:
+                return True
+            if best_in >= self.out_distance:
+                return False
+            logger.debug(f"战斗签名: 距离不明确 (in={best_in:.3f})")
+            return None
+        best_out = float(d_out.min())
+        if min(best_in, best_out) > self.max_distance:
+            logger.debug(f"战斗签名: 未见过的外观 (in={best_in:.3f}, out={best_out:.3f})")
+            return None
+        if best_in <= best_out * self.margin_ratio:
+            return True
+        if best_out <= best_in * self.margin_ratio:
+            return False
+        logger.debug(f"战斗签名: 距离不明确 (in={best_in:.3f}, out={best_out:.3f})")
+        return None
+
+    def learn(self, crop: Image.Image, in_combat: bool, save: bool = True) -> bool:
+        """
+        用OCR得到的标签学习一个参考签名
+
+        Args:
+            crop: 检测区域图像
+            in_combat: OCR判断的结果
+            save: 加入新签名后是否保存（距上次保存不足 save_interval 秒时只标记，稍后或退出时保存）
+
+        Returns:
+            是否加入了新的参考签名；未开启 learn_out_of_combat 时非战斗样本不学习
+        """
+        if not in_combat and not self.learn_out_of_combat:
+            return False
+        hist, thumb = compute_signature(crop)
+        d = self._distances(hist, thumb, in_combat)
+        if d.size and float(d.min()) < self.dedup_distance:
+            return False
+        with self._lock:
+            hists = np.vstack([self.hists[in_combat], hist[None, :]])
+            thumbs = np.vstack([self.thumbs[in_combat], thumb[None, :]])
+            # 超过上限时丢弃最早的参考
+            self.hists[in_combat] = hists[-self.max_refs:]
+            self.thumbs[in_combat] = thumbs[-self.max_refs:]
+            self.dirty = True
+        logger.debug(f"学习战斗签名: {'战斗中' if in_combat else '非战斗'}，共 {len(self.hists[in_combat])} 个")
+        if save and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return True
+
+    def is_trained(self) -> bool:
+        """已有可用于分类的参考签名（战斗参考；学习非战斗外观时两类都要有）"""
+        if len(self.hists[True]) == 0:
+            return False
+        return not self.learn_out_of_combat or len(self.hists[False]) > 0
@@ -5,9 +5,17 @@ from PIL import Image
 from typing import Optional
 from src.ui_interaction.screenshot import Screenshot
 from src.ui_interaction.image_match import ImageMatcher
+from src.ui_interaction.template_anchor import TemplateAnchor
 from src.ui_interaction.ocr import OCR
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.core.text_classifier import get_text_classifier
+from src.core.combat_signature import CombatSignatureModel
+from src.core.combat_watcher import CombatWatcher
+from src.core.battle_duration import BattleDurationModel
+from src.core.text_scene import get_text_scene_cache
+from src.core.telemetry import get_telemetry
+import threading
 import time
 
 logger = get_logger(__name__)
@@ -21,15 +29,35 @@ class CombatStateDetector:
         self.config = get_config()
         self.screenshot = Screenshot()
         self.matcher = ImageMatcher()
-        # 不再使用OCR类，直接使用EasyOCR（参考怪物检测）
-        # self.ocr = OCR()
+        self.ocr = OCR()
         
-        # 检测方法配置：'ocr', 'template', 或 'both'
+        # 检测方法配置：'ocr', 'signature', 'template'（无法判断时回退）, 或 'both'
         self.detection_method = self.config.get('combat.detection_method', 'ocr')
+
+        # 模板匹配无法判断（模板缺失或两个锚点都没找到）时使用的方法：'signature' 或 'ocr'
+        self.template_fallback = self.config.get('combat.template.fallback', 'signature')
+
+        # 像素签名模型（signature 方法，或模板匹配回退到签名）：OCR只在签名不明确时运行
+        uses_signature = self.detection_method == 'signature' or (
+            self.detection_method == 'template' and self.template_fallback == 'signature'
+        )
+        self.signature_model = CombatSignatureModel() if uses_signature else None
         
-        # 战斗界面特征模板（需要根据实际游戏界面配置）
-        self.combat_template = "combat_ui.png"  # 战斗界面特征
-        self.map_template = "map_ui.png"  # 地图界面特征
+        # 战斗界面特征模板（需要根据实际游戏界面截取），只在配置的区域及缓存的锚点附近匹配
+        # 只有 template / both 方法才加载
+        self.combat_template = self.config.get('combat.template.combat.file', "combat_ui.png")  # 战斗界面特征
+        self.map_template = self.config.get('combat.template.map.file', "map_ui.png")  # 地图界面特征
+        self.combat_anchor: Optional[TemplateAnchor] = None
+        self.map_anchor: Optional[TemplateAnchor] = None
+        if self.detection_method in ('template', 'both'):
+            self.combat_anchor = self._make_anchor('combat', self.combat_template)
+            self.map_anchor = self._make_anchor('map', self.map_template)
+            if not self._anchors_available():
+                logger.warning(
+                    f"检测方法为 {self.detection_method}，但没有可用的锚点模板"
+                    f"（templates/{self.combat_template}、templates/{self.map_template}），"
+                    f"每次检测都会回退到 {self.template_fallback if self.detection_method == 'template' else 'ocr'}"
+                )
         
         # OCR检测配置
         # 注意：detection_region 的坐标是相对于游戏窗口的，不是屏幕坐标
@@ -53,10 +81,38 @@ class CombatStateDetector:
                 'height': int(window_height * 0.3)  # 高度30%
             }
         
-        # OCR识别关键词
-        self.combat_keywords = combat_config.get('keywords', ['认输'])
+        # OCR识别关键词（由共享的文本分类器匹配）
+        self.text_classifier = get_text_classifier()
+        self.combat_keywords = self.text_classifier.combat_keywords
+
+        # 交战事件记录（logs/combat_events.jsonl）
+        self.telemetry = get_telemetry()
+
+        # 同一帧已有整帧OCR（文本场景）时直接读取，不再单独识别检测区域
+        self.text_scenes = get_text_scene_cache()
+        self.text_scene_wait = float(self.config.get('text_scene.wait_sec', 3.0))
+
+        # 去抖状态：连续 enter_frames / exit_frames 帧结果一致才切换
+        self.enter_frames = max(1, int(self.config.get('combat.state.enter_frames', 2)))
+        self.exit_frames = max(1, int(self.config.get('combat.state.exit_frames', 2)))
+        self.state = False
+        self._streak = 0
+        self._last_observed = None
+        # 最近一次 wait_for_combat_start 确认进入战斗的时间（time.time()）
+        self.combat_started_at: Optional[float] = None
+
+        # 单帧结果缓存：同一帧的多个调用方共享一次检测
+        self.cache_ttl = float(self.config.get('combat.state.cache_ttl_sec', 0.5))
+        self._cache = None  # (frame_id, 截图, 时间, 结果)
+        self._cache_lock = threading.Lock()
+
+        # 变化触发的战斗结束监视器（未启用时按固定间隔轮询）
+        self.watcher = CombatWatcher(self) if self.config.get('combat.watcher.enabled', True) else None
+
+        # 战斗时长模型：按学到的时长推迟第一次检测
+        self.duration_model = BattleDurationModel() if self.config.get('combat.duration.enabled', True) else None
     
-    def _detect_by_ocr(self, screenshot: Image.Image) -> bool:
+    def _detect_by_ocr(self, screenshot: Image.Image, frame_id: Optional[int] = None) -> bool:
         """
         使用OCR识别"认输"文字来检测战斗状态
         
@@ -66,169 +122,404 @@ class CombatStateDetector:
         Returns:
             是否在战斗中
         """
+        from_scene = self._combat_from_scene(frame_id)
+        if from_scene is not None:
+            return from_scene
+        cropped = self._crop_detection_region(screenshot)
+        if cropped is None:
+            return False
+        return bool(self._ocr_region(cropped))
+
+    def _combat_from_scene(self, frame_id: Optional[int]) -> Optional[bool]:
+        """
+        从该帧的文本场景中查找战斗关键词（整帧OCR正在进行时等待它完成）
+
+        Returns:
+            是否在战斗中；没有覆盖检测区域的文本场景时返回None
+        """
+        scene = self.text_scenes.get(frame_id, timeout=self.text_scene_wait)
+        if scene is None or not scene.covers(self.detection_region):
+            return None
+        keyword = scene.combat_keyword(self.detection_region)
+        logger.debug(f"文本场景（帧 {frame_id}）战斗关键词: {keyword}")
+        return keyword is not None
+
+    def _crop_detection_region(self, screenshot: Image.Image) -> Optional[Image.Image]:
+        """
+        裁剪战斗检测区域（坐标相对于窗口，考虑 Retina 缩放）
+
+        Returns:
+            裁剪后的区域图像，区域无效时返回None
+        """
+        # 获取截图实际尺寸
+        screenshot_width, screenshot_height = screenshot.size
+
+        # 计算缩放比例（Retina截图可能是2x分辨率）
+        window = self.config.window
+        config_width = window.get('width', screenshot_width)
+        config_height = window.get('height', screenshot_height)
+        scale_x = screenshot_width / config_width if config_width > 0 else 1.0
+        scale_y = screenshot_height / config_height if config_height > 0 else 1.0
+
+        region = self.detection_region
+        left = max(0, int(region['left'] * scale_x))
+        top = max(0, int(region['top'] * scale_y))
+        right = min(screenshot_width, int((region['left'] + region['width']) * scale_x))
+        bottom = min(screenshot_height, int((region['top'] + region['height']) * scale_y))
+        if right <= left or bottom <= top:
+            logger.error(f"检测区域无效: ({left}, {top}, {right}, {bottom})，截图尺寸: {screenshot_width}x{screenshot_height}")
+            return None
+        return screenshot.crop((left, top, right, bottom))
+
+    def _ocr_region(self, cropped: Image.Image) -> Optional[bool]:
+        """
+        对已裁剪的检测区域运行OCR并匹配战斗关键词
+
+        Args:
+            cropped: 检测区域图像
+
+        Returns:
+            是否在战斗中；OCR出错时返回None
+        """
         try:
-            # 获取截图实际尺寸
-            screenshot_width, screenshot_height = screenshot.size
-            
-            # 获取配置的窗口尺寸（用于计算缩放比例）
-            window = self.config.window
-            config_width = window.get('width', screenshot_width)
-            config_height = window.get('height', screenshot_height)
-            
-            # 计算缩放比例（Retina截图可能是2x分辨率）
-            scale_x = screenshot_width / config_width if config_width > 0 else 1.0
-            scale_y = screenshot_height / config_height if config_height > 0 else 1.0
-            
-            # 裁剪检测区域（坐标相对于窗口截图，需要考虑缩放）
-            region = self.detection_region
-            left = int(region['left'] * scale_x)
-            top = int(region['top'] * scale_y)
-            right = int((region['left'] + region['width']) * scale_x)
-            bottom = int((region['top'] + region['height']) * scale_y)
-            
-            # 边界检查
-            if left < 0:
-                logger.warning(f"检测区域左边界超出截图范围: {left} < 0，已调整为0")
-                left = 0
-            if top < 0:
-                logger.warning(f"检测区域上边界超出截图范围: {top} < 0，已调整为0")
-                top = 0
-            if right > screenshot_width:
-                logger.warning(f"检测区域右边界超出截图范围: {right} > {screenshot_width}，已调整为{screenshot_width}")
-                right = screenshot_width
-            if bottom > screenshot_height:
-                logger.warning(f"检测区域下边界超出截图范围: {bottom} > {screenshot_height}，已调整为{screenshot_height}")
-                bottom = screenshot_height
-            
-            # 确保区域有效
-            if right <= left or bottom <= top:
-                logger.error(f"检测区域无效: ({left}, {top}, {right}, {bottom})，截图尺寸: {screenshot_width}x{screenshot_height}")
-                return False
-            
-            cropped = screenshot.crop((left, top, right, bottom))
-            
-            # 参考怪物检测的逻辑：直接使用EasyOCR的readtext方法
-            try:
-                import easyocr
-                import numpy as np
-                
-                # 初始化easyocr（只初始化一次）
-                if not hasattr(self, '_easyocr_reader'):
-                    logger.debug("初始化EasyOCR...")
-                    self._easyocr_reader = easyocr.Reader(['ch_sim', 'en'], gpu=False)
-                
-                # 转换为numpy数组
-                img_array = np.array(cropped)
-                
-                # 使用easyocr识别（参考怪物检测，不依赖置信度阈值过滤）
-                results = self._easyocr_reader.readtext(img_array)
-                
-                # 遍历所有识别结果，检查是否包含战斗关键词（参考怪物检测逻辑）
-                for (bbox, text, conf) in results:
-                    # 检查是否包含战斗关键词（不依赖置信度阈值，只要包含关键词就认为在战斗）
-                    for keyword in self.combat_keywords:
-                        if keyword in text:
-                            logger.debug(f"检测到战斗关键词: '{keyword}' (文本: '{text}')")
-                            return True
-                
-                logger.debug(f"未检测到战斗关键词，识别到 {len(results)} 个文本块")
-                return False
-                
-            except ImportError:
-                logger.error("EasyOCR未安装，请运行: pip install easyocr")
-                return False
-            except Exception as e:
-                logger.error(f"EasyOCR战斗检测失败: {e}", exc_info=True)
-                return False
+            # 只对检测区域运行识别网络（区域很小，不需要文字检测）
+            text, conf = self.ocr.recognize_batch([cropped])[0]
+
+            # 检查是否包含战斗关键词（不依赖置信度阈值，只要包含关键词就认为在战斗）
+            keyword = self.text_classifier.match_combat(text)
+            if keyword is not None:
+                logger.debug(f"检测到战斗关键词: '{keyword}' (文本: '{text}', 置信度: {conf:.3f})")
+                return True
+
+            logger.debug(f"未检测到战斗关键词，识别文本: '{text}'")
+            return False
         except Exception as e:
             logger.error(f"OCR战斗检测失败: {e}", exc_info=True)
-            return False
+            return None
     
-    def _detect_by_template(self, screenshot: Image.Image) -> bool:
+    def _detect_by_signature(self, screenshot: Image.Image, frame_id: Optional[int] = None) -> bool:
         """
-        使用模板匹配检测战斗状态
+        按检测区域的像素签名判断战斗状态，签名不明确时用OCR判断并学习
+
+        Args:
+            screenshot: 窗口截图
+
+        Returns:
+            是否在战斗中
+        """
+        cropped = self._crop_detection_region(screenshot)
+        if cropped is None:
+            return False
+
+        verdict = self.signature_model.classify(cropped)
+        if verdict is not None:
+            logger.debug(f"战斗签名判断: {'战斗中' if verdict else '非战斗'}")
+            return verdict
+
+        # 签名不明确：OCR作为标签（同一帧已有整帧OCR时直接读取），顺便学习这个外观
+        in_combat = self._combat_from_scene(frame_id)
+        if in_combat is None:
+            in_combat = self._ocr_region(cropped)
+        if in_combat is None:
+            return False
+        self.signature_model.learn(cropped, in_combat)
+        return in_combat
+
+    def save_learned(self):
+        """保存尚未写入磁盘的战斗签名（退出时调用）"""
+        if self.signature_model is not None:
+            self.signature_model.flush()
+
+    def _make_anchor(self, name: str, template_path: Optional[str]) -> Optional[TemplateAnchor]:
+        """按配置 combat.template.<name> 创建锚点，模板路径为空时返回None"""
+        if not template_path:
+            return None
+        return TemplateAnchor(
+            name,
+            template_path,
+            self.matcher,
+            region=self.config.get(f'combat.template.{name}.region'),
+            threshold=float(self.config.get('combat.template.threshold', 0.7)),
+            search_margin=int(self.config.get('combat.template.search_margin', 20)),
+        )
+
+    def _anchors_available(self) -> bool:
+        """是否至少有一个锚点模板可用"""
+        return any(anchor is not None and anchor.available for anchor in (self.combat_anchor, self.map_anchor))
+
+    def _detect_by_template(self, screenshot: Image.Image) -> Optional[bool]:
+        """
+        使用模板匹配检测战斗状态（只在锚点区域内匹配）
         
         Args:
             screenshot: 屏幕截图
         
         Returns:
-            是否在战斗中
+            True=战斗界面锚点存在，False=地图界面锚点存在，
+            None=无法判断（模板不可用或两个锚点都没找到）
         """
+        window_size = self.screenshot.get_window_size()
+
         # 方法1：检测战斗界面特征
-        if self.combat_template:
-            match = self.matcher.match_template(
-                screenshot,
-                self.combat_template,
-                threshold=0.7  # 战斗界面检测可以降低阈值
-            )
-            if match:
-                logger.debug("检测到战斗界面（模板匹配）")
-                return True
+        if self.combat_anchor is not None and self.combat_anchor.find(screenshot, window_size):
+            logger.debug("检测到战斗界面（模板匹配）")
+            return True
         
-        # 方法2：检测是否不在地图界面（作为补充判断）
-        if self.map_template:
-            match = self.matcher.match_template(
-                screenshot,
-                self.map_template,
-                threshold=0.7
-            )
-            if not match:
-                logger.debug("未检测到地图界面，可能在战斗中（模板匹配）")
-                return True
+        # 方法2：检测地图界面特征（找到说明不在战斗中）
+        if self.map_anchor is not None and self.map_anchor.find(screenshot, window_size):
+            logger.debug("检测到地图界面（模板匹配）")
+            return False
         
-        return False
+        return None
+
+    def _detect_by_template_with_fallback(self, screenshot: Image.Image, frame_id: Optional[int] = None) -> bool:
+        """模板匹配，无法判断时回退到签名或OCR"""
+        if self._anchors_available():
+            result = self._detect_by_template(screenshot)
+            if result is not None:
+                return result
+            logger.debug(f"模板匹配无法判断，回退到 {self.template_fallback}")
+        if self.template_fallback == 'signature' and self.signature_model is not None:
+            return self._detect_by_signature(screenshot, frame_id)
+        return self._detect_by_ocr(screenshot, frame_id)
     
-    def is_in_combat(self, screenshot: Optional[Image.Image] = None) -> bool:
+    def is_in_combat(self, screenshot: Optional[Image.Image] = None, frame_id: Optional[int] = None) -> bool:
         """
-        检测是否在战斗中
+        检测是否在战斗中（单帧结果，同一帧在 cache_ttl 内只检测一次）
         
         Args:
-            screenshot: 屏幕截图，如果为None则重新截图
+            screenshot: 屏幕截图，如果为None则重新截图（不使用缓存）
+            frame_id: 帧序号（如 PerceptionContext.frame_id），同一帧的多个调用方共享结果；
+                      为None时按截图对象本身缓存
         
         Returns:
             是否在战斗中
         """
         if screenshot is None:
             screenshot = self.screenshot.capture_full_window()
-        
+        else:
+            cached = self._cached_result(screenshot, frame_id)
+            if cached is not None:
+                return cached
+
+        result = self._detect(screenshot, frame_id)
+        with self._cache_lock:
+            self._cache = (frame_id, screenshot, time.time(), result)
+        return result
+
+    def _cached_result(self, screenshot: Image.Image, frame_id: Optional[int]) -> Optional[bool]:
+        """同一帧且未过期的缓存结果，没有时返回None"""
+        with self._cache_lock:
+            if self._cache is None:
+                return None
+            cached_frame_id, cached_screenshot, cached_time, result = self._cache
+        if time.time() - cached_time > self.cache_ttl:
+            return None
+        if frame_id is not None and frame_id == cached_frame_id:
+            return result
+        if screenshot is cached_screenshot:
+            return result
+        return None
+
+    def _detect(self, screenshot: Image.Image, frame_id: Optional[int] = None) -> bool:
+        """按配置的检测方法检测一帧"""
         # 根据配置的检测方法进行检测
         if self.detection_method == 'ocr':
-            return self._detect_by_ocr(screenshot)
+            return self._detect_by_ocr(screenshot, frame_id)
+        elif self.detection_method == 'signature':
+            return self._detect_by_signature(screenshot, frame_id)
         elif self.detection_method == 'template':
-            return self._detect_by_template(screenshot)
+            return self._detect_by_template_with_fallback(screenshot, frame_id)
         elif self.detection_method == 'both':
             # 两种方法都尝试，任一成功即返回True
-            ocr_result = self._detect_by_ocr(screenshot)
+            ocr_result = self._detect_by_ocr(screenshot, frame_id)
             template_result = self._detect_by_template(screenshot)
-            return ocr_result or template_result
+            return ocr_result or template_result is True
         else:
             # 默认使用OCR
             logger.warning(f"未知的检测方法: {self.detection_method}，使用OCR")
-            return self._detect_by_ocr(screenshot)
+            return self._detect_by_ocr(screenshot, frame_id)
+
+    def observe(self, screenshot: Optional[Image.Image] = None, frame_id: Optional[int] = None) -> bool:
+        """
+        观察一帧并返回去抖后的战斗状态
+
+        状态只在连续 enter_frames 帧检测为战斗（或连续 exit_frames 帧检测为非战斗）后才切换，
+        单帧闪烁不会改变状态；同一帧重复观察只计一次。
+
+        Args:
+            screenshot: 屏幕截图，如果为None则重新截图
+            frame_id: 帧序号
+
+        Returns:
+            去抖后的战斗状态
+        """
+        if screenshot is not None and self._last_observed is not None:
+            last_frame_id, last_screenshot = self._last_observed
+            if (frame_id is not None and frame_id == last_frame_id) or screenshot is last_screenshot:
+                return self.state
+        raw = self.is_in_combat(screenshot, frame_id)
+        self._last_observed = (frame_id, screenshot) if screenshot is not None else None
+
+        if raw == self.state:
+            self._streak = 0
+            return self.state
+
+        self._streak += 1
+        needed = self.enter_frames if raw else self.exit_frames
+        if self._streak >= needed:
+            self.state = raw
+            self._streak = 0
+            logger.debug(f"战斗状态切换: {'战斗中' if raw else '非战斗'}")
+        else:
+            logger.debug(f"战斗状态待确认: 第 {self._streak}/{needed} 帧检测为{'战斗中' if raw else '非战斗'}")
+        return self.state
+
+    @property
+    def pending_change(self) -> bool:
+        """最近的检测结果与当前状态不同，还在等待确认"""
+        return self._streak > 0
+
+    def reset_state(self, in_combat: bool):
+        """
+        直接设置去抖状态（例如开始等待战斗结束时，已知处于战斗中）
+
+        Args:
+            in_combat: 是否在战斗中
+        """
+        self.state = in_combat
+        self._streak = 0
+        self._last_observed = None
+
+    def wait_for_combat_start(self, timeout: Optional[float] = None, screenshot_source=None) -> bool:
+        """
+        等待进入战斗（去抖：连续 enter_frames 帧检测为战斗才算进入）
+
+        Args:
+            timeout: 超时时间（秒），如果为None则使用配置 combat.state.enter_timeout
+            screenshot_source: 可选，无参调用返回 (截图, 帧序号) 的函数（用于共享帧），
+                               为None时每次重新截图
+
+        Returns:
+            是否进入战斗（进入时记录 combat_started_at）
+        """
+        if timeout is None:
+            timeout = float(self.config.get('combat.state.enter_timeout', 3.0))
+        sample_interval = float(self.config.get('combat.state.sample_interval', 0.2))
+
+        self.reset_state(False)
+        self.combat_started_at = None
+        start_time = time.time()
+        while True:
+            if screenshot_source is not None:
+                screenshot, frame_id = screenshot_source()
+            else:
+                screenshot, frame_id = None, None
+            if self.observe(screenshot, frame_id):
+                self.combat_started_at = time.time()
+                logger.info(f"进入战斗状态，耗时: {self.combat_started_at - start_time:.1f}秒")
+                self.telemetry.emit(
+                    'combat_start',
+                    latency=self.telemetry.since_engage(),
+                    monster=self.telemetry.last_monster,
+                )
+                return True
+            if time.time() - start_time > timeout:
+                logger.debug(f"{timeout}秒内未进入战斗")
+                self.telemetry.emit(
+                    'engage_failed',
+                    waited=self.telemetry.since_engage(),
+                    monster=self.telemetry.last_monster,
+                )
+                return False
+            time.sleep(sample_interval)
     
     def wait_for_combat_end(
         self,
         timeout: Optional[int] = None,
-        check_interval: Optional[float] = None
+        check_interval: Optional[float] = None,
+        duration_key: Optional[str] = None,
+        started_at: Optional[float] = None
     ) -> bool:
         """
         等待战斗结束
         
         Args:
             timeout: 超时时间（秒），如果为None则使用配置中的值
-            check_interval: 检查间隔（秒），如果为None则使用配置中的值（默认1秒）
+            check_interval: 检查间隔（秒），如果为None则使用监视器（combat.watcher.enabled），
+                            监视器未启用时使用配置中的值（默认1秒）
+            duration_key: 战斗时长模型的键（地图名或怪物名），如果为None则使用配置 game.map_name
+            started_at: wait_for_combat_start 确认战斗开始的时间（combat_started_at）。
+                        只有已知开始时间时才按战斗时长推迟检测、并记录本次时长；
+                        为None时（例如扫描中发现已在进行的战斗）立即开始检测，也不记录时长
         
         Returns:
             是否成功等待到战斗结束（True）或超时（False）
         """
         if timeout is None:
             timeout = self.config.get('game.battle_timeout', 300)
-        
+        if duration_key is None:
+            duration_key = str(self.config.get('game.map_name', 'default'))
+
+        start_time = started_at if started_at is not None else time.time()
+        use_durations = started_at is not None and self.duration_model is not None
+
+        # 按学到的战斗时长，在最短的战斗结束之前不做任何检测（从战斗开始算起）
+        first_check_delay = 0.0
+        dense_until = None
+        if use_durations:
+            first_check_delay = min(self.duration_model.first_check_delay(duration_key), timeout)
+            dense_until = self.duration_model.dense_window_end(duration_key)
+        remaining_delay = first_check_delay - (time.time() - start_time)
+        if remaining_delay > 0:
+            logger.info(f"按战斗时长记录（{duration_key}），{remaining_delay:.1f}秒后开始检测")
+            time.sleep(remaining_delay)
+
+        # 已知处于战斗中，退出需要连续多帧确认
+        self.reset_state(True)
+        remaining = timeout - (time.time() - start_time)
+        if check_interval is None and self.watcher is not None:
+            # 监视器只在检测区域变化时才做完整检测
+            logger.info(f"等待战斗结束，超时时间: {timeout}秒（变化触发检测）")
+            ended = self.watcher.wait_for_end(remaining)
+        else:
+            ended = self._poll_for_combat_end(start_time, timeout, check_interval, dense_until)
+
+        duration = time.time() - start_time
+        if ended and use_durations:
+            self.duration_model.record(duration_key, duration)
+        self.telemetry.emit(
+            'combat_end' if ended else 'combat_timeout',
+            duration=round(duration, 3),
+            key=duration_key,
+            monster=self.telemetry.last_monster,
+        )
+        return ended
+
+    def _poll_for_combat_end(
+        self,
+        start_time: float,
+        timeout: float,
+        check_interval: Optional[float],
+        dense_until: Optional[float]
+    ) -> bool:
+        """
+        按固定间隔轮询战斗状态；在预计的结束时间窗口内使用更短的间隔
+
+        Args:
+            start_time: 开始等待的时间
+            timeout: 超时时间（秒）
+            check_interval: 检查间隔（秒），如果为None则使用配置中的值
+            dense_until: 密集检测窗口的结束时间（相对 start_time，秒），None表示不密集检测
+
+        Returns:
+            是否等待到战斗结束
+        """
         if check_interval is None:
             check_interval = self.config.get('combat.check_interval', 1.0)
-        
+        dense_interval = min(check_interval, float(self.config.get('combat.duration.dense_interval', 0.3)))
+
         logger.info(f"等待战斗结束，超时时间: {timeout}秒，检查间隔: {check_interval}秒")
-        start_time = time.time()
         
         while True:
             elapsed = time.time() - start_time
@@ -237,11 +528,17 @@ class CombatStateDetector:
                 logger.warning(f"战斗等待超时: {timeout}秒")
                 return False
             
-            if not self.is_in_combat():
+            if not self.observe():
                 logger.info(f"战斗结束，耗时: {elapsed:.1f}秒")
                 return True
             
-            time.sleep(check_interval)
+            if self.pending_change:
+                # 刚检测到非战斗：尽快再看一帧确认
+                time.sleep(min(check_interval, 0.2))
+            elif dense_until is not None and elapsed < dense_until:
+                time.sleep(dense_interval)
+            else:
+                time.sleep(check_interval)
     
     def set_combat_template(self, template_path: str):
         """
@@ -251,6 +548,7 @@ class CombatStateDetector:
             template_path: 模板文件路径
         """
         self.combat_template = template_path
+        self.combat_anchor = self._make_anchor('combat', template_path)
         logger.info(f"设置战斗界面模板: {template_path}")
     
     def set_map_template(self, template_path: str):
@@ -261,6 +559,7 @@ class CombatStateDetector:
             template_path: 模板文件路径
         """
         self.map_template = template_path
+        self.map_anchor = self._make_anchor('map', template_path)
         logger.info(f"设置地图界面模板: {template_path}")
     
     def set_detection_region(self, left: int, top: int, width: int, height: int):
@@ -294,3 +593,14 @@ class CombatStateDetector:
             区域字典
         """
         return self.detection_region.copy()
+
+
+_combat_detector: Optional[CombatStateDetector] = None
+
+
+def get_combat_detector() -> CombatStateDetector:
+    """获取全局战斗状态检测器实例（主循环和探索度跟踪共享缓存和去抖状态）"""
+    global _combat_detector
+    if _combat_detector is None:
+        _combat_detector = CombatStateDetector()
+    return _combat_detector
@@ -0,0 +1,123 @@
+"""
+战斗结束监视模块
+
+战斗中检测区域（"认输"按钮）的像素基本不变，战斗结束时才会变化。
+监视器只截取这一小块区域，与上次确认时的缩略图比较：
+- 没有变化：采样间隔按倍数退避，直到上限
+- 发生变化：立即用完整的战斗检测（截图+签名/OCR）确认，并把间隔重置为最小值
+因此长时间战斗几乎不占CPU，而战斗结束后在一个采样间隔内就能返回。
+"""
+import time
+from typing import Optional
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 比较用的缩略图尺寸 (宽, 高)
+THUMB_SIZE = (32, 8)
+
+
+def region_thumbnail(image: Image.Image) -> np.ndarray:
+    """
+    计算区域的灰度缩略图（用于变化检测）
+
+    Args:
+        image: 区域图像
+
+    Returns:
+        float32 灰度缩略图
+    """
+    gray = cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2GRAY)
+    return cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+class CombatWatcher:
+    """变化触发的战斗结束监视器"""
+
+    def __init__(self, detector):
+        """
+        初始化监视器
+
+        Args:
+            detector: CombatStateDetector 实例（提供截图、检测区域和完整的战斗检测）
+        """
+        self.config = get_config()
+        self.detector = detector
+
+        # 最小/最大采样间隔（秒），无变化时按 backoff 倍数增长
+        self.min_interval = float(self.config.get('combat.watcher.min_interval', 0.05))
+        self.max_interval = float(self.config.get('combat.watcher.max_interval', 0.4))
+        self.backoff = float(self.config.get('combat.watcher.backoff', 1.5))
+        # 缩略图平均灰度差超过该值视为变化
+        self.change_threshold = float(self.config.get('combat.watcher.change_threshold', 6.0))
+        # 即使没有变化，也至少每隔这么久做一次完整确认（防止漏检）
+        self.confirm_interval = float(self.config.get('combat.watcher.confirm_interval', 15.0))
+
+    def _sample(self) -> Optional[np.ndarray]:
+        """只截取检测区域并计算缩略图，失败时返回None"""
+        try:
+            return region_thumbnail(self.detector.screenshot.capture(self.detector.get_detection_region()))
+        except Exception as e:
+            logger.debug(f"截取战斗检测区域失败: {e}")
+            return None
+
+    def _confirm(self) -> bool:
+        """完整检测是否仍在战斗中（去抖：连续多帧非战斗才算结束）"""
+        return self.detector.observe()
+
+    def wait_for_end(self, timeout: float) -> bool:
+        """
+        等待战斗结束
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否等待到战斗结束（True）或超时（False）
+        """
+        start_time = time.time()
+        samples = 0
+        confirms = 0
+
+        # 先确认一次，并把当前外观作为基准
+        baseline = self._sample()
+        confirms += 1
+        if not self._confirm():
+            logger.info("战斗已结束（首次确认）")
+            return True
+        last_confirm = time.time()
+        interval = self.min_interval
+
+        while True:
+            elapsed = time.time() - start_time
+            if elapsed > timeout:
+                logger.warning(f"战斗等待超时: {timeout}秒（采样 {samples} 次，确认 {confirms} 次）")
+                return False
+
+            time.sleep(interval)
+            current = self._sample()
+            samples += 1
+
+            changed = (
+                current is None
+                or baseline is None
+                or float(np.mean(np.abs(current - baseline))) > self.change_threshold
+            )
+            if not changed and not self.detector.pending_change and time.time() - last_confirm < self.confirm_interval:
+                interval = min(self.max_interval, interval * self.backoff)
+                continue
+
+            confirms += 1
+            last_confirm = time.time()
+            if not self._confirm():
+                elapsed = time.time() - start_time
+                logger.info(f"战斗结束，耗时: {elapsed:.1f}秒（采样 {samples} 次，确认 {confirms} 次）")
+                return True
+
+            # 仍在战斗中（例如按钮动画，或非战斗还在等待确认）：以当前外观为新基准，回到最小间隔
+            baseline = current
+            interval = self.min_interval
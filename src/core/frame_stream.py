@@ -0,0 +1,212 @@
+"""
+帧流与事件等待模块
+
+主循环里原来的固定等待（点击后、战斗后、移动后）都改为"等到条件成立或超时"：
+- FrameStream：按需截图并缓存最近一帧，同一次轮询中的多个条件共享一次截图；
+  可以传入截图函数（如 PerceptionContext.refresh_frame），等待期间的截图同时成为感知上下文的当前帧
+- wait_until(predicate, timeout)：轮询条件，成立即返回
+- 条件工厂：region_changed（区域变化，区域需在小地图等动态UI之外）、camera_stopped（镜头停止移动，基于 MotionDetector）、
+  minimap_changed（小地图变化）、any_of（任一成立）
+
+比较都在小灰度缩略图上进行，每次检查只需几毫秒。
+"""
+import time
+from typing import Callable, Optional
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 比较用的缩略图宽度（高度按比例）
+THUMB_WIDTH = 64
+
+Predicate = Callable[['FrameStream'], bool]
+
+
+def gray_thumbnail(image: Image.Image, width: int = THUMB_WIDTH) -> np.ndarray:
+    """
+    计算灰度缩略图
+
+    Args:
+        image: 图像
+        width: 缩略图宽度
+
+    Returns:
+        float32 灰度缩略图
+    """
+    rgb = np.asarray(image.convert('RGB'))
+    height = max(1, int(round(rgb.shape[0] * width / max(1, rgb.shape[1]))))
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def mean_abs_diff(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> float:
+    """两张缩略图的平均灰度差（尺寸不同或缺失时视为完全不同）"""
+    if a is None or b is None or a.shape != b.shape:
+        return float('inf')
+    return float(np.mean(np.abs(a - b)))
+
+
+class FrameStream:
+    """按需截图的共享帧流"""
+
+    def __init__(
+        self,
+        screenshot,
+        max_age: Optional[float] = None,
+        capture: Optional[Callable[[], Image.Image]] = None
+    ):
+        """
+        初始化帧流
+
+        Args:
+            screenshot: Screenshot实例（窗口尺寸、小地图裁剪）
+            max_age: 缓存帧的有效期（秒），同一次轮询中的多个条件共享一帧；
+                     如果为None则使用配置 wait.frame_max_age
+            capture: 截图函数，如果为None则使用 screenshot.capture_full_window
+        """
+        self.config = get_config()
+        self.screenshot = screenshot
+        self.capture = capture if capture is not None else screenshot.capture_full_window
+        if max_age is None:
+            max_age = float(self.config.get('wait.frame_max_age', 0.03))
+        self.max_age = max_age
+        self._frame: Optional[Image.Image] = None
+        self._frame_time: Optional[float] = None
+        self.frame_count = 0
+
+    def frame(self) -> Image.Image:
+        """获取当前帧（缓存未过期时复用）"""
+        now = time.monotonic()
+        if self._frame is None or now - self._frame_time > self.max_age:
+            self._frame = self.capture()
+            self._frame_time = now
+            self.frame_count += 1
+        return self._frame
+
+    def region(self, region: dict) -> Image.Image:
+        """
+        获取窗口内某个区域（逻辑坐标），从当前帧裁剪
+
+        Args:
+            region: left/top/width/height
+
+        Returns:
+            区域图像
+        """
+        frame = self.frame()
+        window_width, window_height = self.screenshot.get_window_size()
+        scale_x = frame.width / window_width if window_width > 0 else 1.0
+        scale_y = frame.height / window_height if window_height > 0 else 1.0
+        left = max(0, int(region['left'] * scale_x))
+        top = max(0, int(region['top'] * scale_y))
+        right = min(frame.width, int((region['left'] + region['width']) * scale_x))
+        bottom = min(frame.height, int((region['top'] + region['height']) * scale_y))
+        return frame.crop((left, top, max(left + 1, right), max(top + 1, bottom)))
+
+    def minimap(self) -> Optional[Image.Image]:
+        """当前帧的小地图，未配置时返回None"""
+        return self.screenshot.capture_minimap(self.frame())
+
+
+def wait_until(
+    predicate: Predicate,
+    stream: FrameStream,
+    timeout: float,
+    interval: Optional[float] = None,
+    description: str = ''
+) -> bool:
+    """
+    等待条件成立
+
+    Args:
+        predicate: 条件函数，参数为帧流
+        stream: 共享帧流
+        timeout: 最长等待时间（秒）
+        interval: 轮询间隔（秒），如果为None则使用配置 wait.poll_interval
+        description: 日志中的说明
+
+    Returns:
+        条件在超时前成立返回True，超时返回False
+    """
+    if interval is None:
+        interval = float(stream.config.get('wait.poll_interval', 0.05))
+    start = time.monotonic()
+    while True:
+        try:
+            if predicate(stream):
+                logger.debug(f"等待{description}: {time.monotonic() - start:.2f}秒后条件成立")
+                return True
+        except Exception as e:
+            logger.debug(f"等待{description}时条件检查出错: {e}")
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout:
+            logger.debug(f"等待{description}: {timeout:.2f}秒超时")
+            return False
+        time.sleep(min(interval, timeout - elapsed))
+
+
+def region_changed(stream: FrameStream, region: dict, threshold: float = 8.0) -> Predicate:
+    """
+    条件：区域相对创建时发生变化
+
+    角色移动时小地图随之变化，区域不要落在小地图内（战斗按钮区域就在其中，进入战斗请用战斗检测判断）
+
+    Args:
+        stream: 帧流（创建时记录基准）
+        region: 逻辑坐标区域
+        threshold: 平均灰度差阈值
+    """
+    baseline = gray_thumbnail(stream.region(region), width=32)
+
+    def _check(s: FrameStream) -> bool:
+        return mean_abs_diff(gray_thumbnail(s.region(region), width=32), baseline) > threshold
+    return _check
+
+
+def minimap_changed(stream: FrameStream, threshold: float = 4.0) -> Predicate:
+    """
+    条件：小地图相对创建时发生变化（角色在地图上移动了）
+
+    Args:
+        stream: 帧流（创建时记录基准）
+        threshold: 平均灰度差阈值
+    """
+    minimap = stream.minimap()
+    baseline = gray_thumbnail(minimap, width=32) if minimap is not None else None
+
+    def _check(s: FrameStream) -> bool:
+        current = s.minimap()
+        if current is None or baseline is None:
+            return True
+        return mean_abs_diff(gray_thumbnail(current, width=32), baseline) > threshold
+    return _check
+
+
+def camera_stopped(detector, start_grace: Optional[float] = None) -> Predicate:
+    """
+    条件：镜头停止移动
+
+    与点击移动后的到达判断使用同一个运动检测器（MotionDetector，相位相关），只是帧来自帧流。
+    点击后镜头可能还没开始移动，因此只有在观察到移动之后、或 start_grace 秒内一直没有移动时才算停止。
+
+    Args:
+        detector: MotionDetector实例（创建条件时开始一次等待）
+        start_grace: 一直没有观察到移动时，经过该时间也视为停止；如果为None则使用配置 motion.start_grace
+    """
+    detector.start_wait()
+
+    def _check(s: FrameStream) -> bool:
+        return detector.poll_stopped(s.frame(), start_grace) is not None
+    return _check
+
+
+def any_of(*predicates: Predicate) -> Predicate:
+    """条件：任一条件成立（共享同一帧；每个条件都会检查，保证有状态的条件持续更新）"""
+    def _check(s: FrameStream) -> bool:
+        results = [p(s) for p in predicates]
+        return any(results)
+    return _check
@@ -0,0 +1,156 @@
+"""
+感知上下文模块
+
+每次状态机更新时传给状态处理函数，携带当前帧、怪物检测结果、战斗标志和小地图，
+并记录各自的时间戳。处理函数优先复用仍然新鲜的结果，只有过期时才重新截图/检测。
+"""
+import time
+from typing import Optional, List, Tuple
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PerceptionContext:
+    """感知上下文"""
+
+    def __init__(self, screenshot, max_age: Optional[float] = None):
+        """
+        初始化感知上下文
+
+        Args:
+            screenshot: Screenshot实例（用于在需要时截图）
+            max_age: 结果的最长有效期（秒），如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        self.screenshot = screenshot
+        if max_age is None:
+            max_age = float(self.config.get('perception.max_age_sec', 2.0))
+        self.max_age = max_age
+
+        self.frame_id = 0
+        self.frame: Optional[Image.Image] = None
+        self.frame_time: Optional[float] = None
+
+        self.monsters: Optional[List[Tuple[int, int, float]]] = None
+        self.monsters_time: Optional[float] = None
+        self.monster_track_ids: Optional[List[int]] = None  # 与 monsters 一一对应的轨迹ID（来自同一跟踪快照）
+
+        self.in_combat: Optional[bool] = None
+        self.combat_time: Optional[float] = None
+
+        self.minimap: Optional[Image.Image] = None
+        self.minimap_frame_id: Optional[int] = None
+
+    def _is_fresh(self, timestamp: Optional[float], max_age: Optional[float]) -> bool:
+        if timestamp is None:
+            return False
+        if max_age is None:
+            max_age = self.max_age
+        return time.monotonic() - timestamp <= max_age
+
+    def refresh_frame(self) -> Image.Image:
+        """
+        重新截图（旧帧上的检测结果随之失效）
+
+        Returns:
+            新的窗口截图
+        """
+        self.frame = self.screenshot.capture_full_window()
+        self.frame_time = time.monotonic()
+        self.frame_id += 1
+        self.monsters = None
+        self.monsters_time = None
+        self.monster_track_ids = None
+        self.in_combat = None
+        self.combat_time = None
+        return self.frame
+
+    def get_frame(self, max_age: Optional[float] = None) -> Image.Image:
+        """
+        获取当前帧，过期时重新截图
+
+        Args:
+            max_age: 最长有效期（秒），如果为None则使用默认值
+
+        Returns:
+            窗口截图
+        """
+        if self.frame is None or not self._is_fresh(self.frame_time, max_age):
+            return self.refresh_frame()
+        return self.frame
+
+    def set_monsters(self, monsters: List[Tuple[int, int, float]], track_ids: Optional[List[int]] = None):
+        """
+        记录当前帧的怪物检测结果
+
+        Args:
+            monsters: 怪物位置列表
+            track_ids: 与 monsters 来自同一跟踪快照的轨迹ID；其他来源的结果为None
+        """
+        self.monsters = list(monsters)
+        self.monster_track_ids = list(track_ids) if track_ids is not None else None
+        self.monsters_time = self.frame_time if self.frame_time is not None else time.monotonic()
+
+    def get_monsters(self, max_age: Optional[float] = None) -> Optional[List[Tuple[int, int, float]]]:
+        """
+        获取仍然新鲜的怪物检测结果
+
+        Returns:
+            怪物列表；没有结果或已过期时返回None（调用方需要重新检测）
+        """
+        if self.monsters is None or not self._is_fresh(self.monsters_time, max_age):
+            return None
+        return self.monsters
+
+    def get_monster_track_ids(self) -> Optional[List[int]]:
+        """
+        当前怪物检测结果对应的轨迹ID
+
+        Returns:
+            与 get_monsters() 一一对应的轨迹ID；结果不是来自跟踪快照时返回None
+        """
+        return self.monster_track_ids
+
+    def set_combat(self, in_combat: bool):
+        """记录当前帧的战斗状态"""
+        self.in_combat = in_combat
+        self.combat_time = self.frame_time if self.frame_time is not None else time.monotonic()
+
+    def get_combat(self, max_age: Optional[float] = None) -> Optional[bool]:
+        """
+        获取仍然新鲜的战斗状态
+
+        Returns:
+            是否在战斗中；没有结果或已过期时返回None
+        """
+        if self.in_combat is None or not self._is_fresh(self.combat_time, max_age):
+            return None
+        return self.in_combat
+
+    def get_minimap(self, max_age: Optional[float] = None) -> Optional[Image.Image]:
+        """
+        获取当前帧的小地图（每帧只裁剪一次）
+
+        Returns:
+            小地图图像，未配置小地图区域时返回None
+        """
+        frame = self.get_frame(max_age)
+        if self.minimap_frame_id != self.frame_id:
+            self.minimap = self.screenshot.capture_minimap(frame)
+            self.minimap_frame_id = self.frame_id
+        return self.minimap
+
+    def invalidate(self):
+        """角色移动或界面变化后调用，所有结果作废"""
+        self.frame = None
+        self.frame_time = None
+        self.monsters = None
+        self.monsters_time = None
+        self.monster_track_ids = None
+        self.in_combat = None
+        self.combat_time = None
+        self.minimap = None
+        self.minimap_frame_id = None
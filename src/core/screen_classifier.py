@@ -0,0 +1,191 @@
+"""
+画面类型分类模块
+
+用最近质心分类器识别当前画面类型（地图、战斗、加载、对话框、奖励弹窗、断线提示等）。
+特征与战斗签名相同：HSV颜色直方图 + 零均值灰度缩略图，整帧先按步长抽样再缩小，
+每帧不到1毫秒，不需要OCR。
+模型由 tools/train_screen_classifier.py 从 frames/<类型>/*.png 训练，保存为 npz 文件。
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+from src.core.combat_signature import HIST_BINS, compute_signature
+
+logger = get_logger(__name__)
+
+# 整帧缩略图尺寸 (宽, 高)，与窗口宽高比接近
+THUMB_SIZE = (32, 16)
+# 缩小前的抽样步长（物理像素），先抽样可以让缩小本身几乎不耗时
+SAMPLE_STEP = 8
+# 特征向量中颜色直方图和缩略图两部分的分界
+_HIST_LEN = int(np.prod(HIST_BINS))
+# 两部分半径的下限：几乎不变的画面（战斗、加载）样本间距离接近0，
+# 没有下限时像素落在直方图分箱边界上的噪声就会超出半径
+MIN_RADII = (0.05, 0.1)
+
+
+def screen_features(frame) -> np.ndarray:
+    """
+    计算整帧特征向量
+
+    Args:
+        frame: 窗口截图（PIL Image 或 RGB 数组）
+
+    Returns:
+        float32 特征向量：[颜色直方图, 缩略图]
+    """
+    rgb = np.asarray(frame.convert('RGB')) if isinstance(frame, Image.Image) else frame
+    sampled = rgb[::SAMPLE_STEP, ::SAMPLE_STEP]
+    hist, thumb = compute_signature(sampled, THUMB_SIZE)
+    return np.concatenate([hist, thumb]).astype(np.float32)
+
+
+class ScreenClassifier:
+    """最近质心画面分类器"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化分类器并加载模型
+
+        Args:
+            path: 模型文件路径，如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        project_root = Path(__file__).parent.parent.parent
+        if path is None:
+            path = self.config.get('screen_classifier.path', 'data/screen_classifier.npz')
+        self.path = Path(path) if Path(path).is_absolute() else project_root / path
+
+        # 距离超过该类训练样本半径的倍数时视为未知画面
+        self.radius_factor = float(self.config.get('screen_classifier.radius_factor', 1.5))
+
+        self.labels: List[str] = []
+        self.centroids = np.empty((0, 0), np.float32)
+        # 每类的半径 (类别数, 2)：颜色直方图和缩略图两部分分别统计
+        self.radii = np.empty((0, 2), np.float32)
+        self.load()
+
+    @property
+    def trained(self) -> bool:
+        """是否已加载模型"""
+        return len(self.labels) > 0
+
+    def load(self):
+        """从磁盘加载模型（不存在时分类器不可用）"""
+        if not self.path.exists():
+            logger.debug(f"画面分类模型不存在: {self.path}")
+            return
+        try:
+            data = np.load(self.path)
+            self.labels = [str(label) for label in data['labels']]
+            self.centroids = data['centroids'].astype(np.float32)
+            radii = data['radii'].astype(np.float32)
+            if radii.ndim == 1:
+                # 旧模型只有整体半径：两部分都用它（建议重新训练）
+                logger.warning("画面分类模型是旧格式，建议用 tools/train_screen_classifier.py 重新训练")
+                radii = np.stack([radii, radii], axis=1)
+            self.radii = radii
+            logger.info(f"加载画面分类模型: {', '.join(self.labels)}")
+        except Exception as e:
+            logger.warning(f"加载画面分类模型失败: {e}")
+            self.labels = []
+
+    @staticmethod
+    def _block_distances(centroids: np.ndarray, features: np.ndarray) -> np.ndarray:
+        """到质心的距离，颜色直方图和缩略图两部分分开计算，形状 (..., 2)"""
+        diff = features - centroids
+        return np.stack([
+            np.linalg.norm(diff[..., :_HIST_LEN], axis=-1),
+            np.linalg.norm(diff[..., _HIST_LEN:], axis=-1),
+        ], axis=-1)
+
+    def fit(self, samples: Dict[str, List[np.ndarray]]):
+        """
+        训练：每类取特征均值作为质心，样本到质心距离的95%分位数作为该类半径
+
+        半径按颜色直方图和缩略图两部分分别统计：地图画面的布局随镜头变化很大（缩略图半径大），
+        但颜色分布稳定；只用整体距离时，颜色完全不同的画面也会落在地图的半径内。
+
+        Args:
+            samples: {类型: [特征向量, ...]}
+        """
+        labels = sorted(label for label, feats in samples.items() if feats)
+        centroids = []
+        radii = []
+        for label in labels:
+            feats = np.stack(samples[label])
+            centroid = feats.mean(axis=0)
+            dists = self._block_distances(centroid, feats)
+            centroids.append(centroid)
+            radii.append(np.maximum(np.quantile(dists, 0.95, axis=0), MIN_RADII))
+        self.labels = labels
+        self.centroids = np.stack(centroids).astype(np.float32) if centroids else np.empty((0, 0), np.float32)
+        self.radii = np.array(radii, dtype=np.float32).reshape(-1, 2)
+
+    def save(self):
+        """保存模型到磁盘"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(self.path, labels=np.array(self.labels), centroids=self.centroids, radii=self.radii)
+        logger.info(f"画面分类模型已保存: {self.path}")
+
+    def predict(self, features: np.ndarray) -> Tuple[Optional[str], float]:
+        """
+        按特征向量分类
+
+        Args:
+            features: screen_features 的结果
+
+        Returns:
+            (类型, 到该类质心的距离 / 该类半径，两部分取较大者)；未训练或超出半径时类型为None
+        """
+        if not self.trained:
+            return None, float('inf')
+        dists = (self._block_distances(self.centroids, features) / self.radii).max(axis=1)
+        best = int(np.argmin(dists))
+        score = float(dists[best])
+        if score > self.radius_factor:
+            return None, score
+        return self.labels[best], score
+
+    def classify(self, frame) -> Optional[str]:
+        """
+        识别画面类型
+
+        Args:
+            frame: 窗口截图
+
+        Returns:
+            类型名称；模型不可用或画面与所有类型都不像时返回None
+        """
+        if not self.trained:
+            return None
+        label, score = self.predict(screen_features(frame))
+        logger.debug(f"画面分类: {label} ({score:.2f})")
+        return label
+
+
+_screen_classifier: Optional[ScreenClassifier] = None
+
+
+def get_screen_classifier() -> ScreenClassifier:
+    """获取全局画面分类器实例"""
+    global _screen_classifier
+    if _screen_classifier is None:
+        _screen_classifier = ScreenClassifier()
+    return _screen_classifier
+
+
+def classify_screen(frame) -> Optional[str]:
+    """
+    识别画面类型（使用全局分类器）
+
+    Args:
+        frame: 窗口截图
+
+    Returns:
+        类型名称，无法识别时返回None
+    """
+    return get_screen_classifier().classify(frame)
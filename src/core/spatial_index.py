@@ -0,0 +1,124 @@
+"""
+空间索引模块
+
+均匀网格哈希：单元格边长等于合并半径，查询只需检查周围 3x3 个单元格，
+候选点去重/合并从 O(n²) 降为近似 O(n)。
+怪物检测去重、模板匹配NMS和怪物跟踪的关联都使用这里的实现。
+"""
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+
+
+class GridIndex:
+    """均匀网格空间索引"""
+
+    def __init__(self, cell_size: float):
+        """
+        初始化网格索引
+
+        Args:
+            cell_size: 单元格边长（通常等于查询半径）
+        """
+        self.cell_size = max(float(cell_size), 1e-6)
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._points: List[Tuple[float, float]] = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, x: float, y: float) -> int:
+        """
+        插入一个点
+
+        Returns:
+            点的编号（按插入顺序，从0开始）
+        """
+        index = len(self._points)
+        self._points.append((x, y))
+        self._cells[self._cell(x, y)].append(index)
+        return index
+
+    def candidates(self, x: float, y: float) -> List[int]:
+        """
+        返回 (x, y) 周围 3x3 个单元格内的所有点编号（未做距离过滤）
+
+        距离不超过 cell_size 的点一定在结果中。
+        """
+        cx, cy = self._cell(x, y)
+        result = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                cell = self._cells.get((gx, gy))
+                if cell:
+                    result.extend(cell)
+        return result
+
+    def query(self, x: float, y: float, radius: float) -> List[int]:
+        """
+        返回与 (x, y) 距离严格小于 radius 的点编号
+
+        Args:
+            x, y: 查询位置
+            radius: 查询半径（不能大于 cell_size）
+        """
+        radius_sq = radius * radius
+        return [
+            i for i in self.candidates(x, y)
+            if (self._points[i][0] - x) ** 2 + (self._points[i][1] - y) ** 2 < radius_sq
+        ]
+
+
+def spatial_dedup(points: Sequence[Sequence[float]], scores: Sequence[float], radius: float) -> np.ndarray:
+    """
+    按半径去重：每个簇只保留置信度最高的点
+
+    按置信度从高到低依次处理，距离已保留点小于 radius 的点被合并掉；
+    置信度相同时保持原有顺序。
+
+    Args:
+        points: 点坐标，形状 (N, 2)
+        scores: 置信度，长度 N
+        radius: 合并半径（距离严格小于该值视为重复）
+
+    Returns:
+        保留点的下标数组（按置信度从高到低）
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    order = np.argsort(-scores, kind='stable')
+    index = GridIndex(radius)
+    kept = []
+    for i in order:
+        x, y = points[i]
+        if not index.query(x, y, radius):
+            index.insert(x, y)
+            kept.append(i)
+    return np.asarray(kept, dtype=np.intp)
+
+
+def dedup_detections(
+    detections: List[Tuple[int, int, float]],
+    radius: float
+) -> List[Tuple[int, int, float]]:
+    """
+    对 [(x, y, confidence), ...] 格式的检测结果去重
+
+    Args:
+        detections: 检测结果
+        radius: 合并半径
+
+    Returns:
+        去重后的检测结果（按置信度从高到低）
+    """
+    if not detections:
+        return []
+    arr = np.asarray([(d[0], d[1]) for d in detections], dtype=np.float64)
+    scores = np.asarray([d[2] for d in detections], dtype=np.float64)
+    return [detections[i] for i in spatial_dedup(arr, scores, radius)]
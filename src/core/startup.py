@@ -0,0 +1,93 @@
+"""
+启动阶段管理
+
+轻量模块在导入时立即可用；重量级引擎（EasyOCR/torch、pyautogui 等）
+延迟到首次使用时加载，或在后台线程中预热，并记录导入与预热耗时。
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def timed_import(module_name: str) -> ModuleType:
+    """
+    导入模块并记录耗时（已导入的模块直接返回）
+
+    Args:
+        module_name: 模块名，如 "pyautogui"
+
+    Returns:
+        模块对象
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+    if elapsed > 0.01:
+        logger.info(f"导入 {module_name} 耗时: {elapsed:.2f}秒")
+    return module
+
+
+class EngineWarmup:
+    """后台预热重量级引擎"""
+
+    def __init__(self):
+        """初始化预热器"""
+        self._tasks: List[Tuple[str, Callable[[], object]]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, task: Callable[[], object]):
+        """
+        添加预热任务
+
+        Args:
+            name: 任务名称（用于日志）
+            task: 无参可调用对象
+        """
+        self._tasks.append((name, task))
+
+    def start(self):
+        """在后台守护线程中按顺序执行所有预热任务"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="engine-warmup", daemon=True)
+        self._thread.start()
+        logger.info(f"开始后台预热 {len(self._tasks)} 个引擎")
+
+    def _run(self):
+        total_start = time.perf_counter()
+        for name, task in self._tasks:
+            start = time.perf_counter()
+            try:
+                task()
+                elapsed = time.perf_counter() - start
+                self.timings[name] = elapsed
+                logger.info(f"预热 {name} 完成，耗时: {elapsed:.2f}秒")
+            except Exception as e:
+                logger.warning(f"预热 {name} 失败（将在首次使用时重试）: {e}")
+        logger.info(f"后台预热结束，总耗时: {time.perf_counter() - total_start:.2f}秒")
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待预热完成
+
+        Args:
+            timeout: 超时时间（秒），None表示一直等待
+
+        Returns:
+            是否已完成
+        """
+        if self._thread is None:
+            return True
+        return self._done.wait(timeout)
+
+    def is_done(self) -> bool:
+        """预热是否已完成（未启动视为完成）"""
+        return self._thread is None or self._done.is_set()
@@ -2,7 +2,7 @@
 状态机模块
 """
 from enum import Enum
-from typing import Optional, Callable
+from typing import Optional, Callable, Any
 from src.core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -91,11 +91,19 @@ class StateMachine:
         
         return False
     
-    def update(self):
-        """更新状态机（执行当前状态的处理函数）"""
+    def update(self, context: Optional[Any] = None):
+        """
+        更新状态机（执行当前状态的处理函数）
+
+        Args:
+            context: 传给处理函数的上下文（如 PerceptionContext），为None时无参调用处理函数
+        """
         if self.current_state in self.state_handlers:
             handler = self.state_handlers[self.current_state]
-            handler()
+            if context is None:
+                handler()
+            else:
+                handler(context)
     
     def get_state(self) -> State:
         """获取当前状态"""
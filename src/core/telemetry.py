@@ -0,0 +1,97 @@
+"""
+战斗遥测模块
+
+把交战过程中的事件以 JSON Lines 追加写入本地文件（默认 logs/combat_events.jsonl），
+每行一个事件，供 tools/combat_report.py 统计每小时战斗数、空闲时间占比等。
+
+事件类型：
+- session_start / session_end：一次运行的开始和结束
+- engage：点击怪物（开始交战）
+- combat_start：检测到进入战斗，latency 为距上次点击的秒数
+- engage_failed：点击后没有进入战斗，waited 为等待的秒数
+- combat_end：战斗结束，duration 为等待战斗结束的秒数
+- combat_timeout：等待战斗结束超时
+"""
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CombatTelemetry:
+    """追加写入的战斗事件记录器"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化记录器
+
+        Args:
+            path: 事件文件路径，如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        self.enabled = bool(self.config.get('telemetry.enabled', True))
+        project_root = Path(__file__).parent.parent.parent
+        if path is None:
+            path = self.config.get('telemetry.path', 'logs/combat_events.jsonl')
+        self.path = Path(path) if Path(path).is_absolute() else project_root / path
+
+        self.session_id = uuid.uuid4().hex[:8]
+        self.last_engage_time: Optional[float] = None
+        self.last_monster: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        """
+        写入一个事件
+
+        Args:
+            event: 事件类型
+            **fields: 附加字段（需可JSON序列化）
+        """
+        if not self.enabled:
+            return
+        record = {'ts': round(time.time(), 3), 'session': self.session_id, 'event': event}
+        record.update({k: v for k, v in fields.items() if v is not None})
+        try:
+            line = json.dumps(record, ensure_ascii=False)
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+        except Exception as e:
+            logger.debug(f"写入遥测事件失败: {e}")
+
+    def engage(self, x: float, y: float, monster: Optional[str] = None):
+        """
+        记录点击怪物
+
+        Args:
+            x, y: 点击位置（窗口逻辑坐标）
+            monster: 怪物名称（已知时）
+        """
+        self.last_engage_time = time.time()
+        self.last_monster = monster
+        self.emit('engage', x=round(float(x), 1), y=round(float(y), 1), monster=monster)
+
+    def since_engage(self) -> Optional[float]:
+        """距上次点击怪物的秒数，没有点击记录时返回None"""
+        if self.last_engage_time is None:
+            return None
+        return round(time.time() - self.last_engage_time, 3)
+
+
+_telemetry: Optional[CombatTelemetry] = None
+
+
+def get_telemetry() -> CombatTelemetry:
+    """获取全局战斗遥测实例"""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = CombatTelemetry()
+    return _telemetry
@@ -0,0 +1,227 @@
+"""
+OCR文本分类模块
+
+根据配置一次性构建：
+- Aho-Corasick 自动机：覆盖怪物名称关键词、排除词和战斗关键词，一次扫描找出所有命中
+- 预编译的等级格式正则
+
+每个文本块只扫描一遍即可得到分类和原因，怪物检测和战斗检测共用同一个实例。
+"""
+import re
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MONSTER_KEYWORDS = ['白虎', '兖州', '大盗', '巡查', '堂主', '党', '怪物', '敌人']
+DEFAULT_EXCLUDE_KEYWORDS = ['探索', '奖励', '铜钱', '历练', '家园', '背包', '角色', '完成', '首次', '无字', 'LV', 'Lv']
+DEFAULT_COMBAT_KEYWORDS = ['认输']
+
+# 等级格式：全角括号 "（XX级）"、半角括号 "(XX级)"、只有 "XX级"
+_LEVEL_RE = re.compile(r'(?P<full>（\d+级）)|(?P<half>\(\d+级\))|(?P<plain>\d+级)')
+_LEVEL_REASONS = {
+    'full': "等级格式（全角括号）",
+    'half': "等级格式（半角括号）",
+    'plain': "等级格式（XX级）",
+}
+# 角色级别（如 "LV54"），不是怪物
+_PLAYER_LEVEL_RE = re.compile(r'LV|Lv|lv')
+# 宽松等级格式（pytesseract 路径）："XX级" 或 "LvXX"
+_LOOSE_LEVEL_RE = re.compile(r'\d+级|Lv\d+')
+_DIGITS_RE = re.compile(r'\d')
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式匹配自动机"""
+
+    def __init__(self, patterns: List[str]):
+        """
+        构建自动机
+
+        Args:
+            patterns: 模式串列表，匹配结果用它们在列表中的下标表示
+        """
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pid, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = nxt
+            self._output[state].append(pid)
+
+        # BFS 计算失败指针，并把失败状态的输出合并进来
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def search(self, text: str) -> Set[int]:
+        """
+        扫描一遍文本，返回命中的所有模式下标
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            命中的模式下标集合
+        """
+        found: Set[int] = set()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class TextClassifier:
+    """OCR文本分类器"""
+
+    def __init__(self):
+        """根据配置构建分类器"""
+        self.config = get_config()
+
+        self.monster_keywords = self._keyword_list('monster.name_keywords', DEFAULT_MONSTER_KEYWORDS)
+        self.exclude_keywords = self._keyword_list('monster.exclude_keywords', DEFAULT_EXCLUDE_KEYWORDS)
+        self.combat_keywords = self._keyword_list('combat.keywords', DEFAULT_COMBAT_KEYWORDS)
+        self.max_name_length = int(self.config.get('monster.max_name_length', 20))
+
+        # 所有关键词放进同一个自动机，记录每个模式属于哪一类（同一个词可以属于多类）
+        patterns: List[str] = []
+        self._categories: List[Tuple[str, int]] = []
+        for category, keywords in (
+            ('monster', self.monster_keywords),
+            ('exclude', self.exclude_keywords),
+            ('combat', self.combat_keywords),
+        ):
+            for order, keyword in enumerate(keywords):
+                patterns.append(keyword)
+                self._categories.append((category, order))
+        self._automaton = AhoCorasick(patterns)
+        logger.debug(f"文本分类器: {len(patterns)} 个关键词")
+
+    def _keyword_list(self, key: str, default: List[str]) -> List[str]:
+        value = self.config.get(key, None)
+        if isinstance(value, str):
+            return [value]
+        return list(value) if value else list(default)
+
+    def _scan(self, text: str) -> Dict[str, int]:
+        """
+        扫描一遍文本
+
+        Returns:
+            每一类中命中的、配置顺序最靠前的关键词下标 {'monster': i, ...}
+        """
+        hits: Dict[str, int] = {}
+        for pid in self._automaton.search(text):
+            category, order = self._categories[pid]
+            if category not in hits or order < hits[category]:
+                hits[category] = order
+        return hits
+
+    def classify_monster(self, text: str) -> Tuple[bool, str]:
+        """
+        判断OCR文本是否为怪物名称（EasyOCR / 批量识别路径）
+
+        依次检查：等级格式（排除角色级别）、配置的关键词、至少3个汉字+数字（排除UI文本）
+
+        Args:
+            text: OCR文本
+
+        Returns:
+            (是否为怪物名称, 判断原因)
+        """
+        hits = self._scan(text)
+
+        # 策略1：等级格式
+        kinds = {m.lastgroup for m in _LEVEL_RE.finditer(text)}
+        for kind in ('full', 'half'):
+            if kind in kinds:
+                return True, _LEVEL_REASONS[kind]
+        if 'plain' in kinds and not _PLAYER_LEVEL_RE.search(text):
+            return True, _LEVEL_REASONS['plain']
+
+        # 策略2：关键词（作为补充）
+        if 'monster' in hits:
+            return True, f"关键词匹配（{self.monster_keywords[hits['monster']]}）"
+
+        # 策略3：中文名称+数字，排除UI文本和过长文本
+        if (
+            'exclude' not in hits
+            and len(text) <= self.max_name_length
+            and _DIGITS_RE.search(text)
+            and len(_CJK_RE.findall(text)) >= 3
+        ):
+            return True, "中文名称+数字"
+
+        return False, ""
+
+    def classify_monster_loose(self, text: str) -> Tuple[bool, str]:
+        """
+        宽松的怪物名称判断（pytesseract 路径）：关键词，或长度大于2且包含等级
+
+        Args:
+            text: OCR文本
+
+        Returns:
+            (是否为怪物名称, 判断原因)
+        """
+        hits = self._scan(text)
+        if 'monster' in hits:
+            return True, f"关键词匹配（{self.monster_keywords[hits['monster']]}）"
+        if len(text) > 2 and _LOOSE_LEVEL_RE.search(text):
+            return True, "包含等级"
+        return False, ""
+
+    def match_combat(self, text: str) -> Optional[str]:
+        """
+        查找文本中的战斗关键词
+
+        Args:
+            text: OCR文本
+
+        Returns:
+            命中的关键词（按配置顺序取第一个），没有命中返回None
+        """
+        hits = self._scan(text)
+        if 'combat' in hits:
+            return self.combat_keywords[hits['combat']]
+        return None
+
+
+_text_classifier: Optional[TextClassifier] = None
+
+
+def get_text_classifier() -> TextClassifier:
+    """获取全局文本分类器实例"""
+    global _text_classifier
+    if _text_classifier is None:
+        _text_classifier = TextClassifier()
+    return _text_classifier
@@ -0,0 +1,185 @@
+"""
+单帧文本场景模块
+
+怪物检测对整帧做一次 EasyOCR readtext，得到所有文本块；把结果按帧序号缓存为文本场景，
+战斗关键词、探索度文本等查询都直接读取，同一帧不再为每个查询单独OCR。
+OCR还在进行时，查询方可以等待同一个 Future，而不是另起一次识别。
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+from typing import List, Optional, Tuple
+import numpy as np
+from src.core.logger import get_logger
+from src.core.text_classifier import get_text_classifier
+
+logger = get_logger(__name__)
+
+
+class TextScene:
+    """一帧的OCR文本块集合"""
+
+    def __init__(
+        self,
+        frame_id: int,
+        results: list,
+        image_size: Tuple[int, int],
+        window_size: Tuple[int, int],
+        mask: Optional[np.ndarray] = None
+    ):
+        """
+        初始化文本场景
+
+        Args:
+            frame_id: 帧序号
+            results: readtext 格式的结果 [(bbox, text, conf), ...]，物理像素坐标
+            image_size: 截图尺寸 (width, height)，物理像素
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+            mask: OCR时使用的UI掩码（255=参与识别），用于判断某个区域是否被覆盖
+        """
+        self.frame_id = frame_id
+        self.results = list(results)
+        self.image_size = image_size
+        self.window_size = window_size
+        self.mask = mask
+        self.scale_x = image_size[0] / window_size[0] if window_size[0] > 0 else 1.0
+        self.scale_y = image_size[1] / window_size[1] if window_size[1] > 0 else 1.0
+
+    def _physical_rect(self, region: dict) -> Tuple[int, int, int, int]:
+        """逻辑坐标区域 → 物理像素矩形"""
+        x0 = int(region['left'] * self.scale_x)
+        y0 = int(region['top'] * self.scale_y)
+        x1 = int((region['left'] + region['width']) * self.scale_x)
+        y1 = int((region['top'] + region['height']) * self.scale_y)
+        return (x0, y0, x1, y1)
+
+    def covers(self, region: dict) -> bool:
+        """
+        区域是否参与了这次OCR（没有被UI掩码排除）
+
+        Args:
+            region: 逻辑坐标区域（left/top/width/height）
+
+        Returns:
+            区域内大部分像素参与了识别时返回True
+        """
+        if self.mask is None:
+            return True
+        x0, y0, x1, y1 = self._physical_rect(region)
+        patch = self.mask[max(0, y0):max(0, y1), max(0, x0):max(0, x1)]
+        return patch.size > 0 and float(np.count_nonzero(patch)) / patch.size >= 0.5
+
+    def texts_in_region(self, region: dict) -> List[Tuple[str, float]]:
+        """
+        中心落在区域内的文本块
+
+        Args:
+            region: 逻辑坐标区域（left/top/width/height）
+
+        Returns:
+            [(文本, 置信度), ...]，按从左到右排序
+        """
+        x0, y0, x1, y1 = self._physical_rect(region)
+        found = []
+        for bbox, text, conf in self.results:
+            cx = sum(p[0] for p in bbox) / len(bbox)
+            cy = sum(p[1] for p in bbox) / len(bbox)
+            if x0 <= cx < x1 and y0 <= cy < y1:
+                found.append((cx, text, float(conf)))
+        return [(text, conf) for _, text, conf in sorted(found)]
+
+    def region_text(self, region: dict) -> str:
+        """区域内所有文本块按从左到右拼接"""
+        return ' '.join(text for text, _ in self.texts_in_region(region))
+
+    def combat_keyword(self, region: dict) -> Optional[str]:
+        """
+        区域内命中的战斗关键词
+
+        Returns:
+            关键词，没有命中返回None
+        """
+        return get_text_classifier().match_combat(self.region_text(region))
+
+
+class TextSceneCache:
+    """按帧序号缓存的文本场景（只保留最近几帧）"""
+
+    def __init__(self, capacity: int = 4):
+        """
+        Args:
+            capacity: 最多保留的帧数
+        """
+        self.capacity = capacity
+        self._entries: "OrderedDict[int, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, frame_id: int, future: Future):
+        """登记一帧的 Future（调用方需持有 self._lock）"""
+        self._entries[frame_id] = future
+        self._entries.move_to_end(frame_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def put(self, scene: TextScene):
+        """记录已完成的文本场景"""
+        with self._lock:
+            future = self._entries.get(scene.frame_id)
+            if future is None or future.done():
+                future = Future()
+                self._store(scene.frame_id, future)
+        try:
+            future.set_result(scene)
+        except InvalidStateError:
+            # 等待中的 Future 刚好被其他线程取消：换成已完成的 Future
+            future = Future()
+            future.set_result(scene)
+            with self._lock:
+                self._store(scene.frame_id, future)
+
+    def put_pending(self, frame_id: int) -> Future:
+        """
+        登记一帧正在进行的OCR（完成时调用 put，失败时对返回的 Future 调用 cancel）
+
+        Returns:
+            该帧的 Future
+        """
+        future = Future()
+        with self._lock:
+            self._store(frame_id, future)
+        return future
+
+    def get(self, frame_id: Optional[int], timeout: Optional[float] = None) -> Optional[TextScene]:
+        """
+        获取某一帧的文本场景
+
+        Args:
+            frame_id: 帧序号
+            timeout: OCR仍在进行时最多等待的秒数；为0时不等待
+
+        Returns:
+            文本场景；没有、被取消或等待超时时返回None
+        """
+        if frame_id is None:
+            return None
+        with self._lock:
+            future = self._entries.get(frame_id)
+        if future is None:
+            return None
+        if not future.done() and timeout == 0:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+
+_text_scene_cache: Optional[TextSceneCache] = None
+
+
+def get_text_scene_cache() -> TextSceneCache:
+    """获取全局文本场景缓存"""
+    global _text_scene_cache
+    if _text_scene_cache is None:
+        _text_scene_cache = TextSceneCache()
+    return _text_scene_cache
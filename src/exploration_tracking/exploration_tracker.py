@@ -8,6 +8,7 @@ from src.ui_interaction.screenshot import Screenshot
 from src.ui_interaction.ocr import OCR
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.core.text_scene import get_text_scene_cache
 
 logger = get_logger(__name__)
 
@@ -66,7 +67,13 @@ class ExplorationTracker:
         }
         logger.info(f"设置探索度文本区域: {self.exploration_text_region}")
     
-    def recognize_exploration_text(self, screenshot: Optional[Image.Image] = None, save_debug: bool = False, check_combat: bool = True) -> str:
+    def recognize_exploration_text(
+        self,
+        screenshot: Optional[Image.Image] = None,
+        save_debug: bool = False,
+        check_combat: bool = True,
+        frame_id: Optional[int] = None
+    ) -> str:
         """
         识别探索度文本
         
@@ -74,12 +81,20 @@ class ExplorationTracker:
             screenshot: 屏幕截图，如果为None则重新截图
             save_debug: 是否保存预处理后的图像用于调试
             check_combat: 是否在识别失败时检查战斗状态（默认True）
+            frame_id: 帧序号；该帧已有整帧OCR（文本场景）且覆盖探索度区域时直接读取
         
         Returns:
             识别的文本（如 "探索度 36%"）
         """
         if screenshot is None:
             screenshot = self.screenshot.capture_full_window()
+
+        scene = get_text_scene_cache().get(frame_id, timeout=0)
+        if scene is not None and scene.covers(self.exploration_text_region):
+            text = scene.region_text(self.exploration_text_region)
+            if text:
+                logger.info(f"识别到的探索度文本（文本场景）: '{text}'")
+                return text
         
         try:
             # 获取截图实际尺寸
@@ -126,8 +141,11 @@ class ExplorationTracker:
             
             cropped = screenshot.crop((left, top, right, bottom))
             
-            # OCR识别（传递save_debug参数）
-            text = self.ocr.recognize(cropped, save_debug=save_debug)
+            # OCR识别：EasyOCR只运行识别网络；pytesseract传递save_debug参数
+            if self.ocr.engine == 'easyocr':
+                text, _ = self.ocr.recognize_batch([cropped])[0]
+            else:
+                text = self.ocr.recognize(cropped, save_debug=save_debug)
             logger.info(f"识别到的探索度文本: '{text}'")
             
             # 如果识别失败，先检查是否在战斗中（战斗界面会遮挡探索度文本）
@@ -135,9 +153,9 @@ class ExplorationTracker:
                 is_in_combat = False
                 if check_combat:
                     try:
-                        from src.core.combat_state import CombatStateDetector
-                        combat_detector = CombatStateDetector()
-                        is_in_combat = combat_detector.is_in_combat(screenshot)
+                        from src.core.combat_state import get_combat_detector
+                        # 共享检测器：同一帧已经检测过时直接复用结果
+                        is_in_combat = get_combat_detector().is_in_combat(screenshot)
                     except Exception as e:
                         logger.debug(f"检查战斗状态时出错: {e}")
                 
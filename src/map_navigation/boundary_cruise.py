@@ -19,19 +19,11 @@ from PIL import Image
 
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.ui_interaction.color_lut import color_mask
 
 logger = get_logger(__name__)
 
 
-def _minimap_to_cv(img: Image.Image) -> np.ndarray:
-    a = np.array(img)
-    if len(a.shape) == 2:
-        a = cv2.cvtColor(a, cv2.COLOR_GRAY2BGR)
-    elif a.shape[2] == 3:
-        a = cv2.cvtColor(a, cv2.COLOR_RGB2BGR)
-    return a
-
-
 def _quadrant_from_delta(dx: float, dy: float) -> str:
     """根据最近黄点相对中心的 (dx,dy) 判定象限。图像坐标 x 右 y 下。"""
     left = dx < 0
@@ -65,12 +57,11 @@ def get_tangent_move_vector(
     min_d = float(mm.get('min_yellow_dist_px', 8))
     min_d2 = max(1e-6, min_d * min_d)
 
-    cv_img = _minimap_to_cv(minimap_img)
-    h, w = cv_img.shape[:2]
+    rgb = np.asarray(minimap_img.convert('RGB'))
+    h, w = rgb.shape[:2]
     cx, cy = w / 2.0, h / 2.0
 
-    hsv = cv2.cvtColor(cv_img, cv2.COLOR_BGR2HSV)
-    yellow = cv2.inRange(hsv, lower, upper)
+    yellow = color_mask(rgb, lower, upper)
     ys, xs = np.where(yellow > 0)
     if ys.size == 0 or xs.size == 0:
         return None
@@ -279,6 +270,7 @@ class BoundaryCruiseDriver:
         self.stuck_same_tolerance_px = int(bt.get('stuck_same_tolerance_px', 4))
         self.escape_radius_px = int(bt.get('escape_radius_px', 80))
         self.arrive_wait_sec = float(bt.get('arrive_wait_sec', 1.0))
+        self.wait_arrival = bool(self.config.get('motion.enabled', True))
         self.minimap_stuck_enabled = bool(bt.get('minimap_stuck_enabled', True))
         self.minimap_stuck_diff_threshold = float(bt.get('minimap_stuck_diff_threshold', 0.02))
 
@@ -434,7 +426,8 @@ class BoundaryCruiseDriver:
         """
         执行一次回溯逻辑。
         返回 "done"（栈空且已归位）、"moving"（正在前往回溯点）、"stuck"（应触发逃逸）。
-        到达判定：持续向回溯点移动满 arrive_wait_sec 即视为已归位（辅以 30–50px 容差概念，逻辑上以时间为主）。
+        到达判定：点击回溯点后镜头停止移动即视为已归位；没有检测到移动时，
+        持续向回溯点移动满 arrive_wait_sec 视为已归位（辅以 30–50px 容差概念）。
         """
         now = time.monotonic()
 
@@ -462,9 +455,17 @@ class BoundaryCruiseDriver:
             self.backtrack_target = t
             self.backtrack_since = now
 
-        self.navigator.move_to(self.backtrack_target[0], self.backtrack_target[1])
-        self._record_move(self.backtrack_target[0], self.backtrack_target[1])
-        logger.debug("原路回溯: (%d, %d)", self.backtrack_target[0], self.backtrack_target[1])
+        target = self.backtrack_target
+        arrived = self.navigator.move_to(
+            target[0], target[1], wait_arrival=self.wait_arrival, timeout=self.arrive_wait_sec
+        )
+        self._record_move(target[0], target[1])
+        logger.debug("原路回溯: (%d, %d)", target[0], target[1])
+        if self.wait_arrival and arrived:
+            # 镜头已停下：已到达该回溯点，下次取下一个
+            self.backtrack_target = None
+            if not self.backtrack_stack:
+                return "done"
         return "moving"
 
     def get_center_position(self) -> Tuple[int, int]:
@@ -100,22 +100,29 @@ class ExplorationNavigator:
         # 探索配置
         self.move_distance = 100  # 移动距离（像素）
         self.escape_radius = 80  # 逃逸半径
-
-    def explore_to_unexplored(self, full_image: Optional[Image.Image] = None) -> bool:
+        # 移动后等镜头停下（角色到达）再返回，代替固定的点击延迟
+        self.wait_arrival = bool(self.config.get('motion.enabled', True))
+
+    def explore_to_unexplored(
+        self,
+        full_image: Optional[Image.Image] = None,
+        minimap: Optional[Image.Image] = None
+    ) -> bool:
         """
         向未探索区域移动（基于小地图分析）
 
         Args:
             full_image: 完整窗口截图，如果为None则重新截图
+            minimap: 已经裁剪好的小地图（可选，提供时不再截图）
 
         Returns:
             True 如果成功移动，False 如果没有未探索区域
         """
-        if full_image is None:
-            full_image = self.screenshot.capture_full_window()
-
         # 获取小地图
-        minimap = self.screenshot.capture_minimap(full_image)
+        if minimap is None:
+            if full_image is None:
+                full_image = self.screenshot.capture_full_window()
+            minimap = self.screenshot.capture_minimap(full_image)
         if minimap is None:
             logger.warning("无法获取小地图")
             return False
@@ -131,7 +138,7 @@ class ExplorationNavigator:
         target = self._calculate_move_target(dx, dy, self.move_distance)
 
         # 移动
-        self.navigator.move_to(target[0], target[1])
+        self.navigator.move_to(target[0], target[1], wait_arrival=self.wait_arrival)
         self._record_move(minimap)
 
         logger.info(f"向未探索区域移动: 方向({dx:.2f}, {dy:.2f}), 目标{target}")
@@ -152,7 +159,7 @@ class ExplorationNavigator:
         target = self._calculate_move_target(dx, dy, self.move_distance)
 
         # 移动
-        self.navigator.move_to(target[0], target[1])
+        self.navigator.move_to(target[0], target[1], wait_arrival=self.wait_arrival)
 
         # 获取小地图用于卡死检测
         full_image = self.screenshot.capture_full_window()
@@ -252,7 +259,7 @@ class ExplorationNavigator:
         target_x = max(0, min(w - 1, target_x))
         target_y = max(0, min(h - 1, target_y))
 
-        self.navigator.move_to(target_x, target_y)
+        self.navigator.move_to(target_x, target_y, wait_arrival=self.wait_arrival)
 
         # 清空历史记录
         self.position_history.clear()
@@ -6,6 +6,7 @@ from typing import Tuple, Optional, List
 from src.ui_interaction.screenshot import Screenshot
 from src.ui_interaction.mouse_control import MouseControl
 from src.ui_interaction.image_match import ImageMatcher
+from src.map_navigation.motion_detector import MotionDetector
 from src.core.config import get_config
 from src.core.logger import get_logger
 
@@ -24,6 +25,7 @@ class MapNavigator:
         
         # 角色位置（需要实时更新）
         self.current_position: Optional[Tuple[int, int]] = None
+        self._motion: Optional[MotionDetector] = None
     
     def detect_character_position(
         self,
@@ -53,21 +55,60 @@ class MapNavigator:
         logger.debug(f"角色位置（屏幕中心）: ({center_x}, {center_y})")
         return (center_x, center_y)
     
-    def move_to(self, target_x: int, target_y: int, delay: float = None):
+    @property
+    def motion(self) -> MotionDetector:
+        """镜头运动检测器（首次使用时创建）"""
+        if self._motion is None:
+            self._motion = MotionDetector(self.screenshot)
+        return self._motion
+
+    def move_to(
+        self,
+        target_x: int,
+        target_y: int,
+        delay: float = None,
+        wait_arrival: bool = False,
+        timeout: Optional[float] = None
+    ) -> bool:
         """
         控制角色移动到目标位置
-        
+
         Args:
             target_x: 目标x坐标
             target_y: 目标y坐标
-            delay: 点击延迟
+            delay: 点击延迟（wait_arrival 时不再额外延迟）
+            wait_arrival: 是否阻塞到镜头停止移动（角色到达）
+            timeout: 等待到达的最长时间（秒），如果为None则使用配置 motion.arrive_timeout
+
+        Returns:
+            wait_arrival 时返回是否观察到移动并已停下；否则返回True
         """
         logger.info(f"移动到目标位置: ({target_x}, {target_y})")
-        self.mouse.click(target_x, target_y, delay=delay)
-        
+        if wait_arrival:
+            self.mouse.click(target_x, target_y, delay=0)
+            arrived = self.wait_arrival(timeout)
+        else:
+            self.mouse.click(target_x, target_y, delay=delay)
+            arrived = True
+
         # 更新当前位置（假设移动成功）
         # 实际应该通过检测来确认
         self.current_position = (target_x, target_y)
+        return arrived
+
+    def wait_arrival(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待角色到达（镜头停止移动）
+
+        Args:
+            timeout: 最长等待时间（秒），如果为None则使用配置 motion.arrive_timeout
+
+        Returns:
+            观察到移动并已停下返回True，没有移动或超时返回False
+        """
+        if timeout is None:
+            timeout = float(self.config.get('motion.arrive_timeout', 3.0))
+        return self.motion.wait_until_stopped(timeout)
     
     def move_to_monster(self, monster_pos: Tuple[int, int, float]):
         """
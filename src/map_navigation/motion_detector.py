@@ -0,0 +1,199 @@
+"""
+镜头运动检测模块
+
+角色始终在屏幕中央，角色走动时整个画面随镜头平移。对相邻两帧的游戏画面区域（去掉四周UI）
+做降采样后用相位相关估计全局平移量，由此判断镜头在动还是已停下，并累计位移作为里程：
+- 点击移动后等到镜头停下即视为到达，不再固定等待
+- 累计位移即镜头移动量（里程）
+"""
+import time
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def even_dft_size(n: int) -> int:
+    """
+    不小于 n 的偶数最优DFT尺寸
+
+    奇数尺寸时 cv2.phaseCorrelate 对完全相同的两帧也会给出 0.5 像素的位移，必须取偶数。
+    """
+    size = cv2.getOptimalDFTSize(max(2, n))
+    while size % 2:
+        size = cv2.getOptimalDFTSize(size + 1)
+    return size
+
+
+class MotionDetector:
+    """基于相位相关的镜头运动检测器"""
+
+    def __init__(self, screenshot):
+        """
+        初始化运动检测器
+
+        Args:
+            screenshot: Screenshot实例
+        """
+        self.config = get_config()
+        self.screenshot = screenshot
+
+        motion_config = self.config.get('motion') or {}
+        self.width = int(motion_config.get('width', 160))
+        self.margin_ratio = float(motion_config.get('margin_ratio', 0.15))
+        self.move_threshold = float(motion_config.get('move_threshold', 1.5))
+        self.min_response = float(motion_config.get('min_response', 0.1))
+        self.settle_frames = int(motion_config.get('settle_frames', 2))
+        self.start_grace = float(motion_config.get('start_grace', 0.4))
+        self.interval = float(motion_config.get('interval', 0.05))
+
+        self._prev: Optional[np.ndarray] = None
+        self._window: Optional[np.ndarray] = None
+        self._scale = (1.0, 1.0)  # 降采样像素 → 逻辑像素 (x, y)
+
+        # 一次等待（start_wait → poll_stopped）的状态
+        self._wait_start = time.monotonic()
+        self._wait_origin: Tuple[float, float] = (0.0, 0.0)
+        self._moved = False
+        self._still = 0
+
+        self.moving = False
+        self.last_shift: Tuple[float, float] = (0.0, 0.0)
+        self.total_shift: Tuple[float, float] = (0.0, 0.0)  # 累计镜头位移（里程），逻辑像素
+        self.last_move_shift: Tuple[float, float] = (0.0, 0.0)  # 最近一次 wait_until_stopped 期间的位移
+
+    def _prepare(self, frame: Image.Image) -> np.ndarray:
+        """裁出游戏画面区域并降采样为灰度图（宽高取偶数的最优DFT尺寸，避免相位相关的半像素偏差）"""
+        rgb = np.asarray(frame.convert('RGB'))
+        h, w = rgb.shape[:2]
+        mx = int(w * self.margin_ratio)
+        my = int(h * self.margin_ratio)
+        playfield = rgb[my:h - my, mx:w - mx]
+        width = even_dft_size(self.width)
+        height = even_dft_size(max(8, int(round(playfield.shape[0] * width / max(1, playfield.shape[1])))))
+        gray = cv2.cvtColor(playfield, cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+        # 宽高比例可能略有变化，两个方向分别换算
+        window_width, window_height = self.screenshot.get_window_size()
+        if window_width <= 0 or window_height <= 0:
+            window_width, window_height = w, h
+        self._scale = (
+            window_width * playfield.shape[1] / w / width,
+            window_height * playfield.shape[0] / h / height,
+        )
+        if self._window is None or self._window.shape != small.shape:
+            self._window = cv2.createHanningWindow((small.shape[1], small.shape[0]), cv2.CV_32F)
+        return small
+
+    def reset(self):
+        """丢弃上一帧（画面发生跳变时调用，如进出战斗）"""
+        self._prev = None
+        self.moving = False
+        self.last_shift = (0.0, 0.0)
+
+    def update(self, frame: Optional[Image.Image] = None) -> Tuple[float, float]:
+        """
+        输入一帧，估计相对上一帧的镜头位移
+
+        Args:
+            frame: 整窗截图，如果为None则自动截图
+
+        Returns:
+            镜头位移 (dx, dy)，逻辑像素；画面内容向相反方向平移。第一帧或画面跳变时返回 (0, 0)
+        """
+        if frame is None:
+            frame = self.screenshot.capture_full_window()
+        current = self._prepare(frame)
+        prev, self._prev = self._prev, current
+        if prev is None or prev.shape != current.shape:
+            self.last_shift = (0.0, 0.0)
+            return self.last_shift
+
+        # phaseCorrelate 会把窗函数原地乘到输入上：传副本，保留的上一帧不能被加窗两次
+        (sx, sy), response = cv2.phaseCorrelate(prev, current.copy(), self._window)
+        if response < self.min_response:
+            # 相关峰太弱（画面跳变、转场），位移不可信：视为在动但不计入里程
+            self.moving = True
+            self.last_shift = (0.0, 0.0)
+            return self.last_shift
+
+        dx, dy = -sx * self._scale[0], -sy * self._scale[1]
+        self.moving = (dx * dx + dy * dy) ** 0.5 > self.move_threshold
+        self.last_shift = (dx, dy)
+        self.total_shift = (self.total_shift[0] + dx, self.total_shift[1] + dy)
+        return self.last_shift
+
+    def start_wait(self):
+        """开始一次"等镜头停下"：记录里程起点并丢弃上一帧（点击移动或画面跳变之后调用）"""
+        self.reset()
+        self._wait_start = time.monotonic()
+        self._wait_origin = self.total_shift
+        self._moved = False
+        self._still = 0
+        self.last_move_shift = (0.0, 0.0)
+
+    def poll_stopped(self, frame: Optional[Image.Image] = None, start_grace: Optional[float] = None) -> Optional[bool]:
+        """
+        输入一帧，判断 start_wait 之后镜头是否已停下
+
+        Args:
+            frame: 整窗截图，如果为None则自动截图
+            start_grace: 开始移动前的宽限时间，如果为None则使用配置 motion.start_grace
+
+        Returns:
+            观察到移动且连续 settle_frames 帧静止返回True；宽限时间内一直静止返回False；仍在等待返回None
+        """
+        if start_grace is None:
+            start_grace = self.start_grace
+        compared = self._prev is not None  # 第一帧没有可比较的上一帧，不计为静止
+        self.update(frame)
+        self.last_move_shift = (
+            self.total_shift[0] - self._wait_origin[0],
+            self.total_shift[1] - self._wait_origin[1]
+        )
+        if self.moving:
+            self._moved = True
+            self._still = 0
+        elif compared:
+            self._still += 1
+
+        elapsed = time.monotonic() - self._wait_start
+        if self._moved and self._still >= self.settle_frames:
+            logger.debug(
+                f"镜头已停下: {elapsed:.2f}秒，本次位移 "
+                f"({self.last_move_shift[0]:.0f}, {self.last_move_shift[1]:.0f})"
+            )
+            return True
+        if not self._moved and elapsed >= start_grace:
+            logger.debug(f"{start_grace:.2f}秒内镜头没有移动")
+            return False
+        return None
+
+    def wait_until_stopped(self, timeout: float, start_grace: Optional[float] = None) -> bool:
+        """
+        等待镜头停止移动（点击移动后调用）
+
+        Args:
+            timeout: 最长等待时间（秒）
+            start_grace: 点击后镜头开始移动前的宽限时间，期间一直静止视为没有移动；
+                         如果为None则使用配置 motion.start_grace
+
+        Returns:
+            观察到移动且镜头已停下时返回True；一直没有移动或超时返回False
+        """
+        self.start_wait()
+        while True:
+            loop_start = time.monotonic()
+            stopped = self.poll_stopped(start_grace=start_grace)
+            if stopped is not None:
+                return stopped
+            elapsed = time.monotonic() - self._wait_start
+            if elapsed >= timeout:
+                logger.debug(f"等待镜头停下超时: {timeout:.2f}秒")
+                return False
+            time.sleep(max(0.0, min(self.interval - (time.monotonic() - loop_start), timeout - elapsed)))
@@ -0,0 +1,169 @@
+"""
+交战路线规划模块
+
+一次扫描看到多个怪物时，规划一条较短的访问顺序（最近邻 + 2-opt），
+形成交战队列，状态机依次消费，两次交战之间不再重新扫描。
+
+坐标约定：规划时的屏幕坐标即世界坐标；角色始终在屏幕中央，
+每次交战后角色（镜头）移动到目标处，后续目标的屏幕坐标按此换算。
+"""
+import time
+from typing import List, Tuple, Optional
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+Point = Tuple[float, float]
+
+
+def _distance(a: Point, b: Point) -> float:
+    return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+
+def plan_route(origin: Point, points: List[Point], max_passes: int = 10) -> List[int]:
+    """
+    规划从 origin 出发、访问所有点的较短开放路径
+
+    Args:
+        origin: 起点（角色位置）
+        points: 待访问的点
+        max_passes: 2-opt 最大迭代轮数
+
+    Returns:
+        访问顺序（points 的下标列表）
+    """
+    n = len(points)
+    if n <= 1:
+        return list(range(n))
+
+    # 最近邻构造初始路径
+    remaining = set(range(n))
+    order = []
+    current = origin
+    while remaining:
+        nearest = min(remaining, key=lambda i: _distance(current, points[i]))
+        order.append(nearest)
+        remaining.remove(nearest)
+        current = points[nearest]
+
+    # 2-opt 改进（起点固定，终点开放）
+    path = [origin] + [points[i] for i in order]
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n):
+            for k in range(i + 1, n + 1):
+                # 反转 path[i..k]：边 (i-1, i) 和 (k, k+1) 被替换
+                before = _distance(path[i - 1], path[i])
+                after = _distance(path[i - 1], path[k])
+                if k < n:
+                    before += _distance(path[k], path[k + 1])
+                    after += _distance(path[i], path[k + 1])
+                if after < before - 1e-6:
+                    path[i:k + 1] = reversed(path[i:k + 1])
+                    order[i - 1:k] = reversed(order[i - 1:k])
+                    improved = True
+        if not improved:
+            break
+    return order
+
+
+class EngagementPlanner:
+    """交战队列规划器"""
+
+    def __init__(self, max_queue_age: Optional[float] = None):
+        """
+        初始化规划器
+
+        Args:
+            max_queue_age: 队列最长有效期（秒），超过后丢弃队列重新扫描；如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        if max_queue_age is None:
+            max_queue_age = float(self.config.get('monster.planner.max_queue_age_sec', 30.0))
+        self.max_queue_age = max_queue_age
+        self.max_targets = int(self.config.get('monster.planner.max_targets', 5))
+
+        # 队列中每项: (世界坐标x, 世界坐标y, 置信度, 轨迹ID或None)
+        self.queue: List[Tuple[float, float, float, Optional[int]]] = []
+        self.origin: Optional[Point] = None
+        self.character_world: Optional[Point] = None
+        self.planned_time: Optional[float] = None
+
+    def plan(
+        self,
+        monsters: List[Tuple[int, int, float]],
+        origin: Tuple[int, int],
+        track_ids: Optional[List[Optional[int]]] = None
+    ) -> int:
+        """
+        根据一次扫描的结果规划交战队列（覆盖旧队列）
+
+        Args:
+            monsters: 怪物列表 [(x, y, confidence), ...]，窗口逻辑坐标
+            origin: 角色位置（屏幕中央）
+            track_ids: 与 monsters 对应的轨迹ID（可选）
+
+        Returns:
+            队列长度
+        """
+        self.clear()
+        if not monsters:
+            return 0
+        if track_ids is None:
+            track_ids = [None] * len(monsters)
+
+        order = plan_route(origin, [(m[0], m[1]) for m in monsters])
+        self.queue = [
+            (float(monsters[i][0]), float(monsters[i][1]), monsters[i][2], track_ids[i])
+            for i in order[:self.max_targets]
+        ]
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.character_world = self.origin
+        self.planned_time = time.monotonic()
+        logger.info(f"规划交战队列: {len(self.queue)} 个目标")
+        return len(self.queue)
+
+    def clear(self):
+        """清空队列"""
+        self.queue = []
+        self.origin = None
+        self.character_world = None
+        self.planned_time = None
+
+    def has_targets(self) -> bool:
+        """队列是否还有未过期的目标"""
+        if not self.queue:
+            return False
+        if time.monotonic() - self.planned_time > self.max_queue_age:
+            logger.debug("交战队列已过期，丢弃")
+            self.clear()
+            return False
+        return True
+
+    def next_target(
+        self,
+        window_size: Optional[Tuple[int, int]] = None
+    ) -> Optional[Tuple[int, int, float]]:
+        """
+        取出下一个目标，并换算为当前屏幕坐标
+
+        取出后认为角色将移动到该目标处，后续目标据此换算。
+
+        Args:
+            window_size: 窗口尺寸 (width, height)，提供时跳过换算后位于窗口外的目标
+
+        Returns:
+            目标 (x, y, confidence)，队列为空时返回None
+        """
+        while self.has_targets():
+            wx, wy, conf, track_id = self.queue.pop(0)
+            x = int(round(wx - self.character_world[0] + self.origin[0]))
+            y = int(round(wy - self.character_world[1] + self.origin[1]))
+            if window_size is not None and not (0 <= x < window_size[0] and 0 <= y < window_size[1]):
+                logger.debug(f"目标 (轨迹{track_id}) 已移出窗口: ({x}, {y})，跳过")
+                continue
+            self.character_world = (wx, wy)
+            logger.debug(f"下一个目标 (轨迹{track_id}): ({x}, {y})，队列剩余 {len(self.queue)}")
+            return (x, y, conf)
+        return None
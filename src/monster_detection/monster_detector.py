@@ -3,10 +3,20 @@
 """
 from PIL import Image, ImageDraw, ImageFont
 from typing import List, Tuple, Optional, Dict
-import re
+from concurrent.futures import Future
+import threading
+import time
+from pathlib import Path
 import numpy as np
 from src.ui_interaction.screenshot import Screenshot
 from src.ui_interaction.image_match import ImageMatcher
+from src.ui_interaction.ocr import OCR
+from src.ui_interaction.ui_mask import get_ui_mask
+from src.ui_interaction.color_lut import color_mask
+from src.monster_detection.monster_tracker import MonsterTracker
+from src.core.spatial_index import GridIndex, dedup_detections
+from src.core.text_classifier import get_text_classifier
+from src.core.text_scene import TextScene, get_text_scene_cache
 from src.core.config import get_config
 from src.core.logger import get_logger
 
@@ -16,11 +26,19 @@ logger = get_logger(__name__)
 class MonsterDetector:
     """怪物检测类"""
     
-    def __init__(self):
-        """初始化怪物检测器"""
+    def __init__(self, executor=None):
+        """
+        初始化怪物检测器
+
+        Args:
+            executor: OCRExecutor实例（可选），提供后 detect_monsters_async 在工作进程中执行OCR
+        """
         self.config = get_config()
         self.screenshot = Screenshot()
         self.matcher = ImageMatcher()
+        self.ocr = OCR()
+        self.executor = executor
+        self.ui_mask = get_ui_mask()
         
         # 怪物模板路径（需要在templates目录下放置怪物图标模板）
         # 支持多个模板（列表形式）
@@ -34,15 +52,69 @@ class MonsterDetector:
         # 检测方法配置
         self.detection_method = self.config.get('monster.detection_method', 'name')  # 'name' 或 'template'
         
-        # 怪物名称关键词列表（用于匹配）
-        monster_names = self.config.get('monster.name_keywords', [])
-        if isinstance(monster_names, str):
-            self.monster_name_keywords = [monster_names]
-        else:
-            self.monster_name_keywords = monster_names if monster_names else [
-                '白虎', '兖州', '大盗', '巡查', '堂主', '党', '怪物', '敌人'
-            ]
+        # OCR文本分类器（关键词自动机+预编译正则，与战斗检测共用）
+        self.text_classifier = get_text_classifier()
+        # 怪物名称关键词列表（用于日志显示）
+        self.monster_name_keywords = self.text_classifier.monster_keywords
+
+        # 颜色检测参数（逻辑分辨率）
+        self.color_hsv_lower = np.array(self.config.get('monster.color.hsv_lower', [15, 80, 80]), dtype=np.uint8)
+        self.color_hsv_upper = np.array(self.config.get('monster.color.hsv_upper', [35, 255, 255]), dtype=np.uint8)
+        # 面积范围按截图物理像素²配置（与原来的 50~5000 一致），过滤时换算到逻辑分辨率
+        self.color_min_area = float(self.config.get('monster.color.min_area', 50))
+        self.color_max_area = float(self.config.get('monster.color.max_area', 5000))
+        self.color_min_aspect = float(self.config.get('monster.color.min_aspect', 1.5))
+        self.color_max_aspect = float(self.config.get('monster.color.max_aspect', 15))
+        self.color_close_kernel = int(self.config.get('monster.color.close_kernel', 2))
+
+        # 分块并行OCR（需要OCR执行器，工作进程数不少于分块数时才能真正并行）
+        self.ocr_tile_count = int(self.config.get('monster.ocr_tiles.count', 0))
+        self.ocr_tile_overlap = int(self.config.get('monster.ocr_tiles.overlap', 30))
+
+        # 组合检测（ensemble）：颜色→模板→OCR 逐级升级，总耗时受预算限制
+        self.detect_budget_ms = float(self.config.get('monster.detect_budget_ms', 800))
+        self.ensemble_agree_ratio = float(self.config.get('monster.ensemble.agree_ratio', 0.6))
+        self.ensemble_match_radius = float(self.config.get('monster.ensemble.match_radius', 40))
+        self.ensemble_ocr_method = self.config.get('monster.ensemble.ocr_method', 'name+color')
+        self.ensemble_cost_smoothing = float(self.config.get('monster.ensemble.cost_smoothing', 0.3))
+        initial_cost = self.config.get('monster.ensemble.initial_cost_ms', None) or {}
+        # 各阶段耗时的指数滑动平均（毫秒），用于判断剩余预算是否还够跑下一阶段
+        self.stage_cost_ms: Dict[str, float] = {
+            'color': float(initial_cost.get('color', 20)),
+            'template': float(initial_cost.get('template', 200)),
+            'ocr': float(initial_cost.get('ocr', 700)),
+        }
+        self.has_monster_templates = any(
+            (Path(t) if Path(t).is_absolute() else self.matcher.template_dir / t).exists()
+            for t in self.monster_templates
+        )
+        # 最近一次检测实际用到的最高阶段（'color' / 'template' / 'ocr'），供跟踪器判断能否确认轨迹
+        self.last_detect_source: Optional[str] = None
+
+        # 单帧文本场景：整帧OCR时保留战斗按钮、探索度文字区域，结果按帧序号共享给其他查询
+        self.text_scene_enabled = bool(self.config.get('text_scene.enabled', True))
+        self.text_scene_keep = tuple(self.config.get('text_scene.keep_regions', ['combat_button', 'exploration_text']))
+        self.text_scenes = get_text_scene_cache()
+
+        # 多帧跟踪（可选）：OCR确认一次，之后用颜色检测维持
+        self.tracker: Optional[MonsterTracker] = None
+        if self.config.get('monster.tracking.enabled', False):
+            if self.detection_method == 'color':
+                logger.warning("颜色检测方法下跟踪无法确认轨迹，已禁用怪物跟踪")
+            else:
+                self.tracker = MonsterTracker()
     
+    def warm_up(self):
+        """预先加载当前检测方法需要的OCR引擎（在后台线程中调用）"""
+        method = self.ensemble_ocr_method if self.detection_method == 'ensemble' else self.detection_method
+        if method == 'name':
+            if self.config.get('recognition.ocr.engine', 'pytesseract') == 'easyocr':
+                self._get_easyocr_reader()
+            else:
+                self.ocr.warm_up()
+        elif method == 'name+color':
+            self.ocr.warm_up()
+
     def set_monster_template(self, template_path: str):
         """
         设置怪物模板路径
@@ -58,7 +130,8 @@ class MonsterDetector:
         screenshot: Optional[Image.Image] = None,
         template_path: Optional[str] = None,
         use_all_templates: bool = True,
-        method: Optional[str] = None
+        method: Optional[str] = None,
+        frame_id: Optional[int] = None
     ) -> List[Tuple[int, int, float]]:
         """
         检测地图上的怪物
@@ -67,7 +140,8 @@ class MonsterDetector:
             screenshot: 屏幕截图，如果为None则重新截图
             template_path: 怪物模板路径，如果为None则使用默认模板
             use_all_templates: 是否使用所有配置的模板
-            method: 检测方法 ('name' 或 'template')，如果为None则使用配置的方法
+            method: 检测方法 ('name', 'name+color', 'color' 或 'template')，如果为None则使用配置的方法
+            frame_id: 帧序号，整帧OCR的结果会作为该帧的文本场景共享
         
         Returns:
             怪物位置列表，每个元素是 (x, y, confidence) 元组
@@ -78,14 +152,319 @@ class MonsterDetector:
         
         # 确定使用的检测方法
         detection_method = method if method is not None else self.detection_method
+        screenshot = self._mask_ui(screenshot, self._text_scene_keep(detection_method))
 
         if detection_method == 'name':
-            return self._detect_monsters_by_name(screenshot)
+            return self._detect_monsters_by_name(screenshot, frame_id)
+        elif detection_method == 'name+color':
+            return self._detect_monsters_by_name_color(screenshot)
         elif detection_method == 'color':
             return self._detect_monsters_by_color(screenshot)
+        elif detection_method == 'ensemble':
+            return self._detect_monsters_ensemble(screenshot)
         else:
             return self._detect_monsters_by_template(screenshot, template_path, use_all_templates)
+
+    def detect_monsters_async(self, screenshot: Optional[Image.Image] = None, frame_id: Optional[int] = None) -> Future:
+        """
+        异步检测怪物：OCR在执行器的工作进程中运行，立即返回 Future
+
+        只有 name 方法 + EasyOCR 引擎且配置了执行器时才真正异步，
+        其他情况同步检测并返回已完成的 Future。
+
+        Args:
+            screenshot: 屏幕截图，如果为None则重新截图
+            frame_id: 帧序号，OCR进行期间其他查询可以等待该帧的文本场景
+
+        Returns:
+            Future，结果与 detect_monsters 相同
+        """
+        if screenshot is None:
+            screenshot = self.screenshot.capture_full_window()
+
+        ocr_engine = self.config.get('recognition.ocr.engine', 'pytesseract')
+        if self.executor is None or self.detection_method != 'name' or ocr_engine != 'easyocr':
+            future = Future()
+            try:
+                future.set_result(self.detect_monsters(screenshot, frame_id=frame_id))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        result_future = Future()
+        keep = self._text_scene_keep('name')
+        screenshot = self._mask_ui(screenshot, keep)
+        scene_future = self.text_scenes.put_pending(frame_id) if keep and frame_id is not None else None
+        tiles = self._submit_ocr_tiles(screenshot, keep)
+        pending = [len(tiles)]
+        lock = threading.Lock()
+
+        def _on_done(f: Future):
+            # 所有分块都完成后再拼接
+            with lock:
+                pending[0] -= 1
+                if pending[0] > 0:
+                    return
+            if result_future.done():
+                return
+            if any(fut.cancelled() for _, fut in tiles):
+                if scene_future is not None:
+                    scene_future.cancel()
+                result_future.cancel()
+                return
+            try:
+                results = self._stitch_tile_results([(tile, fut.result()) for tile, fut in tiles])
+                self._publish_text_scene(frame_id, results, screenshot, keep)
+                result_future.set_result(self._monsters_from_easyocr_results(results, screenshot))
+            except Exception as e:
+                logger.error(f"异步EasyOCR识别失败: {e}")
+                if scene_future is not None:
+                    scene_future.cancel()
+                result_future.set_result([])
+
+        for _, fut in tiles:
+            fut.add_done_callback(_on_done)
+        # 调用方取消时同时取消尚未开始的OCR任务
+        result_future.add_done_callback(
+            lambda f: f.cancelled() and [fut.cancel() for _, fut in tiles]
+        )
+        if scene_future is not None:
+            # 调用方取消、或结果没有生成文本场景时，不让等待该帧场景的查询一直阻塞
+            result_future.add_done_callback(lambda f: scene_future.done() or scene_future.cancel())
+        return result_future
+
+    def _plan_ocr_tiles(self, screenshot: Image.Image, keep: Tuple[str, ...] = ()) -> List[Tuple[int, int, int, int]]:
+        """
+        把游戏画面（去掉顶部/底部HUD）切成上下相邻、互相重叠的横向分块
+
+        Args:
+            screenshot: 屏幕截图（已应用UI掩码）
+            keep: 掩码时保留的UI区域（分块需要覆盖它们）
+
+        Returns:
+            [(y0, y1, own_y0, own_y1), ...]，物理像素。y0-y1 是送去OCR的范围（含重叠），
+            own_y0-own_y1 是该分块负责的范围（文本块中心落在其中才保留）
+        """
+        window_width, window_height = self.screenshot.get_window_size()
+        top, bottom = self.ui_mask.content_rows(screenshot.size, (window_width, window_height), keep)
+        if self.ocr_tile_count <= 1 or bottom - top <= 0:
+            return [(0, screenshot.height, 0, screenshot.height)]
+
+        scale_y = screenshot.height / window_height if window_height > 0 else 1.0
+        half_overlap = int(self.ocr_tile_overlap * scale_y / 2)
+        edges = np.linspace(top, bottom, self.ocr_tile_count + 1).astype(int)
+        tiles = []
+        for i in range(self.ocr_tile_count):
+            own_y0, own_y1 = int(edges[i]), int(edges[i + 1])
+            y0 = max(top, own_y0 - half_overlap)
+            y1 = min(bottom, own_y1 + half_overlap)
+            tiles.append((y0, y1, own_y0, own_y1))
+        return tiles
+
+    def _submit_ocr_tiles(
+        self,
+        screenshot: Image.Image,
+        keep: Tuple[str, ...] = ()
+    ) -> List[Tuple[Tuple[int, int, int, int], Future]]:
+        """
+        把各分块提交到OCR执行器
+
+        Returns:
+            [(分块, Future), ...]，Future 结果为分块内的 readtext 结果
+        """
+        tiles = self._plan_ocr_tiles(screenshot, keep)
+        if len(tiles) > 1:
+            logger.debug(f"分块并行OCR: {len(tiles)} 块")
+        return [
+            (tile, self.executor.submit_readtext(screenshot.crop((0, tile[0], screenshot.width, tile[1]))))
+            for tile in tiles
+        ]
+
+    def _stitch_tile_results(self, tile_results: list) -> list:
+        """
+        拼接各分块的OCR结果：坐标平移回整张截图，重叠区内的文本只保留中心所在分块的那一份
+
+        Args:
+            tile_results: [(分块, readtext结果), ...]
+
+        Returns:
+            readtext 格式的结果 [(bbox, text, conf), ...]，坐标相对于整张截图
+        """
+        stitched = []
+        for (y0, _, own_y0, own_y1), results in tile_results:
+            for bbox, text, conf in results:
+                bbox = [[p[0], p[1] + y0] for p in bbox]
+                center_y = sum(p[1] for p in bbox) / len(bbox)
+                if own_y0 <= center_y < own_y1:
+                    stitched.append((bbox, text, conf))
+        return stitched
     
+    def track_monsters(
+        self,
+        screenshot: Optional[Image.Image] = None,
+        camera_shift: Tuple[float, float] = (0.0, 0.0),
+        frame_id: Optional[int] = None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        检测并跟踪怪物
+
+        需要确认时（没有已确认轨迹、出现新的候选或距上次OCR太久）使用配置的检测方法，
+        否则只运行颜色检测来维持已有轨迹。未启用跟踪时等同于 detect_monsters。
+
+        Args:
+            screenshot: 屏幕截图，如果为None则重新截图
+            camera_shift: 自上次调用以来的镜头移动量 (dx, dy)，逻辑像素
+            frame_id: 帧序号（传给 detect_monsters，用于共享文本场景）
+
+        Returns:
+            已确认的怪物位置列表 [(x, y, confidence), ...]
+        """
+        return self.track_monsters_with_ids(screenshot, camera_shift, frame_id)[0]
+
+    def track_monsters_with_ids(
+        self,
+        screenshot: Optional[Image.Image] = None,
+        camera_shift: Tuple[float, float] = (0.0, 0.0),
+        frame_id: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, int, float]], Optional[List[int]]]:
+        """
+        检测并跟踪怪物，同时返回与位置一一对应的轨迹ID（参数同 track_monsters）
+
+        Returns:
+            (怪物位置列表, 轨迹ID列表)；未启用跟踪时ID为None
+        """
+        if screenshot is None:
+            screenshot = self.screenshot.capture_full_window()
+        if self.tracker is None:
+            return self.detect_monsters(screenshot, frame_id=frame_id), None
+
+        if self.tracker.needs_confirmation():
+            monsters = self.detect_monsters(screenshot, frame_id=frame_id)
+            if self.detection_method == 'ensemble':
+                source = self.last_detect_source
+            else:
+                source = 'ocr' if self.detection_method in ('name', 'name+color') else 'template'
+        else:
+            monsters = self._detect_monsters_by_color(self._mask_ui(screenshot))
+            source = 'color'
+
+        self.tracker.update(monsters, source=source, camera_shift=camera_shift)
+        return self.tracker.snapshot()
+
+    def _mask_ui(self, screenshot: Image.Image, keep: Tuple[str, ...] = ()) -> Image.Image:
+        """清零已知UI区域（小地图、HUD等）的像素，所有检测方法都在掩码后的截图上运行"""
+        return self.ui_mask.apply(screenshot, self.screenshot.get_window_size(), keep)
+
+    def _text_scene_keep(self, method: str) -> Tuple[str, ...]:
+        """
+        整帧OCR时需要保留的UI区域
+
+        只有 name 方法 + EasyOCR（整帧 readtext）才生成文本场景；其他方法照常排除所有UI区域
+        """
+        if not self.text_scene_enabled or method != 'name':
+            return ()
+        if self.config.get('recognition.ocr.engine', 'pytesseract') != 'easyocr':
+            return ()
+        return self.text_scene_keep
+
+    def _publish_text_scene(self, frame_id: Optional[int], results: list, screenshot: Image.Image, keep: Tuple[str, ...]):
+        """把整帧OCR结果记录为该帧的文本场景"""
+        if frame_id is None or not keep:
+            return
+        window_size = self.screenshot.get_window_size()
+        mask = self.ui_mask.get_mask(screenshot.size, window_size, keep) if self.ui_mask.enabled else None
+        self.text_scenes.put(TextScene(frame_id, results, screenshot.size, window_size, mask))
+
+    def _run_stage(self, stage: str, detect) -> List[Tuple[int, int, float]]:
+        """执行一个检测阶段并更新该阶段的耗时估计"""
+        start = time.perf_counter()
+        monsters = detect()
+        elapsed_ms = 1000 * (time.perf_counter() - start)
+        a = self.ensemble_cost_smoothing
+        self.stage_cost_ms[stage] = a * elapsed_ms + (1 - a) * self.stage_cost_ms[stage]
+        self.last_detect_source = stage
+        logger.debug(f"检测阶段 {stage}: {len(monsters)} 个结果，耗时 {elapsed_ms:.0f}ms")
+        return monsters
+
+    def _detections_agree(
+        self,
+        a: List[Tuple[int, int, float]],
+        b: List[Tuple[int, int, float]]
+    ) -> bool:
+        """两组检测结果在 match_radius 内一一对应的比例是否达到 agree_ratio"""
+        if not a or not b:
+            return False
+        index = GridIndex(self.ensemble_match_radius)
+        for x, y, _ in b:
+            index.insert(x, y)
+        used = set()
+        matched = 0
+        for x, y, _ in a:
+            for i in index.query(x, y, self.ensemble_match_radius):
+                if i not in used:
+                    used.add(i)
+                    matched += 1
+                    break
+        return matched / max(len(a), len(b)) >= self.ensemble_agree_ratio
+
+    def _detect_monsters_ensemble(self, screenshot: Image.Image) -> List[Tuple[int, int, float]]:
+        """
+        组合检测：先跑便宜的颜色检测和模板匹配，两者一致时直接返回；
+        不一致或都没找到时才升级到OCR。每个阶段开始前检查剩余预算（monster.detect_budget_ms）
+        是否够该阶段的平均耗时，不够就返回已有结果，保证扫描耗时可预期。
+
+        Args:
+            screenshot: 屏幕截图（已应用UI掩码）
+
+        Returns:
+            怪物位置列表 [(x, y, confidence), ...]
+        """
+        start = time.perf_counter()
+
+        def remaining_ms() -> float:
+            return self.detect_budget_ms - 1000 * (time.perf_counter() - start)
+
+        color = self._run_stage('color', lambda: self._detect_monsters_by_color(screenshot))
+
+        template = None
+        if self.has_monster_templates and remaining_ms() >= self.stage_cost_ms['template']:
+            # 模板匹配返回截图像素坐标，换算到窗口逻辑坐标再比较
+            window_width, window_height = self.screenshot.get_window_size()
+            scale_x = window_width / screenshot.width if screenshot.width > 0 else 1.0
+            scale_y = window_height / screenshot.height if screenshot.height > 0 else 1.0
+            template = self._run_stage('template', lambda: [
+                (int(x * scale_x), int(y * scale_y), conf)
+                for x, y, conf in self._detect_monsters_by_template(screenshot)
+            ])
+            if self._detections_agree(color, template):
+                # 两者都有结果且一致：模板匹配验证了颜色检测的结果
+                logger.debug("颜色检测与模板匹配一致，不再运行OCR")
+                self.last_detect_source = 'template'
+                return color
+
+        if color and template is None:
+            # 没有可用的模板（或预算不够），颜色检测结果无从比较，直接采用（未经验证，不能确认轨迹）
+            self.last_detect_source = 'color'
+            return color
+
+        # 便宜的方法不一致或都没找到：预算允许时升级到OCR
+        if remaining_ms() >= self.stage_cost_ms['ocr']:
+            if self.ensemble_ocr_method == 'name':
+                return self._run_stage('ocr', lambda: self._detect_monsters_by_name(screenshot))
+            return self._run_stage('ocr', lambda: self._detect_monsters_by_name_color(screenshot))
+
+        # 预算不足：优先用颜色检测（基于名字标签，位置推算与OCR一致），没有时才用模板结果
+        logger.info(f"检测预算不足（剩余 {remaining_ms():.0f}ms，OCR约需 {self.stage_cost_ms['ocr']:.0f}ms），使用颜色/模板结果")
+        if color:
+            self.last_detect_source = 'color'
+            return color
+        if template:
+            self.last_detect_source = 'template'
+            return template
+        # 没有任何阶段给出结果：空的（或没有运行的）模板阶段不能算作确认
+        self.last_detect_source = 'color'
+        return []
+
     def _preprocess_for_ocr(self, image: Image.Image) -> Image.Image:
         """
         预处理图像以提高OCR识别率（针对怪物名称）
@@ -168,6 +547,64 @@ class MonsterDetector:
         # 转换为PIL Image
         return Image.fromarray(gray)
 
+    def _find_color_label_boxes(self, screenshot: Image.Image) -> List[Tuple[int, int, int, int]]:
+        """
+        通过颜色查找黄色名字标签的候选框
+
+        UI区域已由 UIMask 清零，这里不再单独排除。
+
+        Args:
+            screenshot: 屏幕截图（已应用UI掩码）
+
+        Returns:
+            候选框列表 [(x, y, w, h), ...]，截图物理像素坐标
+        """
+        import cv2
+
+        # 缩小到逻辑分辨率（Retina 截图是 2x），像素数减少到 1/4
+        window_width, window_height = self.screenshot.get_window_size()
+        img_array = np.asarray(screenshot)
+        if screenshot.width > window_width or screenshot.height > window_height:
+            img_array = cv2.resize(img_array, (window_width, window_height), interpolation=cv2.INTER_AREA)
+        scale_x = screenshot.width / img_array.shape[1]
+        scale_y = screenshot.height / img_array.shape[0]
+
+        # 黄色掩码（查找表或 HSV inRange）
+        yellow_mask = color_mask(img_array, self.color_hsv_lower, self.color_hsv_upper)
+
+        # 闭运算把同一标签的文字连成一块（噪点由下面的面积过滤去掉）
+        if self.color_close_kernel > 1:
+            kernel = np.ones((self.color_close_kernel, self.color_close_kernel), np.uint8)
+            yellow_mask = cv2.morphologyEx(yellow_mask, cv2.MORPH_CLOSE, kernel)
+
+        # 一次调用得到所有连通域的边界框
+        n_labels, _, stats, _ = cv2.connectedComponentsWithStats(yellow_mask, connectivity=8)
+        stats = stats[1:]  # 去掉背景
+        logger.debug(f"检测到 {n_labels - 1} 个黄色区域")
+
+        # 向量化过滤：只保留合理大小和宽高比的文字区域
+        # 面积在逻辑分辨率上计算，阈值从物理像素²换算（1x 截图不变，Retina 2x 为 1/4）
+        w = stats[:, cv2.CC_STAT_WIDTH].astype(np.float64)
+        h = stats[:, cv2.CC_STAT_HEIGHT].astype(np.float64)
+        area = w * h
+        area_scale = scale_x * scale_y
+        aspect = np.divide(w, h, out=np.zeros_like(w), where=h > 0)
+        keep = (
+            (area > self.color_min_area / area_scale) & (area < self.color_max_area / area_scale)
+            & (aspect > self.color_min_aspect) & (aspect < self.color_max_aspect)
+        )
+        stats = stats[keep]
+
+        # 转换回截图物理像素坐标
+        x0 = np.floor(stats[:, cv2.CC_STAT_LEFT] * scale_x).astype(int)
+        y0 = np.floor(stats[:, cv2.CC_STAT_TOP] * scale_y).astype(int)
+        x1 = np.ceil((stats[:, cv2.CC_STAT_LEFT] + stats[:, cv2.CC_STAT_WIDTH]) * scale_x).astype(int)
+        y1 = np.ceil((stats[:, cv2.CC_STAT_TOP] + stats[:, cv2.CC_STAT_HEIGHT]) * scale_y).astype(int)
+        return [
+            (int(x), int(y), int(x2 - x), int(y2 - y))
+            for x, y, x2, y2 in zip(x0, y0, x1, y1)
+        ]
+
     def _detect_monsters_by_color(self, screenshot: Image.Image) -> List[Tuple[int, int, float]]:
         """
         通过颜色检测黄色文字区域来识别怪物（快速方法）
@@ -181,11 +618,6 @@ class MonsterDetector:
         logger.debug("使用颜色检测识别怪物...")
 
         try:
-            import cv2
-
-            # 转换为numpy数组
-            img_array = np.array(screenshot)
-
             # 获取窗口尺寸
             window_width, window_height = self.screenshot.get_window_size()
 
@@ -193,82 +625,27 @@ class MonsterDetector:
             scale_x = window_width / screenshot.width if screenshot.width > 0 else 1.0
             scale_y = window_height / screenshot.height if screenshot.height > 0 else 1.0
 
-            # 转换为HSV色彩空间
-            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-
-            # 定义黄色的HSV范围
-            lower_yellow = np.array([15, 80, 80])
-            upper_yellow = np.array([35, 255, 255])
-
-            # 创建黄色掩码
-            yellow_mask = cv2.inRange(hsv, lower_yellow, upper_yellow)
-
-            # 形态学操作：去除噪点
-            kernel = np.ones((3, 3), np.uint8)
-            yellow_mask = cv2.morphologyEx(yellow_mask, cv2.MORPH_OPEN, kernel)
-            yellow_mask = cv2.morphologyEx(yellow_mask, cv2.MORPH_CLOSE, kernel)
-
-            # 查找轮廓
-            contours, _ = cv2.findContours(yellow_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            logger.debug(f"检测到 {len(contours)} 个黄色区域")
-
-            # 过滤轮廓：只保留合理大小的文字区域
             monsters = []
-            for contour in contours:
-                # 计算轮廓的边界框（物理像素）
-                x, y, w, h = cv2.boundingRect(contour)
-                area = w * h
-
-                # 过滤条件
-                if 50 < area < 5000:  # 面积范围
-                    aspect_ratio = w / h if h > 0 else 0
-                    if 1.5 < aspect_ratio < 15:  # 宽高比范围
-                        # 计算中心点（物理像素）
-                        center_x = x + w // 2
-                        center_y = y + h // 2
-
-                        # 转换为逻辑坐标
-                        center_x_logical = int(center_x * scale_x)
-                        center_y_logical = int(center_y * scale_y)
-
-                        # 排除UI区域（逻辑坐标）
-                        if center_y_logical < 50 or center_y_logical > window_height - 100:
-                            continue
-
-                        # 排除右上角小地图区域
-                        if center_x_logical > window_width - 150 and center_y_logical < 150:
-                            continue
+            for x, y, w, h in self._find_color_label_boxes(screenshot):
+                # 计算中心点（物理像素）
+                center_x = x + w // 2
+                center_y = y + h // 2
 
-                        # 怪物位置在文字下方（物理像素）
-                        monster_x_physical = center_x
-                        monster_y_physical = center_y + h // 2 + 25
+                # 怪物位置在文字下方（物理像素）
+                monster_x_physical = center_x
+                monster_y_physical = center_y + h // 2 + 25
 
-                        # 转换为逻辑坐标
-                        monster_x = int(monster_x_physical * scale_x)
-                        monster_y = int(monster_y_physical * scale_y)
+                # 转换为逻辑坐标
+                monster_x = int(monster_x_physical * scale_x)
+                monster_y = int(monster_y_physical * scale_y)
 
-                        # 确保在窗口范围内
-                        if 0 <= monster_x < window_width and 0 <= monster_y < window_height:
-                            monsters.append((monster_x, monster_y, 1.0))
-                            logger.debug(f"检测到怪物: 文字中心({center_x_logical}, {center_y_logical}), 怪物位置({monster_x}, {monster_y})")
+                # 确保在窗口范围内
+                if 0 <= monster_x < window_width and 0 <= monster_y < window_height:
+                    monsters.append((monster_x, monster_y, 1.0))
+                    logger.debug(f"检测到怪物: 文字中心({int(center_x * scale_x)}, {int(center_y * scale_y)}), 怪物位置({monster_x}, {monster_y})")
 
             # 去除重复
-            if monsters:
-                filtered_monsters = []
-                for monster in monsters:
-                    x, y, conf = monster
-                    is_duplicate = False
-                    for existing in filtered_monsters:
-                        ex, ey, _ = existing
-                        distance = ((x - ex) ** 2 + (y - ey) ** 2) ** 0.5
-                        if distance < 40:
-                            is_duplicate = True
-                            break
-                    if not is_duplicate:
-                        filtered_monsters.append(monster)
-
-                monsters = filtered_monsters
+            monsters = dedup_detections(monsters, 40)
 
             if monsters:
                 logger.info(f"通过颜色检测识别到 {len(monsters)} 个怪物")
@@ -281,15 +658,117 @@ class MonsterDetector:
             logger.error(f"颜色检测失败: {e}", exc_info=True)
             return []
 
+    def _merge_label_boxes(
+        self,
+        boxes: List[Tuple[int, int, int, int]],
+        pad_x: int,
+        pad_y: int,
+        image_size: Tuple[int, int]
+    ) -> List[List[int]]:
+        """
+        扩展候选框并合并同一行上相互重叠的框（名字和等级可能是分开的色块）
+
+        Args:
+            boxes: 候选框列表 [(x, y, w, h), ...]，物理像素
+            pad_x: 水平扩展像素
+            pad_y: 垂直扩展像素
+            image_size: 截图尺寸 (width, height)
+
+        Returns:
+            EasyOCR horizontal_list 格式的框 [[x_min, x_max, y_min, y_max], ...]
+        """
+        img_w, img_h = image_size
+        padded = sorted(
+            [
+                [max(0, x - pad_x), min(img_w, x + w + pad_x),
+                 max(0, y - pad_y), min(img_h, y + h + pad_y)]
+                for x, y, w, h in boxes
+            ],
+            key=lambda b: b[0]
+        )
+
+        # 合并后的框会变大，可能与之前没有重叠的框重叠，重复合并直到没有变化
+        merged = padded
+        changed = True
+        while changed:
+            changed = False
+            result: List[List[int]] = []
+            for box in merged:
+                for existing in result:
+                    overlap_x = box[0] <= existing[1] and existing[0] <= box[1]
+                    overlap_y = box[2] <= existing[3] and existing[2] <= box[3]
+                    if overlap_x and overlap_y:
+                        existing[0] = min(existing[0], box[0])
+                        existing[1] = max(existing[1], box[1])
+                        existing[2] = min(existing[2], box[2])
+                        existing[3] = max(existing[3], box[3])
+                        changed = True
+                        break
+                else:
+                    result.append(box)
+            merged = result
+        return merged
+
+    def _detect_monsters_by_name_color(self, screenshot: Image.Image) -> List[Tuple[int, int, float]]:
+        """
+        颜色候选 + OCR识别：先用颜色找到黄色名字标签，再只对这些区域做文字识别
+
+        跳过EasyOCR的文字检测网络（整窗检测是最慢的一步），
+        所有候选区域通过 OCR.recognize_batch 批量识别，分类规则与 name 方法相同。
+
+        Args:
+            screenshot: 屏幕截图
+
+        Returns:
+            怪物位置列表 [(x, y, confidence), ...]
+        """
+        logger.debug("使用颜色候选+OCR识别怪物名称...")
+
+        try:
+            boxes = self._find_color_label_boxes(screenshot)
+            if not boxes:
+                logger.debug("没有颜色候选区域")
+                return []
+
+            # 扩展量按逻辑像素配置，换算为截图物理像素
+            window_width, window_height = self.screenshot.get_window_size()
+            scale_x = screenshot.width / window_width if window_width > 0 else 1.0
+            scale_y = screenshot.height / window_height if window_height > 0 else 1.0
+            pad_x = int(self.config.get('monster.name_color.pad_x', 20) * scale_x)
+            pad_y = int(self.config.get('monster.name_color.pad_y', 4) * scale_y)
+
+            horizontal_list = self._merge_label_boxes(boxes, pad_x, pad_y, screenshot.size)
+            logger.debug(f"{len(boxes)} 个颜色候选合并为 {len(horizontal_list)} 个识别区域")
+
+            # 只运行识别网络，所有区域一次批量识别
+            crops = [screenshot.crop((x0, y0, x1, y1)) for x0, x1, y0, y1 in horizontal_list]
+            recognized = self.ocr.recognize_batch(crops)
+
+            # 组装成与 readtext 相同的结果格式（bbox 为截图坐标）
+            results = [
+                ([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], text, conf)
+                for (x0, x1, y0, y1), (text, conf) in zip(horizontal_list, recognized)
+                if text
+            ]
+            return self._monsters_from_easyocr_results(results, screenshot)
+
+        except Exception as e:
+            logger.error(f"颜色候选OCR识别失败: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+            return []
+
     def _detect_monsters_by_name(
         self,
-        screenshot: Image.Image
+        screenshot: Image.Image,
+        frame_id: Optional[int] = None
     ) -> List[Tuple[int, int, float]]:
         """
         通过OCR识别怪物名称来检测怪物
         
         Args:
             screenshot: 屏幕截图
+            frame_id: 帧序号（EasyOCR整帧识别结果作为该帧的文本场景）
         
         Returns:
             怪物位置列表，每个元素是 (x, y, confidence) 元组
@@ -300,11 +779,20 @@ class MonsterDetector:
         ocr_engine = self.config.get('recognition.ocr.engine', 'pytesseract')
         
         if ocr_engine == 'easyocr':
-            return self._detect_monsters_with_easyocr(screenshot)
+            return self._detect_monsters_with_easyocr(screenshot, frame_id)
         else:
             return self._detect_monsters_with_pytesseract(screenshot)
     
-    def _detect_monsters_with_easyocr(self, screenshot: Image.Image) -> List[Tuple[int, int, float]]:
+    def _get_easyocr_reader(self):
+        """获取EasyOCR Reader（与异步路径使用同一个 recognition.ocr.gpu 配置，共享同一个模型）"""
+        from src.ui_interaction.ocr import get_easyocr_reader
+        return get_easyocr_reader(gpu=bool(self.config.get('recognition.ocr.gpu', True)))
+
+    def _detect_monsters_with_easyocr(
+        self,
+        screenshot: Image.Image,
+        frame_id: Optional[int] = None
+    ) -> List[Tuple[int, int, float]]:
         """
         使用easyocr识别怪物名称
 
@@ -313,147 +801,110 @@ class MonsterDetector:
         logger.debug("使用EasyOCR识别怪物名称...")
 
         try:
-            import easyocr
-            import numpy as np
+            keep = self._text_scene_keep('name')
+            if self.executor is not None and self.ocr_tile_count > 1:
+                # 分块在多个工作进程中并行识别
+                tiles = self._submit_ocr_tiles(screenshot, keep)
+                results = self._stitch_tile_results([(tile, fut.result()) for tile, fut in tiles])
+            else:
+                # 使用easyocr识别
+                results = self._get_easyocr_reader().readtext(np.array(screenshot))
+            self._publish_text_scene(frame_id, results, screenshot, keep)
+            return self._monsters_from_easyocr_results(results, screenshot)
 
-            # 初始化easyocr（只初始化一次）
-            if not hasattr(self, '_easyocr_reader'):
-                logger.debug("初始化EasyOCR...")
-                # 使用GPU加速（Apple Silicon的MPS）
-                self._easyocr_reader = easyocr.Reader(['ch_sim', 'en'], gpu=True)
+        except ImportError:
+            logger.error("EasyOCR未安装，请运行: pip install easyocr")
+            return []
+        except Exception as e:
+            logger.error(f"EasyOCR识别失败: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+            return []
 
-            # 转换为numpy数组
-            img_array = np.array(screenshot)
+    def _monsters_from_easyocr_results(
+        self,
+        results: list,
+        screenshot: Image.Image
+    ) -> List[Tuple[int, int, float]]:
+        """
+        从EasyOCR的文本块中筛选怪物名称并推算怪物位置
 
-            # 获取窗口实际尺寸（用于坐标缩放）
-            window_width = self.screenshot.get_window_size()[0]
-            window_height = self.screenshot.get_window_size()[1]
+        Args:
+            results: EasyOCR readtext 结果 [(bbox, text, conf), ...]，坐标相对于截图
+            screenshot: 对应的截图（用于计算 Retina 缩放）
 
-            # 检查是否需要缩放坐标（Retina截图可能返回2x分辨率）
-            scale_x = window_width / screenshot.width if screenshot.width > 0 else 1.0
-            scale_y = window_height / screenshot.height if screenshot.height > 0 else 1.0
+        Returns:
+            怪物位置列表 [(x, y, confidence), ...]，窗口逻辑坐标
+        """
+        # 获取窗口实际尺寸（用于坐标缩放）
+        window_width = self.screenshot.get_window_size()[0]
+        window_height = self.screenshot.get_window_size()[1]
 
-            logger.debug(f"截图尺寸: {screenshot.width}x{screenshot.height}, 窗口尺寸: {window_width}x{window_height}")
-            logger.debug(f"坐标缩放因子: x={scale_x:.2f}, y={scale_y:.2f}")
+        # 检查是否需要缩放坐标（Retina截图可能返回2x分辨率）
+        scale_x = window_width / screenshot.width if screenshot.width > 0 else 1.0
+        scale_y = window_height / screenshot.height if screenshot.height > 0 else 1.0
 
-            # 使用easyocr识别
-            results = self._easyocr_reader.readtext(img_array)
+        logger.debug(f"截图尺寸: {screenshot.width}x{screenshot.height}, 窗口尺寸: {window_width}x{window_height}")
+        logger.debug(f"坐标缩放因子: x={scale_x:.2f}, y={scale_y:.2f}")
 
-            logger.debug(f"OCR识别到 {len(results)} 个文本块")
+        logger.debug(f"OCR识别到 {len(results)} 个文本块")
 
-            monsters = []
-            for (bbox, text, conf) in results:
-                # bbox是四个点的坐标 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                # 计算文本中心位置
-                x_coords = [point[0] for point in bbox]
-                y_coords = [point[1] for point in bbox]
-                text_x = int(sum(x_coords) / len(x_coords))
-                text_y = int(sum(y_coords) / len(y_coords))
-
-                # 缩放坐标到窗口尺寸（如果截图是Retina 2x，需要除以2）
-                text_x = int(text_x * scale_x)
-                text_y = int(text_y * scale_y)
-
-                # 计算文本宽度和高度（用于推断怪物位置）
-                text_w = int((max(x_coords) - min(x_coords)) * scale_x)
-                text_h = int((max(y_coords) - min(y_coords)) * scale_y)
-
-                # 判断是否为怪物名称的策略（不依赖关键词）：
-                is_monster_name = False
-                detection_reason = ""
-
-                # 策略1：检测等级格式 - "（XX级）"或"XX级"
-                # 注意：不检测"LvXX"，那是角色级别
-                if re.search(r'\（\d+级\）', text):  # 全角括号
-                    is_monster_name = True
-                    detection_reason = "等级格式（全角括号）"
-                elif re.search(r'\(\d+级\)', text):  # 半角括号
-                    is_monster_name = True
-                    detection_reason = "等级格式（半角括号）"
-                elif re.search(r'\d+级', text):  # 只有"XX级"
-                    # 排除角色级别（如"LV54"）
-                    if not re.search(r'LV|Lv|lv', text):
-                        is_monster_name = True
-                        detection_reason = "等级格式（XX级）"
-
-                # 策略2：如果配置了关键词，也检查关键词（作为补充）
-                if not is_monster_name and self.monster_name_keywords:
-                    for keyword in self.monster_name_keywords:
-                        if keyword in text:
-                            is_monster_name = True
-                            detection_reason = f"关键词匹配（{keyword}）"
-                            break
-
-                # 策略3：检测中文名称+数字的组合（如"少阳派弃徒 74"）
-                # 但要更严格，避免误判UI文本
-                if not is_monster_name:
-                    # 至少包含3个中文字符 + 数字
-                    chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
-                    has_numbers = re.search(r'\d+', text)
-                    if len(chinese_chars) >= 3 and has_numbers:
-                        # 排除一些明显不是怪物名称的文本
-                        exclude_keywords = ['探索', '奖励', '铜钱', '历练', '家园', '背包', '角色', '完成', '首次', '无字', 'LV', 'Lv']
-                        is_excluded = any(kw in text for kw in exclude_keywords)
-                        # 还要检查文本长度，太长的可能是UI文本
-                        if not is_excluded and len(text) <= 20:
-                            is_monster_name = True
-                            detection_reason = "中文名称+数字"
-
-                if is_monster_name:
-                    # 怪物位置计算：
-                    # 根据游戏截图，怪物通常在名称文字的正下方
-                    # 文字的底部 y 坐标 = text_y + text_h/2
-                    # 怪物在文字底部下方约 20-30 像素
-                    text_bottom_y = text_y + text_h // 2
-                    monster_x = text_x
-                    monster_y = text_bottom_y + 25  # 文字底部下方25像素
-
-                    # 检查坐标是否在窗口范围内
-                    if 0 <= monster_x < window_width and 0 <= monster_y < window_height:
-                        confidence = float(conf)
-                        monsters.append((monster_x, monster_y, confidence))
-                        logger.debug(f"检测到怪物: '{text}' ({detection_reason})")
-                        logger.debug(f"  文本位置: ({text_x}, {text_y}), 文本尺寸: {text_w}x{text_h}")
-                        logger.debug(f"  怪物位置: ({monster_x}, {monster_y}), 置信度: {conf:.3f}")
-                    else:
-                        logger.warning(f"怪物位置超出窗口范围: ({monster_x}, {monster_y}), 窗口尺寸: {window_width}x{window_height}")
-
-            # 去除重复的匹配
-            if monsters:
-                filtered_monsters = []
-                for monster in monsters:
-                    x, y, conf = monster
-                    is_duplicate = False
-                    for existing in filtered_monsters:
-                        ex, ey, _ = existing
-                        distance = ((x - ex) ** 2 + (y - ey) ** 2) ** 0.5
-                        if distance < 40:
-                            is_duplicate = True
-                            break
-                    if not is_duplicate:
-                        filtered_monsters.append(monster)
-
-                monsters = filtered_monsters
+        monsters = []
+        for (bbox, text, conf) in results:
+            # bbox是四个点的坐标 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
+            # 计算文本中心位置
+            x_coords = [point[0] for point in bbox]
+            y_coords = [point[1] for point in bbox]
+            text_x = int(sum(x_coords) / len(x_coords))
+            text_y = int(sum(y_coords) / len(y_coords))
 
-            if monsters:
-                logger.info(f"通过EasyOCR识别检测到 {len(monsters)} 个怪物")
-                for i, monster in enumerate(monsters[:10]):
-                    logger.debug(f"  怪物{i+1}: 位置({monster[0]}, {monster[1]}), 置信度: {monster[2]:.3f}")
-            else:
-                logger.debug("未检测到任何怪物名称")
-                logger.debug(f"OCR共识别到 {len(results)} 个文本块，但没有匹配到怪物格式")
+            # 文本场景保留的UI区域（如小地图内的战斗按钮）里读到的文本不参与怪物检测
+            if self.ui_mask.excludes(text_x, text_y, screenshot.size, (window_width, window_height)):
+                continue
 
-            return monsters
+            # 缩放坐标到窗口尺寸（如果截图是Retina 2x，需要除以2）
+            text_x = int(text_x * scale_x)
+            text_y = int(text_y * scale_y)
+
+            # 计算文本宽度和高度（用于推断怪物位置）
+            text_w = int((max(x_coords) - min(x_coords)) * scale_x)
+            text_h = int((max(y_coords) - min(y_coords)) * scale_y)
+
+            # 判断是否为怪物名称：等级格式、关键词、中文名称+数字（一次扫描）
+            is_monster_name, detection_reason = self.text_classifier.classify_monster(text)
+
+            if is_monster_name:
+                # 怪物位置计算：
+                # 根据游戏截图，怪物通常在名称文字的正下方
+                # 文字的底部 y 坐标 = text_y + text_h/2
+                # 怪物在文字底部下方约 20-30 像素
+                text_bottom_y = text_y + text_h // 2
+                monster_x = text_x
+                monster_y = text_bottom_y + 25  # 文字底部下方25像素
+
+                # 检查坐标是否在窗口范围内
+                if 0 <= monster_x < window_width and 0 <= monster_y < window_height:
+                    confidence = float(conf)
+                    monsters.append((monster_x, monster_y, confidence))
+                    logger.debug(f"检测到怪物: '{text}' ({detection_reason})")
+                    logger.debug(f"  文本位置: ({text_x}, {text_y}), 文本尺寸: {text_w}x{text_h}")
+                    logger.debug(f"  怪物位置: ({monster_x}, {monster_y}), 置信度: {conf:.3f}")
+                else:
+                    logger.warning(f"怪物位置超出窗口范围: ({monster_x}, {monster_y}), 窗口尺寸: {window_width}x{window_height}")
+
+        # 去除重复的匹配（保留置信度最高的）
+        monsters = dedup_detections(monsters, 40)
+
+        if monsters:
+            logger.info(f"通过EasyOCR识别检测到 {len(monsters)} 个怪物")
+            for i, monster in enumerate(monsters[:10]):
+                logger.debug(f"  怪物{i+1}: 位置({monster[0]}, {monster[1]}), 置信度: {monster[2]:.3f}")
+        else:
+            logger.debug("未检测到任何怪物名称")
+            logger.debug(f"OCR共识别到 {len(results)} 个文本块，但没有匹配到怪物格式")
+
+        return monsters
 
-        except ImportError:
-            logger.error("EasyOCR未安装，请运行: pip install easyocr")
-            return []
-        except Exception as e:
-            logger.error(f"EasyOCR识别失败: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
-            return []
-    
     def _detect_monsters_with_pytesseract(self, screenshot: Image.Image) -> List[Tuple[int, int, float]]:
         """
         使用pytesseract识别怪物名称
@@ -508,22 +959,8 @@ class MonsterDetector:
                         if not text or conf < 20:
                             continue
                         
-                        # 检查文本是否包含怪物名称关键词
-                        is_monster_name = False
-                        matched_keyword = None
-                        for keyword in self.monster_name_keywords:
-                            if keyword in text:
-                                is_monster_name = True
-                                matched_keyword = keyword
-                                break
-                        
-                        # 也检查是否包含等级信息（如"47级"、"Lv49"等）
-                        level_match = re.search(r'\d+级|Lv\d+', text)
-                        if not is_monster_name and level_match:
-                            # 如果包含等级，检查前后文本是否可能是怪物名称
-                            # 检查文本长度和字符类型
-                            if len(text) > 2:  # 至少3个字符才可能是怪物名称+等级
-                                is_monster_name = True
+                        # 检查文本是否包含怪物名称关键词，或包含等级信息（如"47级"、"Lv49"等）
+                        is_monster_name, _ = self.text_classifier.classify_monster_loose(text)
                         
                         if is_monster_name:
                             # 获取文本位置（需要根据缩放因子调整）
@@ -584,22 +1021,8 @@ class MonsterDetector:
                 all_monsters.append((monster_x, monster_y, confidence))
                 logger.debug(f"检测到怪物名称: '{text}' 位置({monster_x}, {monster_y}), OCR置信度: {conf:.1f}")
             
-            # 去除重复的匹配（基于位置）
-            if all_monsters:
-                filtered_monsters = []
-                for monster in all_monsters:
-                    x, y, conf = monster
-                    is_duplicate = False
-                    for existing in filtered_monsters:
-                        ex, ey, _ = existing
-                        distance = ((x - ex) ** 2 + (y - ey) ** 2) ** 0.5
-                        if distance < 40:  # 如果距离小于40像素，认为是重复
-                            is_duplicate = True
-                            break
-                    if not is_duplicate:
-                        filtered_monsters.append(monster)
-                
-                all_monsters = filtered_monsters
+            # 去除重复的匹配（基于位置，距离小于40像素认为是重复，保留置信度最高的）
+            all_monsters = dedup_detections(all_monsters, 40)
             
             if all_monsters:
                 logger.info(f"通过名称识别检测到 {len(all_monsters)} 个怪物")
@@ -655,25 +1078,8 @@ class MonsterDetector:
                 logger.debug(f"模板 {template} 检测到 {len(matches)} 个匹配")
                 all_matches.extend(matches)
         
-        # 去除重复的匹配（基于位置）
-        if all_matches:
-            # 按置信度排序
-            all_matches.sort(key=lambda x: x[2], reverse=True)
-            # 简单的去重：如果两个匹配位置很近，保留置信度更高的
-            filtered_matches = []
-            for match in all_matches:
-                x, y, conf = match
-                is_duplicate = False
-                for existing in filtered_matches:
-                    ex, ey, _ = existing
-                    distance = ((x - ex) ** 2 + (y - ey) ** 2) ** 0.5
-                    if distance < 20:  # 如果距离小于20像素，认为是重复
-                        is_duplicate = True
-                        break
-                if not is_duplicate:
-                    filtered_matches.append(match)
-            
-            all_matches = filtered_matches
+        # 去除重复的匹配（基于位置）：距离小于20像素认为是重复，保留置信度更高的
+        all_matches = dedup_detections(all_matches, 20)
         
         if all_matches:
             logger.info(f"总共检测到 {len(all_matches)} 个怪物")
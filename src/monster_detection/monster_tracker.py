@@ -0,0 +1,296 @@
+"""
+怪物跟踪模块
+
+把每次扫描得到的匿名怪物列表关联成带持久ID的轨迹：
+- 质心距离关联（贪心，按距离从近到远匹配）
+- 匀速运动预测，并扣除镜头移动（角色移动时画面整体平移）
+- 轨迹确认与过期：OCR（或模板）命中一次即确认，之后用颜色检测等廉价方法维持
+"""
+import time
+import itertools
+from typing import List, Tuple, Optional
+from src.core.config import get_config
+from src.core.logger import get_logger
+from src.core.spatial_index import GridIndex
+
+logger = get_logger(__name__)
+
+# 能够确认轨迹的检测来源（识别出了怪物名称或匹配到怪物模板）
+CONFIRMING_SOURCES = ('ocr', 'template')
+
+
+class MonsterTrack:
+    """单个怪物的轨迹"""
+
+    def __init__(self, track_id: int, x: float, y: float, confidence: float, timestamp: float):
+        """
+        初始化轨迹
+
+        Args:
+            track_id: 轨迹ID
+            x, y: 初始位置（窗口逻辑坐标）
+            confidence: 检测置信度
+            timestamp: 创建时间（time.monotonic）
+        """
+        self.track_id = track_id
+        self.x = float(x)
+        self.y = float(y)
+        self.vx = 0.0
+        self.vy = 0.0
+        self.confidence = confidence
+        self.confirmed = False
+        self.hits = 1
+        self.misses = 0
+        self.created_time = timestamp
+        self.last_seen = timestamp
+
+    def predict(self, dt: float, camera_shift: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        预测当前帧中的位置
+
+        Args:
+            dt: 距离上次更新的时间（秒）
+            camera_shift: 镜头移动量 (dx, dy)，画面内容向相反方向平移
+
+        Returns:
+            预测位置 (x, y)
+        """
+        return (
+            self.x + self.vx * dt - camera_shift[0],
+            self.y + self.vy * dt - camera_shift[1]
+        )
+
+    def as_monster(self) -> Tuple[int, int, float]:
+        """转换为 detect_monsters 的结果格式 (x, y, confidence)"""
+        return (int(round(self.x)), int(round(self.y)), self.confidence)
+
+    def __repr__(self) -> str:
+        state = "confirmed" if self.confirmed else "tentative"
+        return f"MonsterTrack(id={self.track_id}, pos=({self.x:.0f}, {self.y:.0f}), {state})"
+
+
+class MonsterTracker:
+    """多目标怪物跟踪器"""
+
+    def __init__(
+        self,
+        match_distance: Optional[float] = None,
+        max_missed: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        """
+        初始化跟踪器
+
+        Args:
+            match_distance: 关联门限（逻辑像素），如果为None则使用配置中的值
+            max_missed: 已确认轨迹允许连续丢失的次数，如果为None则使用配置中的值
+            max_age: 轨迹最长未被观测的时间（秒），如果为None则使用配置中的值
+        """
+        self.config = get_config()
+        if match_distance is None:
+            match_distance = float(self.config.get('monster.tracking.match_distance', 60))
+        if max_missed is None:
+            max_missed = int(self.config.get('monster.tracking.max_missed', 3))
+        if max_age is None:
+            max_age = float(self.config.get('monster.tracking.max_age_sec', 5.0))
+        self.match_distance = match_distance
+        self.max_missed = max_missed
+        self.max_age = max_age
+        # 速度平滑系数（0-1，越大越相信最新观测）
+        self.velocity_smoothing = float(self.config.get('monster.tracking.velocity_smoothing', 0.5))
+        # 超过该时间没有OCR确认时，需要重新跑一次OCR
+        self.reconfirm_interval = float(self.config.get('monster.tracking.reconfirm_interval_sec', 10.0))
+
+        self.tracks: List[MonsterTrack] = []
+        # 上次OCR否决的待确认位置（颜色误检，如黄色UI文字），在下次OCR前不再建轨迹
+        self._rejected: List[Tuple[float, float]] = []
+        self._next_id = itertools.count(1)
+        self.last_update: Optional[float] = None
+        self.last_confirm_time: Optional[float] = None
+
+    def reset(self):
+        """清空所有轨迹（切换地图等场景）"""
+        self.tracks = []
+        self._rejected = []
+        self.last_update = None
+        self.last_confirm_time = None
+
+    def update(
+        self,
+        detections: List[Tuple[int, int, float]],
+        source: str = 'ocr',
+        camera_shift: Tuple[float, float] = (0.0, 0.0),
+        timestamp: Optional[float] = None
+    ) -> List[MonsterTrack]:
+        """
+        用一帧的检测结果更新轨迹
+
+        Args:
+            detections: 检测结果 [(x, y, confidence), ...]
+            source: 检测来源，'ocr'/'template' 可以确认轨迹，'color' 只能维持已有轨迹
+            camera_shift: 自上次更新以来的镜头移动量 (dx, dy)，逻辑像素
+            timestamp: 当前时间，如果为None则使用 time.monotonic()
+
+        Returns:
+            已确认的轨迹列表
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        dt = 0.0 if self.last_update is None else max(0.0, now - self.last_update)
+        confirming = source in CONFIRMING_SOURCES
+
+        predictions = [track.predict(dt, camera_shift) for track in self.tracks]
+        self._rejected = [(x - camera_shift[0], y - camera_shift[1]) for x, y in self._rejected]
+        rejected_now = []
+
+        # 贪心关联：所有 (轨迹, 检测) 对按距离排序，近的先匹配
+        index = GridIndex(self.match_distance)
+        for dx, dy, _ in detections:
+            index.insert(dx, dy)
+        gate_sq = self.match_distance ** 2
+        pairs = []
+        for ti, (px, py) in enumerate(predictions):
+            for di in index.candidates(px, py):
+                dist_sq = (px - detections[di][0]) ** 2 + (py - detections[di][1]) ** 2
+                if dist_sq <= gate_sq:
+                    pairs.append((dist_sq, ti, di))
+        pairs.sort()
+
+        matched_tracks = set()
+        matched_detections = set()
+        for _, ti, di in pairs:
+            if ti in matched_tracks or di in matched_detections:
+                continue
+            matched_tracks.add(ti)
+            matched_detections.add(di)
+            self._apply_observation(self.tracks[ti], detections[di], dt, camera_shift, now, confirming)
+
+        # 未匹配的轨迹：按预测位置滑动，累计丢失次数
+        survivors = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.x, track.y = predictions[ti]
+                track.misses += 1
+                # 未确认的轨迹丢失一次即删除；已确认的允许短暂遮挡
+                if not track.confirmed:
+                    if confirming:
+                        rejected_now.append(predictions[ti])
+                    logger.debug(f"丢弃未确认轨迹: {track}")
+                    continue
+                if track.misses > self.max_missed or now - track.last_seen > self.max_age:
+                    logger.debug(f"轨迹过期: {track}")
+                    continue
+            survivors.append(track)
+
+        # 未匹配的检测：新建轨迹（廉价检测只建立待确认轨迹）
+        for di, (x, y, conf) in enumerate(detections):
+            if di in matched_detections:
+                continue
+            if not confirming and self._is_rejected(x, y):
+                continue
+            track = MonsterTrack(next(self._next_id), x, y, conf, now)
+            track.confirmed = confirming
+            survivors.append(track)
+
+        self.tracks = survivors
+        self.last_update = now
+        if confirming:
+            self.last_confirm_time = now
+            self._rejected = rejected_now
+
+        confirmed = self.confirmed_tracks()
+        logger.debug(f"跟踪更新({source}): {len(detections)} 个检测, {len(confirmed)}/{len(self.tracks)} 条已确认轨迹")
+        return confirmed
+
+    def _apply_observation(
+        self,
+        track: MonsterTrack,
+        detection: Tuple[int, int, float],
+        dt: float,
+        camera_shift: Tuple[float, float],
+        now: float,
+        confirming: bool
+    ):
+        """用匹配到的检测更新轨迹的位置和速度"""
+        x, y, conf = detection
+        if dt > 0:
+            # 速度只反映怪物自身的移动，扣除镜头移动的部分
+            raw_vx = (x - (track.x - camera_shift[0])) / dt
+            raw_vy = (y - (track.y - camera_shift[1])) / dt
+            a = self.velocity_smoothing
+            track.vx = a * raw_vx + (1 - a) * track.vx
+            track.vy = a * raw_vy + (1 - a) * track.vy
+        track.x = float(x)
+        track.y = float(y)
+        if confirming:
+            track.confidence = conf
+            track.confirmed = True
+        track.hits += 1
+        track.misses = 0
+        track.last_seen = now
+
+    def _is_rejected(self, x: float, y: float) -> bool:
+        gate_sq = self.match_distance ** 2
+        return any((x - rx) ** 2 + (y - ry) ** 2 <= gate_sq for rx, ry in self._rejected)
+
+    def confirmed_tracks(self) -> List[MonsterTrack]:
+        """已确认的轨迹"""
+        return [track for track in self.tracks if track.confirmed]
+
+    def get_monsters(self) -> List[Tuple[int, int, float]]:
+        """
+        获取已确认轨迹的当前位置
+
+        Returns:
+            怪物位置列表 [(x, y, confidence), ...]，格式与 detect_monsters 相同
+        """
+        return self.snapshot()[0]
+
+    def snapshot(self) -> Tuple[List[Tuple[int, int, float]], List[int]]:
+        """
+        同一时刻的已确认怪物位置和对应的轨迹ID
+
+        Returns:
+            (怪物位置列表, 轨迹ID列表)，两者一一对应
+        """
+        tracks = self.confirmed_tracks()
+        return [track.as_monster() for track in tracks], [track.track_id for track in tracks]
+
+    def needs_confirmation(self, timestamp: Optional[float] = None) -> bool:
+        """
+        是否需要运行一次OCR
+
+        没有已确认轨迹、存在待确认轨迹，或距离上次OCR超过 reconfirm_interval 时返回True
+
+        Args:
+            timestamp: 当前时间，如果为None则使用 time.monotonic()
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.last_confirm_time is None or now - self.last_confirm_time > self.reconfirm_interval:
+            return True
+        if not self.confirmed_tracks():
+            return True
+        return any(not track.confirmed for track in self.tracks)
+
+    def remove_near(self, x: float, y: float, radius: Optional[float] = None) -> Optional[MonsterTrack]:
+        """
+        删除距离 (x, y) 最近的轨迹（例如已经交战的怪物）
+
+        Args:
+            x, y: 位置（逻辑坐标）
+            radius: 搜索半径，如果为None则使用关联门限
+
+        Returns:
+            被删除的轨迹，没有找到时返回None
+        """
+        if radius is None:
+            radius = self.match_distance
+        best = None
+        best_dist_sq = radius ** 2
+        for track in self.tracks:
+            dist_sq = (track.x - x) ** 2 + (track.y - y) ** 2
+            if dist_sq <= best_dist_sq:
+                best = track
+                best_dist_sq = dist_sq
+        if best is not None:
+            self.tracks.remove(best)
+        return best
@@ -0,0 +1,125 @@
+"""
+颜色查找表模块
+
+把RGB每个通道量化到5-6位，预先对每个量化颜色计算一次是否落在HSV范围内，
+得到一张布尔查找表；之后每帧只需一次花式索引就能得到颜色掩码，不再做 HSV 转换和 inRange。
+查找表按 (HSV下限, HSV上限, 量化位数) 缓存，配置改变时自动重建。
+"""
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BITS = 5
+
+
+class ColorLUT:
+    """RGB→颜色掩码查找表"""
+
+    def __init__(self, hsv_lower: Sequence[int], hsv_upper: Sequence[int], bits: int = DEFAULT_BITS):
+        """
+        构建查找表
+
+        Args:
+            hsv_lower: HSV下限（OpenCV 取值范围，H为0-179）
+            hsv_upper: HSV上限
+            bits: 每个通道的量化位数（5 或 6）
+        """
+        if not 1 <= bits <= 8:
+            raise ValueError(f"量化位数必须在1-8之间: {bits}")
+        self.bits = bits
+        self.shift = 8 - bits
+        self.hsv_lower = np.array(hsv_lower, dtype=np.uint8)
+        self.hsv_upper = np.array(hsv_upper, dtype=np.uint8)
+
+        # 每个量化区间取中心值作为代表色，计算它的HSV并判断是否在范围内
+        n = 1 << bits
+        levels = (np.arange(n, dtype=np.uint16) << self.shift) + ((1 << self.shift) >> 1)
+        levels = levels.astype(np.uint8)
+        r, g, b = np.meshgrid(levels, levels, levels, indexing='ij')
+        rgb = np.stack([r, g, b], axis=-1).reshape(-1, 1, 3)
+        hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+        inside = cv2.inRange(hsv, self.hsv_lower, self.hsv_upper).reshape(-1)
+        # 表中直接存 0/255，查出来就是 inRange 格式的掩码
+        self.table = inside.astype(np.uint8)
+        logger.debug(f"构建颜色查找表: {bits}位, {n ** 3} 项, 命中 {np.count_nonzero(self.table)} 项")
+
+    def mask(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        计算颜色掩码
+
+        Args:
+            rgb: RGB图像，形状 (H, W, 3)，uint8
+
+        Returns:
+            uint8 掩码，形状 (H, W)，255表示在范围内
+        """
+        if rgb.ndim != 3 or rgb.shape[2] < 3:
+            raise ValueError(f"需要RGB图像，实际形状: {rgb.shape}")
+        # 3*bits 位的索引：5位时用 uint16 即可，减少中间数组的内存带宽
+        index_dtype = np.uint16 if self.bits <= 5 else np.uint32
+        q = (rgb[:, :, :3] >> self.shift).astype(index_dtype)
+        index = (q[:, :, 0] << (2 * self.bits)) | (q[:, :, 1] << self.bits) | q[:, :, 2]
+        return self.table[index]
+
+
+_luts: Dict[Tuple[Tuple[int, ...], Tuple[int, ...], int], ColorLUT] = {}
+_luts_lock = threading.Lock()
+
+
+def get_color_lut(
+    hsv_lower: Sequence[int],
+    hsv_upper: Sequence[int],
+    bits: Optional[int] = None
+) -> ColorLUT:
+    """
+    获取颜色查找表（按参数缓存，参数变化时重建）
+
+    Args:
+        hsv_lower: HSV下限
+        hsv_upper: HSV上限
+        bits: 量化位数，如果为None则使用配置 color_lut.bits
+
+    Returns:
+        ColorLUT实例
+    """
+    if bits is None:
+        bits = int(get_config().get('color_lut.bits', DEFAULT_BITS))
+    key = (tuple(int(v) for v in hsv_lower), tuple(int(v) for v in hsv_upper), bits)
+    lut = _luts.get(key)
+    if lut is None:
+        with _luts_lock:
+            lut = _luts.get(key)
+            if lut is None:
+                lut = ColorLUT(key[0], key[1], bits)
+                _luts[key] = lut
+    return lut
+
+
+def color_mask(
+    rgb: np.ndarray,
+    hsv_lower: Sequence[int],
+    hsv_upper: Sequence[int]
+) -> np.ndarray:
+    """
+    计算RGB图像在HSV范围内的掩码
+
+    启用查找表（配置 color_lut.enabled）时使用 ColorLUT，否则使用 cvtColor + inRange。
+    哪种更快取决于机器，可用 tools/benchmark_color_lut.py 测量。
+
+    Args:
+        rgb: RGB图像，形状 (H, W, 3)，uint8
+        hsv_lower: HSV下限
+        hsv_upper: HSV上限
+
+    Returns:
+        uint8 掩码，255表示在范围内
+    """
+    if get_config().get('color_lut.enabled', False):
+        return get_color_lut(hsv_lower, hsv_upper).mask(rgb)
+    hsv = cv2.cvtColor(np.ascontiguousarray(rgb[:, :, :3]), cv2.COLOR_RGB2HSV)
+    return cv2.inRange(hsv, np.array(hsv_lower, dtype=np.uint8), np.array(hsv_upper, dtype=np.uint8))
@@ -8,6 +8,7 @@ from typing import Tuple, Optional, List
 from pathlib import Path
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.core.spatial_index import GridIndex
 
 logger = get_logger(__name__)
 
@@ -342,44 +343,34 @@ class ImageMatcher:
         
         # 按置信度排序（应该已经排序了，但确保一下）
         matches = sorted(matches, key=lambda x: x[2], reverse=True)
-        
+
+        # 如果两个框的中心距离小于模板尺寸的60%，才进一步计算重叠区域；
+        # 网格单元格取这个距离，只需检查相邻单元格里已保留的匹配
+        min_distance = min(template_w, template_h) * 0.6
+        template_area = template_w * template_h
+        half_w, half_h = template_w // 2, template_h // 2
+        index = GridIndex(min_distance)
+
         filtered = []
         for match in matches:
             x, y, conf = match
-            
+
             # 检查是否与已有匹配重叠
             overlap = False
-            for existing in filtered:
-                ex, ey, _ = existing
-                
-                # 计算两个匹配框的距离
-                # 匹配框的中心是(x, y)，大小是template_w x template_h
-                # 计算两个框的最小距离
+            for i in index.candidates(x, y):
+                ex, ey, _ = filtered[i]
                 dx = abs(x - ex)
                 dy = abs(y - ey)
-                
-                # 如果两个框的中心距离小于模板尺寸的一半，认为是重叠
-                # 使用更严格的距离判断
-                min_distance = min(template_w, template_h) * 0.6  # 更严格：60%的模板尺寸
                 if dx < min_distance and dy < min_distance:
-                    # 进一步计算重叠区域
-                    # 匹配框的边界
-                    x1_min, x1_max = x - template_w // 2, x + template_w // 2
-                    y1_min, y1_max = y - template_h // 2, y + template_h // 2
-                    x2_min, x2_max = ex - template_w // 2, ex + template_w // 2
-                    y2_min, y2_max = ey - template_h // 2, ey + template_h // 2
-                    
-                    # 计算重叠区域
-                    overlap_x = max(0, min(x1_max, x2_max) - max(x1_min, x2_min))
-                    overlap_y = max(0, min(y1_max, y2_max) - max(y1_min, y2_min))
-                    overlap_area = overlap_x * overlap_y
-                    template_area = template_w * template_h
-                    
-                    if overlap_area / template_area > overlap_threshold:
+                    # 匹配框的中心是(x, y)，大小是template_w x template_h，计算重叠区域
+                    overlap_x = max(0, min(x + half_w, ex + half_w) - max(x - half_w, ex - half_w))
+                    overlap_y = max(0, min(y + half_h, ey + half_h) - max(y - half_h, ey - half_h))
+                    if overlap_x * overlap_y / template_area > overlap_threshold:
                         overlap = True
                         break
-            
+
             if not overlap:
+                index.insert(x, y)
                 filtered.append(match)
-        
+
         return filtered
@@ -1,17 +1,38 @@
 """
 鼠标控制模块
+
+pyautogui 导入较慢，推迟到第一次鼠标操作（或后台预热）时才加载
 """
-import pyautogui
 import time
+import threading
 from typing import Tuple
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.core.startup import timed_import
 
 logger = get_logger(__name__)
 
-# 设置pyautogui的安全设置
-pyautogui.FAILSAFE = True  # 鼠标移到屏幕左上角会触发异常
-pyautogui.PAUSE = 0.1  # 每次操作后暂停0.1秒
+_pyautogui = None
+_pyautogui_lock = threading.Lock()
+
+
+def load_pyautogui():
+    """
+    加载并配置 pyautogui（只加载一次）
+
+    Returns:
+        pyautogui 模块
+    """
+    global _pyautogui
+    if _pyautogui is None:
+        with _pyautogui_lock:
+            if _pyautogui is None:
+                module = timed_import('pyautogui')
+                # 设置pyautogui的安全设置
+                module.FAILSAFE = True  # 鼠标移到屏幕左上角会触发异常
+                module.PAUSE = 0.1  # 每次操作后暂停0.1秒
+                _pyautogui = module
+    return _pyautogui
 
 
 class MouseControl:
@@ -73,7 +94,7 @@ class MouseControl:
         
         try:
             logger.info(f"点击坐标: 游戏内({x}, {y}) -> 屏幕坐标: ({screen_x}, {screen_y})")
-            pyautogui.click(screen_x, screen_y, button=button)
+            load_pyautogui().click(screen_x, screen_y, button=button)
             if delay > 0:
                 time.sleep(delay)
         except Exception as e:
@@ -90,7 +111,7 @@ class MouseControl:
         """
         screen_x, screen_y = self._to_screen_coords(x, y)
         try:
-            pyautogui.moveTo(screen_x, screen_y)
+            load_pyautogui().moveTo(screen_x, screen_y)
         except Exception as e:
             logger.error(f"移动鼠标失败: {e}")
             raise
@@ -110,7 +131,7 @@ class MouseControl:
         end_screen = self._to_screen_coords(end_x, end_y)
         
         try:
-            pyautogui.drag(
+            load_pyautogui().drag(
                 end_screen[0] - start_screen[0],
                 end_screen[1] - start_screen[1],
                 duration=duration,
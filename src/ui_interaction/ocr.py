@@ -1,16 +1,61 @@
 """
 OCR文本识别模块
+
+pytesseract 和 EasyOCR（依赖 torch）都在首次使用时才导入，
+可以通过 OCR.warm_up 在后台线程中提前加载。
 """
-import pytesseract
 from PIL import Image
 import cv2
 import numpy as np
-from typing import Optional
+import threading
+import time
+from typing import Optional, List, Tuple, Any
 from src.core.config import get_config
 from src.core.logger import get_logger
+from src.core.startup import timed_import
 
 logger = get_logger(__name__)
 
+# 预处理档位，按耗时从低到高排列
+PREPROCESS_PROFILES = ('none', 'fast', 'balanced', 'quality')
+DEFAULT_PREPROCESS_PROFILE = 'quality'
+
+_SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                            [-1,  9, -1],
+                            [-1, -1, -1]], dtype=np.float32)
+
+# EasyOCR Reader 按 gpu 开关缓存，同一进程内共享（模型加载很慢）
+_easyocr_readers = {}
+_easyocr_lock = threading.Lock()
+
+
+def get_easyocr_reader(gpu: bool = False):
+    """
+    获取共享的EasyOCR Reader（首次调用时加载模型）
+
+    Args:
+        gpu: 是否使用GPU加速
+
+    Returns:
+        easyocr.Reader实例
+
+    Raises:
+        ImportError: EasyOCR未安装
+    """
+    reader = _easyocr_readers.get(gpu)
+    if reader is not None:
+        return reader
+    with _easyocr_lock:
+        reader = _easyocr_readers.get(gpu)
+        if reader is None:
+            easyocr = timed_import('easyocr')
+            start = time.perf_counter()
+            logger.debug(f"初始化EasyOCR (gpu={gpu})...")
+            reader = easyocr.Reader(['ch_sim', 'en'], gpu=gpu)
+            _easyocr_readers[gpu] = reader
+            logger.info(f"EasyOCR模型加载完成 (gpu={gpu})，耗时: {time.perf_counter() - start:.2f}秒")
+    return reader
+
 
 class OCR:
     """OCR文本识别类"""
@@ -20,6 +65,11 @@ class OCR:
         self.config = get_config()
         self.engine = self.config.get('recognition.ocr.engine', 'pytesseract')
         self.lang = self.config.get('recognition.ocr.lang', 'chi_sim')
+        # 默认预处理档位（调用方可以按调用点单独指定）
+        self.preprocess_profile = self.config.get(
+            'recognition.ocr.preprocess_profile', DEFAULT_PREPROCESS_PROFILE
+        )
+        self.gpu = bool(self.config.get('recognition.ocr.gpu', True))
         
         # 配置pytesseract（如果需要）
         if self.engine == 'pytesseract':
@@ -27,62 +77,111 @@ class OCR:
             # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
             pass
     
-    def _preprocess_image(self, image: Image.Image, scale_factor: float = 2.0) -> np.ndarray:
+    def warm_up(self):
+        """预先加载当前引擎（在后台线程中调用，避免首次识别卡顿）"""
+        if self.engine == 'easyocr':
+            get_easyocr_reader(self.gpu)
+        elif self.engine == 'pytesseract':
+            timed_import('pytesseract')
+
+    def _binarize(self, gray: np.ndarray) -> np.ndarray:
+        """
+        OTSU二值化，过亮/过暗时回退到固定阈值
+
+        Args:
+            gray: 灰度图
+
+        Returns:
+            二值图
+        """
+        # 二值化 - 使用OTSU自适应阈值（通常效果最好）
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        # 如果OTSU效果不好，尝试固定阈值
+        # 计算平均亮度
+        mean_brightness = np.mean(binary)
+        if mean_brightness > 240:  # 图像很亮，可能是白底黑字
+            _, binary = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
+        elif mean_brightness < 15:  # 图像很暗，可能是黑底白字
+            _, binary = cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY_INV)
+        return binary
+
+    def _preprocess_image(
+        self,
+        image: Image.Image,
+        scale_factor: float = 2.0,
+        profile: Optional[str] = None
+    ) -> np.ndarray:
         """
         预处理图像以提高OCR准确率
-        
+
+        档位说明（耗时从低到高）：
+        - 'none': 只转灰度
+        - 'fast': 线性插值放大 + OTSU二值化
+        - 'balanced': 三次插值放大 + 锐化 + CLAHE + OTSU二值化
+        - 'quality': LANCZOS放大 + 锐化 + CLAHE + OTSU二值化 + 非局部均值降噪（很慢）
+
         Args:
             image: PIL Image对象
             scale_factor: 图像放大倍数（小图像需要放大以提高识别率）
-        
+            profile: 预处理档位，如果为None则使用配置中的值
+
         Returns:
             处理后的OpenCV图像数组
         """
-        # 转换为OpenCV格式
-        img = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        
+        if profile is None:
+            profile = self.preprocess_profile
+        if profile not in PREPROCESS_PROFILES:
+            logger.warning(f"未知的OCR预处理档位: {profile}，使用 {DEFAULT_PREPROCESS_PROFILE}")
+            profile = DEFAULT_PREPROCESS_PROFILE
+
         # 转换为灰度图
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # 如果图像太小，先放大（使用更高质量的插值）
+        img = np.array(image)
+        if img.ndim == 3:
+            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = img
+
+        if profile == 'none':
+            return gray
+
+        # 如果图像太小，先放大
         height, width = gray.shape
         if width < 100 or height < 30:
             new_width = int(width * scale_factor)
             new_height = int(height * scale_factor)
-            # 使用LANCZOS插值，质量更好但速度稍慢
-            gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
-        
+            interpolation = {
+                'fast': cv2.INTER_LINEAR,
+                'balanced': cv2.INTER_CUBIC,
+                'quality': cv2.INTER_LANCZOS4,  # 质量更好但速度稍慢
+            }[profile]
+            gray = cv2.resize(gray, (new_width, new_height), interpolation=interpolation)
+
+        if profile == 'fast':
+            return self._binarize(gray)
+
         # 轻微锐化（提高清晰度，但不过度）
-        kernel_sharpen = np.array([[-1, -1, -1],
-                                   [-1,  9, -1],
-                                   [-1, -1, -1]]) / 1.0
-        gray = cv2.filter2D(gray, -1, kernel_sharpen)
-        
+        gray = cv2.filter2D(gray, -1, _SHARPEN_KERNEL)
+
         # 增强对比度（降低强度，减少过度处理）
-        clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))  # 降低clipLimit
+        clahe = cv2.createCLAHE(clipLimit=1.5, tileGridSize=(8, 8))
         gray = clahe.apply(gray)
-        
-        # 二值化 - 使用OTSU自适应阈值（通常效果最好）
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # 如果OTSU效果不好，尝试固定阈值
-        # 计算平均亮度
-        mean_brightness = np.mean(binary)
-        if mean_brightness > 240:  # 图像很亮，可能是白底黑字
-            _, binary = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-        elif mean_brightness < 15:  # 图像很暗，可能是黑底白字
-            _, binary = cv2.threshold(gray, 50, 255, cv2.THRESH_BINARY_INV)
-        
-        # 轻度降噪（减少参数，避免过度模糊）
-        binary = cv2.fastNlMeansDenoising(binary, None, h=5, templateWindowSize=7, searchWindowSize=21)
-        
-        # 形态学操作：轻微处理，去除小噪点（使用更小的核）
-        kernel = np.ones((1, 1), np.uint8)  # 减小核大小
-        binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
-        
+
+        binary = self._binarize(gray)
+
+        if profile == 'quality':
+            # 轻度降噪（耗时最多的一步，只在quality档位执行）
+            binary = cv2.fastNlMeansDenoising(binary, None, h=5, templateWindowSize=7, searchWindowSize=21)
+
         return binary
     
-    def recognize(self, image: Image.Image, lang: Optional[str] = None, save_debug: bool = False) -> str:
+    def recognize(
+        self,
+        image: Image.Image,
+        lang: Optional[str] = None,
+        save_debug: bool = False,
+        profile: Optional[str] = None
+    ) -> str:
         """
         识别图像中的文本
         
@@ -90,6 +189,8 @@ class OCR:
             image: PIL Image对象
             lang: 语言代码，如果为None则使用配置中的值
             save_debug: 是否保存预处理后的图像用于调试
+            profile: 预处理档位（none/fast/balanced/quality），如果为None则：
+                     pytesseract 使用配置中的档位，EasyOCR 不做预处理
         
         Returns:
             识别的文本字符串
@@ -99,8 +200,10 @@ class OCR:
         
         try:
             if self.engine == 'pytesseract':
+                pytesseract = timed_import('pytesseract')
+
                 # 预处理图像
-                processed = self._preprocess_image(image)
+                processed = self._preprocess_image(image, profile=profile)
                 
                 # 保存调试图像
                 if save_debug:
@@ -150,19 +253,7 @@ class OCR:
             elif self.engine == 'easyocr':
                 # 使用EasyOCR识别
                 try:
-                    import easyocr
-                    import numpy as np
-                    
-                    # 初始化easyocr（只初始化一次）
-                    if not hasattr(self, '_easyocr_reader'):
-                        logger.debug("初始化EasyOCR...")
-                        self._easyocr_reader = easyocr.Reader(['ch_sim', 'en'], gpu=False)
-                    
-                    # 转换为numpy数组
-                    img_array = np.array(image)
-                    
-                    # 使用easyocr识别
-                    results = self._easyocr_reader.readtext(img_array)
+                    results = self.readtext(image, profile=profile)
                     
                     # 合并所有识别到的文本
                     texts = []
@@ -188,6 +279,144 @@ class OCR:
             logger.debug(traceback.format_exc())
             return ""
     
+    def readtext(self, image: Image.Image, profile: Optional[str] = None) -> List[Tuple[Any, str, float]]:
+        """
+        使用EasyOCR检测并识别图像中的所有文本块
+
+        Args:
+            image: PIL Image对象
+            profile: 预处理档位，如果为None则不做预处理
+
+        Returns:
+            EasyOCR原始结果列表，每个元素是 (bbox, text, confidence) 元组
+            bbox是四个点的坐标，相对于输入图像
+
+        Raises:
+            ImportError: EasyOCR未安装
+        """
+        reader = get_easyocr_reader(self.gpu)
+        if profile is not None:
+            img_array = self._preprocess_image(image, profile=profile)
+        else:
+            img_array = np.array(image)
+        return reader.readtext(img_array)
+
+    def recognize_batch(
+        self,
+        crops: List[Image.Image],
+        profile: Optional[str] = None,
+        height_tolerance: float = 0.25
+    ) -> List[Tuple[str, float]]:
+        """
+        批量识别多个独立的小区域（只运行识别网络，不做文字检测）
+
+        高度相近的裁剪图会被纵向拼接到同一张画布上，在一次批量前向中完成识别，
+        减少逐个调用引擎的开销和批内补齐浪费。
+
+        Args:
+            crops: 裁剪图列表
+            profile: 预处理档位，如果为None则只转灰度
+            height_tolerance: 同组内允许的高度差比例
+
+        Returns:
+            与 crops 顺序一一对应的 (text, confidence) 列表，识别失败时为 ("", 0.0)
+        """
+        results: List[Tuple[str, float]] = [("", 0.0)] * len(crops)
+        if not crops:
+            return results
+
+        if self.engine != 'easyocr':
+            for i, crop in enumerate(crops):
+                results[i] = self._recognize_with_confidence(crop, profile)
+            return results
+
+        try:
+            reader = get_easyocr_reader(self.gpu)
+        except ImportError:
+            logger.error("EasyOCR未安装，请运行: pip install easyocr")
+            return results
+
+        grays = [self._preprocess_image(crop, profile=profile or 'none') for crop in crops]
+
+        # 按高度排序后分组：组内最大高度不超过最小高度的 (1 + height_tolerance) 倍
+        order = sorted(range(len(grays)), key=lambda i: grays[i].shape[0])
+        groups: List[List[int]] = []
+        for i in order:
+            if groups and grays[i].shape[0] <= grays[groups[-1][0]].shape[0] * (1 + height_tolerance):
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+
+        gap = 4  # 画布上各裁剪图之间的间隔
+        for group in groups:
+            canvas_w = max(grays[i].shape[1] for i in group)
+            canvas_h = sum(grays[i].shape[0] for i in group) + gap * (len(group) - 1)
+            canvas = np.zeros((canvas_h, canvas_w), dtype=np.uint8)
+
+            horizontal_list = []
+            index_by_top = {}
+            y = 0
+            for i in group:
+                h, w = grays[i].shape[:2]
+                canvas[y:y + h, :w] = grays[i]
+                horizontal_list.append([0, w, y, y + h])
+                index_by_top[y] = i
+                y += h + gap
+
+            try:
+                batch = reader.recognize(
+                    canvas,
+                    horizontal_list=horizontal_list,
+                    free_list=[],
+                    batch_size=len(group)
+                )
+            except Exception as e:
+                logger.error(f"EasyOCR批量识别失败: {e}")
+                continue
+
+            # 结果按框的上边界对应回原始顺序（过小的框可能被EasyOCR跳过）
+            for (bbox, text, conf) in batch:
+                i = index_by_top.get(int(round(bbox[0][1])))
+                if i is not None:
+                    results[i] = (text, float(conf))
+
+        logger.debug(f"批量识别 {len(crops)} 个区域，分 {len(groups)} 组: {results}")
+        return results
+
+    def _recognize_with_confidence(self, image: Image.Image, profile: Optional[str] = None) -> Tuple[str, float]:
+        """
+        pytesseract 单行识别并返回平均置信度
+
+        Args:
+            image: PIL Image对象
+            profile: 预处理档位，如果为None则使用配置中的值
+
+        Returns:
+            (text, confidence)，置信度范围 0-1
+        """
+        try:
+            pytesseract = timed_import('pytesseract')
+            processed = Image.fromarray(self._preprocess_image(image, profile=profile))
+            data = pytesseract.image_to_data(
+                processed,
+                lang=self.lang,
+                config='--psm 7',
+                output_type=pytesseract.Output.DICT
+            )
+            words = []
+            confs = []
+            for text, conf in zip(data['text'], data['conf']):
+                conf = float(conf)
+                if text.strip() and conf >= 0:
+                    words.append(text.strip())
+                    confs.append(conf)
+            if not words:
+                return ("", 0.0)
+            return (' '.join(words), sum(confs) / len(confs) / 100.0)
+        except Exception as e:
+            logger.error(f"OCR识别失败: {e}")
+            return ("", 0.0)
+
     def recognize_number(self, image: Image.Image) -> Optional[int]:
         """
         识别图像中的数字
@@ -0,0 +1,152 @@
+"""
+异步OCR执行器
+
+把OCR放到独立的工作进程中执行，调用方立即拿到 Future，
+需要结果时再 result()，状态机线程不再被 readtext 阻塞。
+每个工作进程各自持有一份OCR模型。
+"""
+import os
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, List, Tuple, Any
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 工作进程内的OCR实例（每个进程一份）
+_worker_ocr = None
+
+
+def _init_worker(threads_per_worker: int, config_path: Optional[str] = None):
+    """工作进程初始化：限制线程数、加载主进程使用的配置文件并加载OCR模型"""
+    global _worker_ocr
+    if threads_per_worker > 0:
+        # 必须在 torch 导入之前设置，避免多个进程争抢所有核心
+        os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+        os.environ['MKL_NUM_THREADS'] = str(threads_per_worker)
+
+    # spawn 出的进程没有主进程的配置单例：先按同一路径加载，OCR() 才会使用相同的引擎/gpu/预处理配置
+    get_config(config_path)
+
+    from src.ui_interaction.ocr import OCR, get_easyocr_reader
+    _worker_ocr = OCR()
+    if _worker_ocr.engine == 'easyocr':
+        try:
+            get_easyocr_reader(_worker_ocr.gpu)
+        except ImportError:
+            logger.error("EasyOCR未安装，请运行: pip install easyocr")
+
+
+def _get_worker_ocr():
+    """获取当前进程的OCR实例（内联模式下在主进程中懒加载）"""
+    global _worker_ocr
+    if _worker_ocr is None:
+        from src.ui_interaction.ocr import OCR
+        _worker_ocr = OCR()
+    return _worker_ocr
+
+
+def _ping_task() -> int:
+    """空任务，用于触发工作进程启动"""
+    return os.getpid()
+
+
+def _recognize_task(crop: np.ndarray, profile: Optional[str]) -> str:
+    """工作进程任务：识别裁剪区域的文本"""
+    return _get_worker_ocr().recognize(Image.fromarray(crop), profile=profile)
+
+
+def _readtext_task(image: np.ndarray, profile: Optional[str]) -> List[Tuple[Any, str, float]]:
+    """工作进程任务：检测并识别所有文本块"""
+    results = _get_worker_ocr().readtext(Image.fromarray(image), profile=profile)
+    # bbox 中可能是 numpy 整数，转成普通 float 便于跨进程传输
+    return [
+        ([[float(p[0]), float(p[1])] for p in bbox], text, float(conf))
+        for (bbox, text, conf) in results
+    ]
+
+
+class OCRExecutor:
+    """OCR进程池执行器"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        初始化OCR执行器
+
+        Args:
+            max_workers: 工作进程数，如果为None则使用配置中的值；
+                         为0时在调用线程内同步执行（返回已完成的 Future）
+        """
+        self.config = get_config()
+        if max_workers is None:
+            max_workers = int(self.config.get('recognition.ocr.workers', 0))
+        self.max_workers = max(0, max_workers)
+        self.threads_per_worker = int(self.config.get('recognition.ocr.threads_per_worker', 0))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        """懒创建进程池（spawn 方式，避免 fork 带入截图/GUI句柄）"""
+        if self._pool is None:
+            logger.info(f"启动OCR进程池: {self.max_workers} 个工作进程")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.threads_per_worker, str(self.config.config_path))
+            )
+        return self._pool
+
+    def _submit(self, fn, *args) -> Future:
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._ensure_pool().submit(fn, *args)
+
+    def submit(self, crop: Image.Image, profile: Optional[str] = None) -> Future:
+        """
+        提交一次文本识别
+
+        Args:
+            crop: 要识别的图像区域
+            profile: 预处理档位，如果为None则使用OCR的默认行为
+
+        Returns:
+            Future，结果为识别到的文本字符串
+        """
+        return self._submit(_recognize_task, np.asarray(crop), profile)
+
+    def submit_readtext(self, image: Image.Image, profile: Optional[str] = None) -> Future:
+        """
+        提交一次文本检测+识别（EasyOCR readtext）
+
+        Args:
+            image: 要识别的图像
+            profile: 预处理档位，如果为None则不做预处理
+
+        Returns:
+            Future，结果为 [(bbox, text, confidence), ...]，坐标相对于输入图像
+        """
+        return self._submit(_readtext_task, np.asarray(image), profile)
+
+    def warm_up(self):
+        """启动所有工作进程并等待模型加载完成（在后台线程中调用）"""
+        if self.max_workers == 0:
+            return
+        pool = self._ensure_pool()
+        futures = [pool.submit(_ping_task) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def shutdown(self, wait: bool = True):
+        """关闭进程池"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+            logger.info("OCR进程池已关闭")
@@ -0,0 +1,135 @@
+"""
+UI锚点模板匹配模块
+
+固定UI元素（战斗按钮、地图界面标志）总是出现在窗口的同一位置附近，
+因此只在配置的搜索区域内匹配模板；第一次匹配成功后记住锚点位置，
+之后只在锚点周围的小窗口内匹配，每次只需处理几千个像素。
+模板文件不存在时锚点标记为不可用，调用方据此回退到其他检测方法。
+"""
+from pathlib import Path
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TemplateAnchor:
+    """在限定区域内匹配的UI锚点模板"""
+
+    def __init__(
+        self,
+        name: str,
+        template_path: str,
+        matcher,
+        region: Optional[dict] = None,
+        threshold: float = 0.7,
+        search_margin: int = 20
+    ):
+        """
+        初始化锚点并加载模板
+
+        Args:
+            name: 锚点名称（用于日志）
+            template_path: 模板文件路径（相对路径以 templates/ 为根）
+            matcher: ImageMatcher 实例（用于加载模板）
+            region: 搜索区域（逻辑坐标，left/top/width/height），为None时搜索整个截图
+            threshold: 匹配阈值
+            search_margin: 锚点缓存后，在锚点周围扩展的搜索边距（逻辑像素）
+        """
+        self.name = name
+        self.template_path = template_path
+        self.region = dict(region) if region else None
+        self.threshold = threshold
+        self.search_margin = search_margin
+        # 锚点左上角（逻辑坐标），第一次匹配成功后记录
+        self.anchor: Optional[Tuple[float, float]] = None
+
+        self.template: Optional[np.ndarray] = None
+        path = Path(template_path)
+        if not path.is_absolute():
+            path = matcher.template_dir / path
+        if not path.exists():
+            logger.info(f"锚点模板 {name} 不存在（{path}），将回退到其他检测方法")
+            return
+        try:
+            template = matcher._load_template(str(path))
+            self.template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+        except (FileNotFoundError, ValueError):
+            logger.warning(f"锚点模板 {name} 无法加载（{path}），将回退到其他检测方法")
+
+    @property
+    def available(self) -> bool:
+        """模板是否已加载"""
+        return self.template is not None
+
+    def _search_window(self, image_size: Tuple[int, int], scale: Tuple[float, float]) -> Tuple[int, int, int, int]:
+        """当前的搜索窗口（物理像素，左闭右开）"""
+        image_width, image_height = image_size
+        scale_x, scale_y = scale
+        th, tw = self.template.shape[:2]
+
+        if self.anchor is not None:
+            margin_x = self.search_margin * scale_x
+            margin_y = self.search_margin * scale_y
+            x0 = self.anchor[0] * scale_x - margin_x
+            y0 = self.anchor[1] * scale_y - margin_y
+            x1 = self.anchor[0] * scale_x + tw + margin_x
+            y1 = self.anchor[1] * scale_y + th + margin_y
+        elif self.region is not None:
+            x0 = self.region.get('left', 0) * scale_x
+            y0 = self.region.get('top', 0) * scale_y
+            x1 = x0 + self.region.get('width', image_width / scale_x) * scale_x
+            y1 = y0 + self.region.get('height', image_height / scale_y) * scale_y
+        else:
+            return (0, 0, image_width, image_height)
+
+        x0 = max(0, int(x0))
+        y0 = max(0, int(y0))
+        x1 = min(image_width, int(np.ceil(x1)))
+        y1 = min(image_height, int(np.ceil(y1)))
+        return (x0, y0, x1, y1)
+
+    def find(self, screenshot: Image.Image, window_size: Tuple[int, int]) -> Optional[bool]:
+        """
+        在搜索窗口内匹配模板
+
+        Args:
+            screenshot: 窗口截图（物理像素）
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+
+        Returns:
+            True=找到，False=没找到，None=模板不可用
+        """
+        if self.template is None:
+            return None
+
+        image_width, image_height = screenshot.size
+        scale_x = image_width / window_size[0] if window_size[0] > 0 else 1.0
+        scale_y = image_height / window_size[1] if window_size[1] > 0 else 1.0
+        x0, y0, x1, y1 = self._search_window((image_width, image_height), (scale_x, scale_y))
+
+        th, tw = self.template.shape[:2]
+        if x1 - x0 < tw or y1 - y0 < th:
+            logger.debug(f"锚点 {self.name} 的搜索窗口小于模板: ({x0}, {y0})-({x1}, {y1})")
+            return False
+
+        # 只转换搜索窗口内的像素
+        window = np.asarray(screenshot.crop((x0, y0, x1, y1)).convert('L'))
+        result = cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val < self.threshold:
+            logger.debug(f"锚点 {self.name} 未匹配: {max_val:.3f} < {self.threshold}")
+            return False
+
+        if self.anchor is None:
+            self.anchor = ((x0 + max_loc[0]) / scale_x, (y0 + max_loc[1]) / scale_y)
+            logger.info(f"锚点 {self.name} 位置已缓存: ({self.anchor[0]:.0f}, {self.anchor[1]:.0f})")
+        logger.debug(f"锚点 {self.name} 匹配: {max_val:.3f}")
+        return True
+
+    def reset(self):
+        """清除缓存的锚点位置（窗口移动或界面布局改变时调用）"""
+        self.anchor = None
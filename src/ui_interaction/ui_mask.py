@@ -0,0 +1,248 @@
+"""
+UI区域排除掩码模块
+
+把已知的UI区域（小地图、战斗按钮、探索度文字、顶部/底部HUD）预先画成一张掩码，
+每种窗口几何（截图尺寸 + 窗口逻辑尺寸）只构建一次；检测前用一次按位与把这些像素清零，
+各检测器不再在UI像素上浪费计算，也不必各自硬编码排除条件。
+
+区域配置（逻辑坐标）：
+    name:
+      left / top / width / height   # width/height 为0或省略时延伸到窗口边缘
+      anchor: top_left              # 相对窗口的哪个角：top_left / top_right / bottom_left / bottom_right
+      ref: "combat.detection_region"  # 可选：直接引用其他配置中的区域（left/top/width/height）
+      margin: 0                     # 可选：向外扩展的像素
+"""
+import threading
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ANCHORS = ('top_left', 'top_right', 'bottom_left', 'bottom_right')
+
+# 未配置 ui_mask.regions 时使用的默认区域（与原先颜色检测中的硬编码排除条件一致）
+DEFAULT_REGIONS = {
+    'hud_top': {'left': 0, 'top': 0, 'height': 50},
+    'hud_bottom': {'anchor': 'bottom_left', 'left': 0, 'top': 0, 'height': 100},
+    'minimap': {'anchor': 'top_right', 'left': 0, 'top': 0, 'width': 150, 'height': 150},
+}
+
+
+class UIMask:
+    """UI区域排除掩码"""
+
+    def __init__(self):
+        """初始化UI掩码（掩码本身在第一次使用时按截图尺寸构建）"""
+        self.config = get_config()
+        self.enabled = bool(self.config.get('ui_mask.enabled', True))
+        self._masks: Dict[Tuple[int, int, int, int], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _resolve_region(
+        self,
+        name: str,
+        spec: dict,
+        window_size: Tuple[int, int],
+        with_margin: bool = True
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        把区域配置换算为窗口逻辑坐标的矩形
+
+        Args:
+            with_margin: 是否向外扩展 margin（保留区域只保留查询本身需要的矩形，不扩展）
+
+        Returns:
+            (x0, y0, x1, y1)，配置无效时返回None
+        """
+        window_width, window_height = window_size
+        if spec.get('ref'):
+            ref = self.config.get(spec['ref'])
+            if not isinstance(ref, dict):
+                logger.warning(f"UI掩码区域 {name} 引用的配置不存在: {spec['ref']}")
+                return None
+            spec = dict(ref, **{k: v for k, v in spec.items() if k != 'ref'})
+
+        anchor = spec.get('anchor', 'top_left')
+        if anchor not in ANCHORS:
+            logger.warning(f"UI掩码区域 {name} 的 anchor 无效: {anchor}")
+            return None
+
+        left = int(spec.get('left', 0))
+        top = int(spec.get('top', 0))
+        width = int(spec.get('width', 0) or 0)
+        height = int(spec.get('height', 0) or 0)
+        margin = int(spec.get('margin', 0)) if with_margin else 0
+
+        # 宽高为0时延伸到窗口边缘
+        if width <= 0:
+            width = window_width - left
+        if height <= 0:
+            height = window_height - top
+
+        x0 = window_width - left - width if anchor.endswith('right') else left
+        y0 = window_height - top - height if anchor.startswith('bottom') else top
+        return (x0 - margin, y0 - margin, x0 + width + margin, y0 + height + margin)
+
+    def _build(
+        self,
+        image_size: Tuple[int, int],
+        window_size: Tuple[int, int],
+        keep: Tuple[str, ...] = ()
+    ) -> np.ndarray:
+        """
+        构建物理像素尺寸的掩码（255=保留，0=排除），keep 中的区域最后重新置为保留
+
+        keep 区域不扩展 margin：它们常落在小地图等其他排除区域内部，只放开查询本身的矩形
+        """
+        image_width, image_height = image_size
+        window_width, window_height = window_size
+        scale_x = image_width / window_width if window_width > 0 else 1.0
+        scale_y = image_height / window_height if window_height > 0 else 1.0
+
+        regions = self.config.get('ui_mask.regions')
+        if not isinstance(regions, dict):
+            regions = DEFAULT_REGIONS
+
+        mask = np.full((image_height, image_width), 255, dtype=np.uint8)
+        # 先排除所有区域，再把 keep 中的区域重新置为保留（它们可能与HUD等区域重叠）
+        ordered = [(name, 0) for name in regions if name not in keep] + [(name, 255) for name in keep if name in regions]
+        for name, value in ordered:
+            spec = regions[name]
+            if not isinstance(spec, dict):
+                continue
+            rect = self._resolve_region(name, spec, window_size, with_margin=(value == 0))
+            if rect is None:
+                continue
+            x0, y0, x1, y1 = rect
+            px0 = max(0, int(x0 * scale_x))
+            py0 = max(0, int(y0 * scale_y))
+            px1 = min(image_width, int(np.ceil(x1 * scale_x)))
+            py1 = min(image_height, int(np.ceil(y1 * scale_y)))
+            if px1 > px0 and py1 > py0:
+                mask[py0:py1, px0:px1] = value
+                logger.debug(f"UI掩码区域 {name}{'（保留）' if value else ''}: 逻辑({x0}, {y0})-({x1}, {y1})")
+
+        excluded = 1.0 - np.count_nonzero(mask) / mask.size
+        logger.info(f"构建UI掩码: {image_width}x{image_height}，排除 {excluded:.1%} 的像素")
+        return mask
+
+    def get_mask(
+        self,
+        image_size: Tuple[int, int],
+        window_size: Tuple[int, int],
+        keep: Tuple[str, ...] = ()
+    ) -> np.ndarray:
+        """
+        获取掩码（按几何缓存）
+
+        Args:
+            image_size: 截图尺寸 (width, height)，物理像素
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+            keep: 不排除的区域名称（如OCR文本场景需要的 combat_button）
+
+        Returns:
+            uint8 掩码，形状 (height, width)，255表示保留
+        """
+        key = (image_size[0], image_size[1], window_size[0], window_size[1], tuple(keep))
+        mask = self._masks.get(key)
+        if mask is None:
+            with self._lock:
+                mask = self._masks.get(key)
+                if mask is None:
+                    mask = self._build(image_size, window_size, tuple(keep))
+                    self._masks[key] = mask
+        return mask
+
+    def apply(
+        self,
+        screenshot: Image.Image,
+        window_size: Tuple[int, int],
+        keep: Tuple[str, ...] = ()
+    ) -> Image.Image:
+        """
+        把UI区域的像素清零（返回新图像，不修改原截图）
+
+        Args:
+            screenshot: 屏幕截图
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+            keep: 不排除的区域名称
+
+        Returns:
+            掩码后的截图；未启用时原样返回
+        """
+        if not self.enabled:
+            return screenshot
+        img = np.asarray(screenshot)
+        mask = self.get_mask(screenshot.size, window_size, keep)
+        return Image.fromarray(cv2.bitwise_and(img, img, mask=mask))
+
+    def excludes(
+        self,
+        x: float,
+        y: float,
+        image_size: Tuple[int, int],
+        window_size: Tuple[int, int]
+    ) -> bool:
+        """
+        某个物理像素点是否落在排除区域内（不考虑 keep）
+
+        用于带 keep 的整帧OCR之后，把保留区域里读到的文本重新排除在其他检测之外
+
+        Args:
+            x, y: 物理像素坐标
+            image_size: 截图尺寸 (width, height)，物理像素
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+
+        Returns:
+            被排除时返回True；未启用时返回False
+        """
+        if not self.enabled:
+            return False
+        mask = self.get_mask(image_size, window_size)
+        px = min(max(int(x), 0), mask.shape[1] - 1)
+        py = min(max(int(y), 0), mask.shape[0] - 1)
+        return mask[py, px] == 0
+
+    def content_rows(
+        self,
+        image_size: Tuple[int, int],
+        window_size: Tuple[int, int],
+        keep: Tuple[str, ...] = ()
+    ) -> Tuple[int, int]:
+        """
+        掩码后仍有可见像素的行范围（去掉顶部/底部整行被排除的HUD）
+
+        Args:
+            image_size: 截图尺寸 (width, height)，物理像素
+            window_size: 窗口尺寸 (width, height)，逻辑像素
+            keep: 不排除的区域名称
+
+        Returns:
+            (y0, y1)，物理像素，左闭右开；全部被排除时返回 (0, 0)
+        """
+        if not self.enabled:
+            return (0, image_size[1])
+        rows = np.flatnonzero(self.get_mask(image_size, window_size, keep).any(axis=1))
+        if rows.size == 0:
+            return (0, 0)
+        return (int(rows[0]), int(rows[-1]) + 1)
+
+    def invalidate(self):
+        """清空缓存（配置或窗口几何改变时调用）"""
+        with self._lock:
+            self._masks.clear()
+
+
+_ui_mask: Optional[UIMask] = None
+
+
+def get_ui_mask() -> UIMask:
+    """获取全局UI掩码实例"""
+    global _ui_mask
+    if _ui_mask is None:
+        _ui_mask = UIMask()
+    return _ui_mask
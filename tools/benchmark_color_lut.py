@@ -0,0 +1,111 @@
+"""
+颜色查找表基准测试
+
+比较两种颜色分割方式的耗时和一致性：
+- 当前方式：cvtColor(RGB→HSV) + inRange
+- 查找表：RGB量化后一次花式索引（src/ui_interaction/color_lut.py）
+
+使用配置中的怪物名字颜色范围（monster.color）和小地图黄点范围（minimap.boundary），
+在给定截图（或随机图像）上测量，结果用于决定是否开启 color_lut.enabled。
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import cv2
+import numpy as np
+from PIL import Image
+from src.core.config import get_config
+from src.core.logger import setup_logger
+from src.ui_interaction.color_lut import ColorLUT
+
+setup_logger(level='WARNING', console=True)
+
+
+def hsv_in_range(rgb: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """当前方式：HSV转换 + inRange"""
+    hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+    return cv2.inRange(hsv, lower, upper)
+
+
+def time_call(fn, repeat: int) -> float:
+    """返回平均耗时（毫秒）"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+def load_images(paths, size):
+    """加载测试图像，没有给出图像时生成随机图像"""
+    images = []
+    for path in paths:
+        image = np.asarray(Image.open(path).convert('RGB'))
+        images.append((Path(path).name, image))
+    if not images:
+        rng = np.random.default_rng(0)
+        width, height = size
+        images.append((f"random {width}x{height}", rng.integers(0, 256, (height, width, 3), dtype=np.uint8)))
+    return images
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='颜色查找表基准测试')
+    parser.add_argument('images', nargs='*', help='测试截图（可多张），不提供时使用随机图像')
+    parser.add_argument('--bits', nargs='+', type=int, default=[5, 6], help='量化位数，默认 5 6')
+    parser.add_argument('--repeat', type=int, default=50, help='重复次数，默认50')
+    parser.add_argument('--size', nargs=2, type=int, default=[1348, 632], metavar=('W', 'H'),
+                        help='随机图像尺寸，默认 1348 632（Retina 2x 窗口）')
+    args = parser.parse_args()
+
+    config = get_config()
+    ranges = {
+        'monster.color': (
+            config.get('monster.color.hsv_lower', [15, 80, 80]),
+            config.get('monster.color.hsv_upper', [35, 255, 255]),
+        ),
+        'minimap.boundary': (
+            config.get('minimap.boundary.yellow_lower', [20, 100, 100]),
+            config.get('minimap.boundary.yellow_upper', [35, 255, 255]),
+        ),
+    }
+
+    images = load_images(args.images, args.size)
+    repeat = max(1, args.repeat)
+
+    print(f"{'图像':<24}{'颜色范围':<18}{'方式':<10}{'耗时(ms)':>10}{'一致率':>10}{'构建(ms)':>10}")
+    for name, image in images:
+        for range_name, (lower, upper) in ranges.items():
+            lower = np.array(lower, dtype=np.uint8)
+            upper = np.array(upper, dtype=np.uint8)
+            reference = hsv_in_range(image, lower, upper)
+            base_ms = time_call(lambda: hsv_in_range(image, lower, upper), repeat)
+            print(f"{name:<24}{range_name:<18}{'HSV':<10}{base_ms:>10.2f}{1.0:>10.2%}{'-':>10}")
+
+            for bits in args.bits:
+                start = time.perf_counter()
+                lut = ColorLUT(lower, upper, bits)
+                build_ms = 1000 * (time.perf_counter() - start)
+                lut_ms = time_call(lambda: lut.mask(image), repeat)
+                agreement = float(np.mean(lut.mask(image) == reference))
+                print(f"{name:<24}{range_name:<18}{f'LUT {bits}位':<10}{lut_ms:>10.2f}"
+                      f"{agreement:>10.2%}{build_ms:>10.1f}")
+
+    print()
+    print("查找表更快且一致率可接受时，在 config/config.yaml 中设置：")
+    print("color_lut:")
+    print("  enabled: true")
+    print("  bits: 5")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
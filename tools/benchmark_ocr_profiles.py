@@ -0,0 +1,167 @@
+"""
+OCR预处理档位基准测试
+
+在带标注的裁剪图片集上测量每个预处理档位（none/fast/balanced/quality）的
+耗时和识别准确率，用于选择「仍能正确识别的最便宜档位」。
+
+语料目录结构：
+    corpus/
+        labels.txt      # 每行: 文件名<TAB>期望文本，# 开头为注释
+        crop_001.png
+        crop_002.png
+        ...
+"""
+import sys
+import time
+import difflib
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from PIL import Image
+from src.ui_interaction.ocr import OCR, PREPROCESS_PROFILES
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+
+def normalize_text(text: str) -> str:
+    """去掉所有空白，便于比较"""
+    return ''.join(text.split())
+
+
+def load_corpus(corpus_dir: Path):
+    """
+    加载标注语料
+
+    Returns:
+        [(文件名, PIL Image, 期望文本), ...]
+    """
+    labels_path = corpus_dir / 'labels.txt'
+    if not labels_path.exists():
+        raise FileNotFoundError(f"标注文件不存在: {labels_path}")
+
+    samples = []
+    with open(labels_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            name, sep, expected = line.partition('\t')
+            if not sep:
+                print(f"⚠️  第{line_no}行缺少TAB分隔，跳过: {line}")
+                continue
+            image_path = corpus_dir / name.strip()
+            if not image_path.exists():
+                print(f"⚠️  图片不存在，跳过: {image_path}")
+                continue
+            image = Image.open(image_path).convert('RGB')
+            image.load()
+            samples.append((name.strip(), image, expected))
+    return samples
+
+
+def benchmark_profile(ocr: OCR, samples, profile: str, repeat: int) -> dict:
+    """
+    测量单个档位
+
+    Returns:
+        统计结果字典
+    """
+    preprocess_times = []
+    total_times = []
+    exact = 0
+    similarity_sum = 0.0
+    failures = []
+
+    for name, image, expected in samples:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            ocr._preprocess_image(image, profile=profile)
+            preprocess_times.append(time.perf_counter() - t0)
+
+        text = ""
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            text = ocr.recognize(image, profile=profile)
+            total_times.append(time.perf_counter() - t0)
+
+        got = normalize_text(text)
+        want = normalize_text(expected)
+        if got == want:
+            exact += 1
+        else:
+            failures.append((name, expected, text))
+        similarity_sum += difflib.SequenceMatcher(None, got, want).ratio()
+
+    n = len(samples)
+    return {
+        'profile': profile,
+        'preprocess_ms': 1000 * sum(preprocess_times) / len(preprocess_times),
+        'total_ms': 1000 * sum(total_times) / len(total_times),
+        'accuracy': exact / n,
+        'char_similarity': similarity_sum / n,
+        'failures': failures,
+    }
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='OCR预处理档位基准测试')
+    parser.add_argument('corpus', type=str, help='标注语料目录（包含 labels.txt）')
+    parser.add_argument('--profiles', nargs='+', default=list(PREPROCESS_PROFILES),
+                        choices=PREPROCESS_PROFILES, help='要测试的档位，默认全部')
+    parser.add_argument('--repeat', type=int, default=3, help='每张图片重复次数，默认3')
+    parser.add_argument('--min-accuracy', type=float, default=None,
+                        help='可接受的最低准确率（0-1），默认取所有档位中的最高准确率')
+    parser.add_argument('--show-failures', action='store_true', help='输出识别错误的样本')
+    args = parser.parse_args()
+
+    corpus_dir = Path(args.corpus)
+    samples = load_corpus(corpus_dir)
+    if not samples:
+        print("❌ 语料为空")
+        return 1
+
+    ocr = OCR()
+    print(f"OCR引擎: {ocr.engine}, 样本数: {len(samples)}, 重复次数: {args.repeat}")
+
+    # 预热（EasyOCR首次调用会加载模型，不计入统计）
+    ocr.recognize(samples[0][1], profile=args.profiles[0])
+
+    results = [benchmark_profile(ocr, samples, p, max(1, args.repeat)) for p in args.profiles]
+
+    print()
+    print(f"{'档位':<10}{'预处理(ms)':>12}{'总耗时(ms)':>12}{'准确率':>10}{'字符相似度':>12}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['preprocess_ms']:>12.2f}{r['total_ms']:>12.2f}"
+              f"{r['accuracy']:>10.1%}{r['char_similarity']:>12.3f}")
+
+    if args.show_failures:
+        for r in results:
+            for name, expected, got in r['failures']:
+                print(f"  [{r['profile']}] {name}: 期望 '{expected}'，识别 '{got}'")
+
+    min_accuracy = args.min_accuracy
+    if min_accuracy is None:
+        min_accuracy = max(r['accuracy'] for r in results)
+    candidates = [r for r in results if r['accuracy'] >= min_accuracy]
+    print()
+    if candidates:
+        best = min(candidates, key=lambda r: r['total_ms'])
+        print(f"推荐档位: {best['profile']} (准确率 {best['accuracy']:.1%}, 平均 {best['total_ms']:.1f}ms)")
+        print("在 config/config.yaml 中设置：")
+        print("recognition:")
+        print("  ocr:")
+        print(f"    preprocess_profile: \"{best['profile']}\"")
+    else:
+        print(f"没有档位达到最低准确率 {min_accuracy:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+交战统计报告
+
+读取交战事件文件（默认 logs/combat_events.jsonl，由 src/core/telemetry.py 写入），
+按运行会话统计：
+- 战斗数、每小时战斗数
+- 战斗时长（平均 / 中位数 / P90）、超时次数
+- 点击后进入战斗的延迟、未接上战斗的次数和浪费的时间
+- 空闲时间占比：会话时间中不在战斗里的比例
+"""
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from src.core.config import get_config
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+
+def load_events(path: Path):
+    """读取事件，跳过无法解析的行"""
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"跳过第 {line_no} 行（格式错误）")
+    return events
+
+
+def summarize(events):
+    """
+    统计一组事件
+
+    Returns:
+        统计结果字典
+    """
+    events = sorted(events, key=lambda e: e.get('ts', 0))
+    start = next((e['ts'] for e in events if e['event'] == 'session_start'), events[0]['ts'])
+    end = next((e['ts'] for e in reversed(events) if e['event'] == 'session_end'), events[-1]['ts'])
+    wall = max(end - start, 1e-6)
+
+    durations = [e['duration'] for e in events if e['event'] == 'combat_end' and 'duration' in e]
+    timeouts = [e['duration'] for e in events if e['event'] == 'combat_timeout' and 'duration' in e]
+    latencies = [e['latency'] for e in events if e['event'] == 'combat_start' and 'latency' in e]
+    failed = [e.get('waited', 0.0) for e in events if e['event'] == 'engage_failed']
+    engages = sum(1 for e in events if e['event'] == 'engage')
+
+    combat_time = sum(durations) + sum(timeouts)
+    return {
+        'wall': wall,
+        'engages': engages,
+        'fights': len(durations),
+        'timeouts': len(timeouts),
+        'failed': len(failed),
+        'failed_time': sum(failed),
+        'fights_per_hour': len(durations) / wall * 3600,
+        'durations': durations,
+        'latencies': latencies,
+        'combat_time': combat_time,
+        'dead_share': max(0.0, 1.0 - combat_time / wall),
+    }
+
+
+def format_stats(values):
+    """平均 / 中位数 / P90"""
+    if not values:
+        return '-'
+    return f"{np.mean(values):.1f} / {np.median(values):.1f} / {np.quantile(values, 0.9):.1f} 秒"
+
+
+def print_summary(title: str, stats: dict):
+    """输出一组统计"""
+    print(f"\n== {title} ==")
+    print(f"  运行时间:       {stats['wall'] / 60:.1f} 分钟")
+    print(f"  点击怪物:       {stats['engages']} 次")
+    print(f"  完成战斗:       {stats['fights']} 场（{stats['fights_per_hour']:.1f} 场/小时）")
+    print(f"  战斗超时:       {stats['timeouts']} 次")
+    print(f"  未接上战斗:     {stats['failed']} 次，浪费 {stats['failed_time']:.1f} 秒")
+    print(f"  战斗时长:       {format_stats(stats['durations'])}（平均 / 中位数 / P90）")
+    print(f"  进入战斗延迟:   {format_stats(stats['latencies'])}")
+    print(f"  空闲时间占比:   {stats['dead_share']:.1%}")
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    config = get_config()
+    default_path = config.get('telemetry.path', 'logs/combat_events.jsonl')
+
+    parser = argparse.ArgumentParser(description='交战统计报告')
+    parser.add_argument('events', nargs='?', default=default_path, help=f'事件文件，默认 {default_path}')
+    parser.add_argument('--sessions', action='store_true', help='分别输出每个会话的统计')
+    parser.add_argument('--last', type=int, default=0, help='只统计最近N个会话')
+    args = parser.parse_args()
+
+    path = Path(args.events)
+    if not path.is_absolute() and not path.exists():
+        path = project_root / path
+    if not path.exists():
+        print(f"事件文件不存在: {path}")
+        return 1
+
+    events = load_events(path)
+    if not events:
+        print("没有事件")
+        return 1
+
+    sessions = {}
+    for event in events:
+        sessions.setdefault(event.get('session', '-'), []).append(event)
+    ordered = sorted(sessions.items(), key=lambda item: min(e.get('ts', 0) for e in item[1]))
+    if args.last > 0:
+        ordered = ordered[-args.last:]
+
+    if args.sessions:
+        for session_id, session_events in ordered:
+            print_summary(f"会话 {session_id}", summarize(session_events))
+
+    # 汇总：各会话分别统计后合并（会话之间的间隔不计入运行时间）
+    per_session = [summarize(session_events) for _, session_events in ordered]
+    total = {
+        'wall': sum(s['wall'] for s in per_session),
+        'engages': sum(s['engages'] for s in per_session),
+        'fights': sum(s['fights'] for s in per_session),
+        'timeouts': sum(s['timeouts'] for s in per_session),
+        'failed': sum(s['failed'] for s in per_session),
+        'failed_time': sum(s['failed_time'] for s in per_session),
+        'durations': [d for s in per_session for d in s['durations']],
+        'latencies': [d for s in per_session for d in s['latencies']],
+        'combat_time': sum(s['combat_time'] for s in per_session),
+    }
+    total['fights_per_hour'] = total['fights'] / max(total['wall'], 1e-6) * 3600
+    total['dead_share'] = max(0.0, 1.0 - total['combat_time'] / max(total['wall'], 1e-6))
+    print_summary(f"全部 {len(per_session)} 个会话", total)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
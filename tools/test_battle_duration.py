@@ -0,0 +1,118 @@
+"""
+战斗时长模型测试（合成数据，不需要游戏窗口）
+
+用合成的战斗时长验证 src/core/battle_duration.py：
+- 样本不足时不做调度
+- 第一次检测延迟 = 低分位数 × 安全系数，密集窗口结束 = 高分位数
+- 只保留最近 max_samples 个样本，不同地图分开统计
+- 保存后重新加载结果一致
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from src.core.battle_duration import BattleDurationModel
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+
+def make_model(tmp: str) -> BattleDurationModel:
+    """在临时目录中创建模型，使用固定参数"""
+    model = BattleDurationModel(path=str(Path(tmp) / 'durations.json'))
+    model.min_samples = 5
+    model.max_samples = 50
+    model.first_check_quantile = 0.1
+    model.safety_factor = 0.8
+    model.dense_until_quantile = 0.9
+    return model
+
+
+def test_no_schedule_without_samples():
+    """样本不足时第一次检测不延迟、没有密集窗口"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_model(tmp)
+        assert model.first_check_delay('forest') == 0.0
+        assert model.dense_window_end('forest') is None
+        for duration in (20, 21, 22, 23):
+            model.record('forest', duration, save=False)
+        assert model.first_check_delay('forest') == 0.0
+        model.record('forest', 0, save=False)  # 无效时长不记录
+        assert len(model.durations['forest']) == 4
+
+
+def test_quantile_schedule():
+    """第一次检测延迟和密集窗口来自时长分位数"""
+    rng = np.random.default_rng(0)
+    durations = rng.normal(30, 3, 40).clip(10, None)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_model(tmp)
+        for d in durations:
+            model.record('forest', float(d), save=False)
+        expected_first = float(np.quantile(durations, 0.1)) * 0.8
+        expected_dense = float(np.quantile(durations, 0.9))
+        assert abs(model.first_check_delay('forest') - expected_first) < 1e-6
+        assert abs(model.dense_window_end('forest') - expected_dense) < 1e-6
+        # 第一次检测早于几乎所有战斗结束
+        assert np.mean(durations < model.first_check_delay('forest')) <= 0.05
+
+
+def test_window_and_keys():
+    """只保留最近 max_samples 个样本，不同地图分开统计"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_model(tmp)
+        for _ in range(60):
+            model.record('forest', 100.0, save=False)
+        for _ in range(50):
+            model.record('forest', 10.0, save=False)
+        for _ in range(10):
+            model.record('cave', 50.0, save=False)
+        assert len(model.durations['forest']) == 50
+        assert model.quantile('forest', 0.9) == 10.0
+        assert model.quantile('cave', 0.1) == 50.0
+
+
+def test_save_and_load():
+    """保存后重新加载，分位数一致"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_model(tmp)
+        for d in range(10, 30):
+            model.record('forest', float(d), save=False)
+        model.save()
+        reloaded = make_model(tmp)
+        reloaded.load()
+        assert reloaded.durations == model.durations
+        assert reloaded.first_check_delay('forest') == model.first_check_delay('forest')
+
+
+TESTS = [
+    test_no_schedule_without_samples,
+    test_quantile_schedule,
+    test_window_and_keys,
+    test_save_and_load,
+]
+
+
+def main():
+    """运行所有测试"""
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {test.__doc__}")
+            import traceback
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} 通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
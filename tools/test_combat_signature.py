@@ -0,0 +1,193 @@
+"""
+战斗区域签名模型测试（合成图像，不需要游戏窗口）
+
+用合成的"战斗按钮"和"地图背景"裁剪图验证 src/core/combat_signature.py：
+- 默认只学习战斗外观：按钮判为战斗中，变化的地图判为非战斗，非战斗样本不学习
+- 学习两类参考后（learn_out_of_combat），带噪声的新样本分类正确，没见过的外观返回 None（交给OCR）
+- 新签名按间隔保存；保存后重新加载结果一致
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from src.core.combat_signature import CombatSignatureModel
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+CROP_SIZE = (120, 40)  # 检测区域裁剪图 (宽, 高)，物理像素
+
+
+def make_button(rng: np.random.Generator, noise: float = 6.0) -> np.ndarray:
+    """合成战斗中的按钮：红底白字"""
+    w, h = CROP_SIZE
+    img = np.zeros((h, w, 3), np.float32)
+    img[:] = (170, 40, 35)
+    img[12:28, 20:100:8] = 240  # 竖笔画
+    img[18:21, 20:100] = 240    # 横笔画
+    img += rng.normal(0, noise, img.shape)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+# 非战斗时该区域显示的地图纹理（固定场景，每帧只有噪声不同）
+_MAP_TEXTURE = np.random.default_rng(100).normal(0, 25, (CROP_SIZE[1] // 4, CROP_SIZE[0] // 4, 1)).repeat(4, axis=0).repeat(4, axis=1)
+
+
+def make_map(rng: np.random.Generator, noise: float = 6.0) -> np.ndarray:
+    """合成非战斗时的地图背景：绿色草地加纹理"""
+    w, h = CROP_SIZE
+    base = np.array((60, 130, 55), np.float32)
+    img = base + _MAP_TEXTURE + rng.normal(0, noise, (h, w, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def make_unknown(rng: np.random.Generator) -> np.ndarray:
+    """没见过的外观：蓝色渐变（例如加载画面）"""
+    w, h = CROP_SIZE
+    ramp = np.linspace(0, 1, w, dtype=np.float32)[None, :, None]
+    img = np.array((20, 40, 200), np.float32) * (0.3 + 0.7 * ramp) + rng.normal(0, 3, (h, w, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def make_minimap(rng: np.random.Generator) -> np.ndarray:
+    """非战斗时检测区域里的小地图：每帧都不同的地形色块"""
+    w, h = CROP_SIZE
+    blocks = rng.uniform(0, 1, (h // 8, w // 8, 1)).repeat(8, axis=0).repeat(8, axis=1)
+    img = np.array((50, 110, 70), np.float32) + blocks * np.array((80, 90, 60), np.float32)
+    img += rng.normal(0, 4, (h, w, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def trained_model(path: Path, rng: np.random.Generator) -> CombatSignatureModel:
+    """学习几张两类样本（开启非战斗外观学习）"""
+    model = CombatSignatureModel(path=str(path))
+    model.learn_out_of_combat = True
+    for _ in range(4):
+        model.learn(make_button(rng), True, save=False)
+        model.learn(make_map(rng), False, save=False)
+    return model
+
+
+def test_in_combat_only():
+    """默认只学习战斗外观：按钮为战斗中，变化的小地图为非战斗，非战斗样本不学习"""
+    rng = np.random.default_rng(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = CombatSignatureModel(path=str(Path(tmp) / 'signatures.npz'))
+        assert not model.learn_out_of_combat
+        assert model.classify(make_button(rng)) is None
+        assert not model.learn(make_minimap(rng), False, save=False)
+        for _ in range(4):
+            model.learn(make_button(rng), True, save=False)
+        assert model.is_trained()
+        assert len(model.hists[False]) == 0
+        for _ in range(20):
+            assert model.classify(make_button(rng, noise=10)) is True
+            assert model.classify(make_minimap(rng)) is False
+            assert model.classify(make_map(rng, noise=10)) is False
+
+
+def test_classify_learned_appearances():
+    """学过的两类外观分类正确"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = trained_model(Path(tmp) / 'signatures.npz', rng)
+        assert model.is_trained()
+        for _ in range(20):
+            assert model.classify(make_button(rng, noise=10)) is True
+            assert model.classify(make_map(rng, noise=10)) is False
+
+
+def test_unknown_appearance_needs_ocr():
+    """没见过的外观返回 None；没有学习时也返回 None"""
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = CombatSignatureModel(path=str(Path(tmp) / 'empty.npz'))
+        assert empty.classify(make_button(rng)) is None
+        model = trained_model(Path(tmp) / 'signatures.npz', rng)
+        assert model.classify(make_unknown(rng)) is None
+
+
+def test_dedup_and_max_refs():
+    """几乎相同的样本不重复加入，每类最多保留 max_refs 个"""
+    rng = np.random.default_rng(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = CombatSignatureModel(path=str(Path(tmp) / 'signatures.npz'))
+        model.learn_out_of_combat = True
+        crop = make_button(rng)
+        assert model.learn(crop, True, save=False)
+        assert not model.learn(crop, True, save=False)
+        model.dedup_distance = 0.0
+        for _ in range(model.max_refs + 5):
+            model.learn(make_map(rng), False, save=False)
+        assert len(model.hists[False]) == model.max_refs
+
+
+def test_save_interval():
+    """新签名只标记，距上次保存超过间隔或 flush 时才写盘"""
+    rng = np.random.default_rng(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'signatures.npz'
+        model = CombatSignatureModel(path=str(path))
+        model.save_interval = 60.0
+        assert model.learn(make_button(rng), True)
+        assert model.dirty and not path.exists()
+        model.flush()
+        assert not model.dirty and path.exists()
+        model.save_interval = 0.0
+        model.dedup_distance = 0.0
+        mtime = path.stat().st_mtime_ns
+        time.sleep(0.01)
+        assert model.learn(make_button(rng), True)
+        assert not model.dirty and path.stat().st_mtime_ns != mtime
+
+
+def test_save_and_load():
+    """保存后重新加载，分类结果一致"""
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'signatures.npz'
+        model = trained_model(path, rng)
+        model.save()
+        reloaded = CombatSignatureModel(path=str(path))
+        reloaded.learn_out_of_combat = True
+        reloaded.load()
+        assert len(reloaded.hists[True]) == len(model.hists[True])
+        assert len(reloaded.hists[False]) == len(model.hists[False])
+        samples = [make_button(rng) for _ in range(5)] + [make_map(rng) for _ in range(5)]
+        assert [model.classify(s) for s in samples] == [reloaded.classify(s) for s in samples]
+
+
+TESTS = [
+    test_in_combat_only,
+    test_classify_learned_appearances,
+    test_unknown_appearance_needs_ocr,
+    test_dedup_and_max_refs,
+    test_save_interval,
+    test_save_and_load,
+]
+
+
+def main():
+    """运行所有测试"""
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {test.__doc__}")
+            import traceback
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} 通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+战斗结束监视器测试（合成画面，不需要游戏窗口）
+
+用按时间变化的合成检测区域和一个模拟检测器验证 src/core/combat_watcher.py：
+- 画面不变时采样间隔退避，几乎不做完整确认
+- 战斗结束后在一个最小采样间隔量级内返回
+- 按钮动画（短暂变化后恢复）不会被当成战斗结束
+- 一直在战斗中时按超时返回
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from src.core.combat_watcher import CombatWatcher
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+REGION = {'left': 600, 'top': 40, 'width': 60, 'height': 20}
+
+BUTTON = np.zeros((40, 120, 3), np.uint8)
+BUTTON[:] = (170, 40, 35)
+BUTTON[12:28, 20:100:8] = 240
+MAP = np.zeros((40, 120, 3), np.uint8)
+MAP[:] = (60, 130, 55)
+FLASH = np.full((40, 120, 3), 250, np.uint8)
+
+
+class FakeScreenshot:
+    """按时间返回检测区域画面"""
+
+    def __init__(self, end_at: float, flash=None):
+        self.start = time.monotonic()
+        self.end_at = end_at
+        self.flash = flash  # (开始, 结束)：按钮动画时间段
+        self.captures = 0
+
+    def state(self) -> str:
+        t = time.monotonic() - self.start
+        if t >= self.end_at:
+            return 'map'
+        if self.flash and self.flash[0] <= t < self.flash[1]:
+            return 'flash'
+        return 'button'
+
+    def capture(self, region=None) -> Image.Image:
+        self.captures += 1
+        return Image.fromarray({'map': MAP, 'flash': FLASH, 'button': BUTTON}[self.state()])
+
+
+class FakeDetector:
+    """模拟 CombatStateDetector：完整检测看画面是不是地图，连续2次非战斗才算结束"""
+
+    def __init__(self, screenshot: FakeScreenshot):
+        self.screenshot = screenshot
+        self.in_combat = True
+        self.exit_count = 0
+        self.observes = 0
+
+    def get_detection_region(self) -> dict:
+        return REGION
+
+    @property
+    def pending_change(self) -> bool:
+        return self.exit_count > 0
+
+    def observe(self, screenshot=None, frame_id=None) -> bool:
+        self.observes += 1
+        if self.screenshot.state() == 'map':
+            self.exit_count += 1
+            if self.exit_count >= 2:
+                self.in_combat = False
+        else:
+            self.exit_count = 0
+        return self.in_combat
+
+
+def run(end_at: float, timeout: float, flash=None):
+    """运行一次监视，返回 (结果, 耗时, 检测器)"""
+    detector = FakeDetector(FakeScreenshot(end_at, flash))
+    watcher = CombatWatcher(detector)
+    watcher.confirm_interval = 100.0
+    start = time.monotonic()
+    result = watcher.wait_for_end(timeout)
+    return result, time.monotonic() - start, detector
+
+
+def test_returns_soon_after_end():
+    """战斗结束后很快返回，等待期间完整确认次数很少"""
+    result, elapsed, detector = run(end_at=1.5, timeout=5.0)
+    assert result is True
+    # 最多晚一个最大采样间隔 + 一次确认间隔
+    assert elapsed < 1.5 + 0.4 + 0.3, elapsed
+    assert detector.observes <= 4, detector.observes
+
+
+def test_backoff_limits_sampling():
+    """画面不变时采样间隔退避到上限"""
+    result, elapsed, detector = run(end_at=100.0, timeout=2.0)
+    # 固定 0.05 秒间隔需要约 40 次采样；退避到 0.4 秒后约 10 次
+    assert detector.screenshot.captures < 15, detector.screenshot.captures
+
+
+def test_animation_is_not_end():
+    """按钮短暂变化（动画）后恢复，不算战斗结束"""
+    result, elapsed, detector = run(end_at=100.0, timeout=1.5, flash=(0.3, 0.6))
+    assert result is False
+    assert detector.in_combat
+
+
+def test_timeout():
+    """一直在战斗中时按超时返回 False"""
+    result, elapsed, _ = run(end_at=100.0, timeout=0.5)
+    assert result is False
+    assert 0.5 <= elapsed < 1.0, elapsed
+
+
+TESTS = [
+    test_returns_soon_after_end,
+    test_backoff_limits_sampling,
+    test_animation_is_not_end,
+    test_timeout,
+]
+
+
+def main():
+    """运行所有测试"""
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {test.__doc__}")
+            import traceback
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} 通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+镜头运动检测测试（合成画面，不需要游戏窗口）
+
+用在大场景上平移取景的合成画面验证 src/map_navigation/motion_detector.py：
+- 静止画面读数为"没有移动"，位移接近0（降采样尺寸为奇数时相位相关会给出半像素的假位移）
+- 已知平移量测得准确
+- 镜头停下后 wait_until_stopped 很快返回 True，累计位移（里程）与实际移动一致
+- 静止时里程不漂移；基于同一检测器的 frame_stream.camera_stopped 条件能成立
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import cv2
+import numpy as np
+from PIL import Image
+from src.map_navigation.motion_detector import MotionDetector, even_dft_size
+from src.core.frame_stream import FrameStream, wait_until, camera_stopped
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+WINDOW_SIZE = (674, 316)      # 窗口逻辑尺寸
+FRAME_SIZE = (1348, 632)      # Retina 2x 截图的物理尺寸
+SCALE = FRAME_SIZE[0] // WINDOW_SIZE[0]
+
+# 比画面大的场景（地形明暗 + 细节），取景位置即镜头位置
+_rng = np.random.default_rng(100)
+_WORLD = (
+    cv2.GaussianBlur(_rng.normal(0, 1, (1000, 2400)).astype(np.float32), (0, 0), 30) * 400
+    + cv2.GaussianBlur(_rng.normal(0, 1, (1000, 2400)).astype(np.float32), (0, 0), 3) * 300
+    + 120
+)
+
+
+class FakeScreenshot:
+    """按镜头位置（逻辑像素）从场景中取景；position 可以是随时间变化的函数"""
+
+    def __init__(self, position=(0.0, 0.0), noise: float = 2.0, seed: int = 0):
+        self.position = position
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.start = time.monotonic()
+
+    def get_window_size(self):
+        return WINDOW_SIZE
+
+    def camera(self):
+        """当前镜头位置（逻辑像素）"""
+        if callable(self.position):
+            return self.position(time.monotonic() - self.start)
+        return self.position
+
+    def capture_full_window(self) -> Image.Image:
+        x, y = self.camera()
+        ox, oy = int(round(200 + x * SCALE)), int(round(150 + y * SCALE))
+        w, h = FRAME_SIZE
+        gray = _WORLD[oy:oy + h, ox:ox + w] + self.rng.normal(0, self.noise, (h, w))
+        gray = np.clip(gray, 0, 255).astype(np.uint8)
+        return Image.fromarray(np.dstack([gray, gray, gray]))
+
+
+def walk(speed: float, start: float, duration: float):
+    """镜头在 start 秒后以 speed（逻辑像素/秒）向右下移动 duration 秒，然后停下"""
+    def _position(t: float):
+        d = speed * min(max(t - start, 0.0), duration)
+        return (d, d * 0.5)
+    return _position
+
+
+def test_still_frames():
+    """静止画面读数为没有移动，位移接近0（降采样尺寸为偶数）"""
+    screenshot = FakeScreenshot()
+    detector = MotionDetector(screenshot)
+    for _ in range(20):
+        dx, dy = detector.update(screenshot.capture_full_window())
+        assert not detector.moving, (dx, dy)
+        assert abs(dx) < 0.5 and abs(dy) < 0.5, (dx, dy)
+    assert all(n % 2 == 0 for n in detector._prev.shape), detector._prev.shape
+    assert even_dft_size(75) % 2 == 0
+    assert abs(detector.total_shift[0]) < 1.0 and abs(detector.total_shift[1]) < 1.0, detector.total_shift
+
+
+def test_shift_measured():
+    """已知平移量测得准确（逻辑像素，镜头移动方向）"""
+    screenshot = FakeScreenshot()
+    detector = MotionDetector(screenshot)
+    detector.update(screenshot.capture_full_window())
+    for dx, dy in ((6, -4), (-10, 3), (2, 8)):
+        screenshot.position = (screenshot.position[0] + dx, screenshot.position[1] + dy)
+        mx, my = detector.update(screenshot.capture_full_window())
+        assert detector.moving
+        # 相位相关的亚像素精度约 0.1 个降采样像素（约 0.3 逻辑像素）
+        assert abs(mx - dx) < 1.0 and abs(my - dy) < 1.0, ((mx, my), (dx, dy))
+
+
+def test_wait_until_stopped():
+    """镜头停下后很快返回 True，里程与实际移动一致"""
+    screenshot = FakeScreenshot(walk(speed=200.0, start=0.1, duration=0.6))
+    detector = MotionDetector(screenshot)
+    start = time.monotonic()
+    arrived = detector.wait_until_stopped(timeout=3.0)
+    elapsed = time.monotonic() - start
+    assert arrived is True
+    # 0.7 秒停下，之后 settle_frames 个采样间隔内返回（留出截图耗时）
+    assert elapsed < 0.7 + 0.5, elapsed
+    moved = screenshot.camera()
+    shift = detector.last_move_shift
+    # 每帧约 0.3 逻辑像素的亚像素误差随帧数累积，允许移动距离的 8%
+    error = np.hypot(shift[0] - moved[0], shift[1] - moved[1])
+    assert error < 0.08 * np.hypot(*moved), (shift, moved)
+
+
+def test_no_drift_when_still():
+    """静止时不会误判为移动、里程不漂移；frame_stream.camera_stopped 条件成立"""
+    screenshot = FakeScreenshot()
+    detector = MotionDetector(screenshot)
+    start = time.monotonic()
+    assert detector.wait_until_stopped(timeout=3.0) is False
+    assert time.monotonic() - start < 1.0
+    assert abs(detector.total_shift[0]) < 1.0 and abs(detector.total_shift[1]) < 1.0, detector.total_shift
+
+    stream = FrameStream(screenshot, max_age=0.0)
+    assert wait_until(camera_stopped(detector), stream, 2.0, interval=0.05)
+
+    screenshot.position = walk(speed=200.0, start=0.0, duration=0.5)
+    screenshot.start = time.monotonic()
+    start = time.monotonic()
+    assert wait_until(camera_stopped(detector), stream, 3.0, interval=0.05)
+    assert 0.5 <= time.monotonic() - start < 1.0
+
+
+TESTS = [
+    test_still_frames,
+    test_shift_measured,
+    test_wait_until_stopped,
+    test_no_drift_when_still,
+]
+
+
+def main():
+    """运行所有测试"""
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {test.__doc__}")
+            import traceback
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} 通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
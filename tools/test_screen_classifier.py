@@ -0,0 +1,151 @@
+"""
+画面分类器测试（合成画面，不需要游戏窗口）
+
+用合成的地图、战斗、加载、奖励弹窗画面验证 src/core/screen_classifier.py：
+- 训练后新画面分类正确（每帧内容有随机偏移和噪声）
+- 与所有类型都不像的画面返回 None（包括布局与地图一样多变、但颜色完全不同的画面）；未训练时返回 None
+- 保存后重新加载结果一致
+- 单帧分类耗时在毫秒级
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import cv2
+import numpy as np
+from src.core.screen_classifier import ScreenClassifier, screen_features
+from src.core.logger import setup_logger
+
+setup_logger(level='WARNING', console=True)
+
+FRAME_SIZE = (1344, 632)  # 接近 Retina 2x 截图的尺寸 (宽, 高)，取8的倍数便于生成纹理
+
+# 地图场景比画面大（大块的地形明暗），每帧取不同偏移模拟镜头在附近移动
+_WORLD = cv2.GaussianBlur(
+    np.random.default_rng(100).normal(0, 1, (FRAME_SIZE[1] + 200, FRAME_SIZE[0] + 200)).astype(np.float32),
+    (0, 0), 40
+)
+_WORLD = (_WORLD / _WORLD.std() * 30)[:, :, None]
+
+
+def _map_background(rng: np.random.Generator) -> np.ndarray:
+    w, h = FRAME_SIZE
+    ox, oy = rng.integers(0, 200, 2)
+    return np.array((70, 120, 60), np.float32) + _WORLD[oy:oy + h, ox:ox + w]
+
+
+def make_frame(label: str, rng: np.random.Generator) -> np.ndarray:
+    """合成一帧指定类型的画面"""
+    w, h = FRAME_SIZE
+    if label == 'map':
+        img = _map_background(rng)
+    elif label == 'combat':
+        img = np.zeros((h, w, 3), np.float32) + (30, 40, 90)
+        img[h // 3:2 * h // 3, w // 4:3 * w // 4] += 40  # 战斗场地
+        img[20:80, w - 260:w - 40] = (170, 40, 35)       # 认输按钮
+    elif label == 'loading':
+        img = np.zeros((h, w, 3), np.float32) + 10
+        progress = int(rng.uniform(0.1, 0.9) * (w - 400))
+        img[h - 80:h - 60, 200:200 + progress] = 220     # 进度条
+    elif label == 'reward':
+        img = _map_background(rng) * 0.4                  # 变暗的地图
+        img[h // 4:3 * h // 4, w // 3:2 * w // 3] = (200, 160, 60)  # 奖励面板
+    else:
+        raise ValueError(label)
+    img += rng.normal(0, 2, (h, w, 3))  # 压缩/缩放噪声
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+LABELS = ('map', 'combat', 'loading', 'reward')
+
+
+def trained_classifier(path: Path, rng: np.random.Generator, per_class: int = 16) -> ScreenClassifier:
+    """每类用若干帧训练（帧数太少时半径覆盖不到连续变化，如加载进度条的长度）"""
+    classifier = ScreenClassifier(path=str(path))
+    classifier.fit({label: [screen_features(make_frame(label, rng)) for _ in range(per_class)] for label in LABELS})
+    return classifier
+
+
+def test_classify_known_screens():
+    """训练后新画面分类正确"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = trained_classifier(Path(tmp) / 'model.npz', rng)
+        assert classifier.trained
+        for label in LABELS:
+            for _ in range(5):
+                assert classifier.classify(make_frame(label, rng)) == label, label
+
+
+def test_unknown_screen():
+    """与所有类型都不像的画面返回 None；未训练时返回 None"""
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        untrained = ScreenClassifier(path=str(Path(tmp) / 'missing.npz'))
+        assert untrained.classify(make_frame('map', rng)) is None
+        classifier = trained_classifier(Path(tmp) / 'model.npz', rng)
+        w, h = FRAME_SIZE
+        magenta = np.zeros((h, w, 3), np.uint8)
+        magenta[:] = (230, 20, 230)
+        magenta[::2, ::2] = (20, 230, 20)
+        assert classifier.classify(magenta) is None
+
+
+def test_save_and_load():
+    """保存后重新加载，分类结果一致"""
+    rng = np.random.default_rng(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'model.npz'
+        classifier = trained_classifier(path, rng)
+        classifier.save()
+        reloaded = ScreenClassifier(path=str(path))
+        assert reloaded.labels == classifier.labels
+        frames = [make_frame(label, rng) for label in LABELS]
+        assert [classifier.classify(f) for f in frames] == [reloaded.classify(f) for f in frames]
+
+
+def test_speed():
+    """单帧特征 + 分类耗时在毫秒级"""
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = trained_classifier(Path(tmp) / 'model.npz', rng, per_class=3)
+        frame = make_frame('map', rng)
+        repeat = 50
+        start = time.perf_counter()
+        for _ in range(repeat):
+            classifier.classify(frame)
+        per_frame_ms = 1000 * (time.perf_counter() - start) / repeat
+        assert per_frame_ms < 5.0, per_frame_ms
+
+
+TESTS = [
+    test_classify_known_screens,
+    test_unknown_screen,
+    test_save_and_load,
+    test_speed,
+]
+
+
+def main():
+    """运行所有测试"""
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ {test.__doc__}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {test.__doc__}")
+            import traceback
+            traceback.print_exc()
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} 通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+画面分类器训练工具
+
+从录制的帧训练画面分类器（src/core/screen_classifier.py）：
+    frames/
+      map/*.png
+      combat/*.png
+      loading/*.png
+      reward/*.png
+      ...
+每个子目录名就是一个画面类型。训练后输出留一法准确率和单帧分类耗时，
+并把模型保存到配置 screen_classifier.path（默认 data/screen_classifier.npz）。
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+from src.core.logger import setup_logger
+from src.core.screen_classifier import ScreenClassifier, screen_features
+
+setup_logger(level='WARNING', console=True)
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def load_samples(frames_dir: Path):
+    """读取每个类型目录下的帧并计算特征"""
+    samples = {}
+    for label_dir in sorted(p for p in frames_dir.iterdir() if p.is_dir()):
+        feats = []
+        for path in sorted(label_dir.iterdir()):
+            if path.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+            try:
+                feats.append(screen_features(Image.open(path).convert('RGB')))
+            except Exception as e:
+                print(f"跳过无法读取的图像 {path}: {e}")
+        if feats:
+            samples[label_dir.name] = feats
+    return samples
+
+
+def leave_one_out(samples, radius_factor: float):
+    """留一法评估，返回 (正确数, 总数, 每类错误列表)"""
+    correct = 0
+    total = 0
+    errors = {}
+    for label, feats in samples.items():
+        for i in range(len(feats)):
+            held_out = {k: (v[:i] + v[i + 1:] if k == label else v) for k, v in samples.items()}
+            if not held_out[label]:
+                continue
+            model = ScreenClassifier(path=str(project_root / 'data' / '.unused.npz'))
+            model.radius_factor = radius_factor
+            model.fit(held_out)
+            predicted, _ = model.predict(feats[i])
+            total += 1
+            if predicted == label:
+                correct += 1
+            else:
+                errors.setdefault(label, []).append(predicted)
+    return correct, total, errors
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='画面分类器训练工具')
+    parser.add_argument('frames', nargs='?', default='frames', help='录制帧目录（每个子目录一个类型），默认 frames')
+    parser.add_argument('--output', help='模型输出路径，默认使用配置 screen_classifier.path')
+    parser.add_argument('--no-eval', action='store_true', help='跳过留一法评估')
+    args = parser.parse_args()
+
+    frames_dir = Path(args.frames)
+    if not frames_dir.is_dir():
+        print(f"帧目录不存在: {frames_dir}")
+        return 1
+
+    samples = load_samples(frames_dir)
+    if len(samples) < 2:
+        print("至少需要两个类型目录，每个目录至少一帧")
+        return 1
+    for label, feats in samples.items():
+        print(f"  {label:<16}{len(feats):>6} 帧")
+
+    classifier = ScreenClassifier(path=args.output)
+
+    if not args.no_eval:
+        correct, total, errors = leave_one_out(samples, classifier.radius_factor)
+        if total:
+            print(f"\n留一法准确率: {correct}/{total} ({correct / total:.1%})")
+        for label, predicted in errors.items():
+            print(f"  {label} 被误判为: {', '.join(str(p) for p in predicted)}")
+
+    classifier.fit(samples)
+
+    # 单帧耗时（特征 + 分类）
+    sample_path = next(p for p in (frames_dir / classifier.labels[0]).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    frame = Image.open(sample_path).convert('RGB')
+    frame_np = np.asarray(frame)
+    repeat = 200
+    start = time.perf_counter()
+    for _ in range(repeat):
+        classifier.predict(screen_features(frame_np))
+    print(f"\n单帧分类耗时: {1000 * (time.perf_counter() - start) / repeat:.3f} ms")
+
+    classifier.save()
+    print(f"模型已保存: {classifier.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())